@@ -34,7 +34,7 @@ from rbnics.problems.parabolic_coercive import ParabolicCoerciveProblem
 from rbnics.problems.stokes import StokesProblem
 from rbnics.problems.stokes_optimal_control import StokesOptimalControlProblem
 from rbnics.problems.stokes_unsteady import StokesUnsteadyProblem
-from rbnics.sampling.distributions import DrawFrom, EquispacedDistribution, LogEquispacedDistribution, LogUniformDistribution, UniformDistribution
+from rbnics.sampling.distributions import DrawFrom, EquispacedDistribution, HaltonDistribution, LatinHypercubeDistribution, LogEquispacedDistribution, LogHaltonDistribution, LogLatinHypercubeDistribution, LogSobolDistribution, LogUniformDistribution, SobolDistribution, UniformDistribution
 from rbnics.scm.problems import SCM, ExactCoercivityConstant
 from rbnics.shape_parametrization.problems import AffineShapeParametrization, ShapeParametrization
 from rbnics.utils.decorators import CustomizeReducedProblemFor, CustomizeReductionMethodFor, exact_problem
@@ -60,8 +60,14 @@ __all__ += [
     # rbnics.sampling
     'DrawFrom',
     'EquispacedDistribution',
+    'HaltonDistribution',
+    'LatinHypercubeDistribution',
     'LogEquispacedDistribution',
+    'LogHaltonDistribution',
+    'LogLatinHypercubeDistribution',
+    'LogSobolDistribution',
     'LogUniformDistribution',
+    'SobolDistribution',
     'UniformDistribution',
     # rbnics.scm
     'SCM',
@@ -34,6 +34,16 @@ class LinearProgramSolver(object, metaclass=ABCMeta):
         """
         pass
         
+    @abstractmethod
+    def set_warm_start(self, active_set):
+        """
+        Provide the active set (i.e., the indices of the constraints which hold as equalities, with bound constraints
+        numbered after the rows of A, first lower then upper bounds) of the solution of a similar linear program.
+        If the corresponding vertex is optimal also for this linear program, the solve is skipped.
+        After solve(), the active set of the solution is available in the active_set attribute.
+        """
+        pass
+    
     @abstractmethod
     def solve(self):
         pass
@@ -17,6 +17,7 @@
 #
 
 import os
+from uuid import uuid4
 from numbers import Number
 from rbnics.backends.abstract import FunctionsList as AbstractFunctionsList
 from rbnics.utils.cache import Cache
@@ -41,6 +42,7 @@ def FunctionsList(backend, wrapping, online_backend, online_wrapping, Additional
                 self.space = wrapping.get_function_subspace(space, component)
             self.mpi_comm = wrapping.get_mpi_comm(space)
             self._list = list() # of functions
+            self._saved_lengths = dict() # from (directory, filename) to number of functions already saved there
             self._precomputed_slices = Cache() # from tuple to FunctionsList
         
         def enrich(self, functions, component=None, weights=None, copy=True):
@@ -96,18 +98,28 @@ def FunctionsList(backend, wrapping, online_backend, online_wrapping, Additional
             
         def clear(self):
             self._list = list()
+            self._saved_lengths.clear()
             # Reset precomputed slices
             self._precomputed_slices.clear()
             
         def save(self, directory, filename):
+            # Functions are only appended to the list (the list is reset on clear(), and __setitem__() only
+            # marks as unsaved the functions from the replaced one on), so that only functions which have not
+            # been saved to the same file yet need to be saved
+            saved_length = self._saved_lengths.get((str(directory), filename), 0)
+            for index in range(saved_length, len(self._list)):
+                wrapping.function_save(self._list[index], directory, filename + "_" + str(index))
+            # Update the length only after all functions have been saved
             self._save_Nmax(directory, filename)
-            for (index, function) in enumerate(self._list):
-                wrapping.function_save(function, directory, filename + "_" + str(index))
+            self._saved_lengths[(str(directory), filename)] = len(self._list)
                     
         def _save_Nmax(self, directory, filename):
             if is_io_process(self.mpi_comm):
-                with open(os.path.join(str(directory), filename + ".length"), "w") as length:
+                # Write to a temporary file (with a unique name, as in TextIO) first, so that the length is updated atomically
+                temporary_filename = os.path.join(str(directory), filename + ".length." + uuid4().hex + ".tmp")
+                with open(temporary_filename, "w") as length:
                     length.write(str(len(self._list)))
+                os.replace(temporary_filename, os.path.join(str(directory), filename + ".length"))
             
         def load(self, directory, filename):
             if len(self._list) > 0: # avoid loading multiple times
@@ -117,6 +129,7 @@ def FunctionsList(backend, wrapping, online_backend, online_wrapping, Additional
                 function = backend.Function(self.space)
                 wrapping.function_load(function, directory, filename + "_" + str(index))
                 self.enrich(function)
+            self._saved_lengths[(str(directory), filename)] = Nmax
             return True
             
         def _load_Nmax(self, directory, filename):
@@ -164,15 +177,25 @@ def FunctionsList(backend, wrapping, online_backend, online_wrapping, Additional
         @overload(int, backend.Function.Type())
         def __setitem__(self, key, item):
             self._list[key] = item
+            self._update_saved_lengths(key)
             
         @overload(int, object)
         def __setitem__(self, key, item):
             if AdditionalIsFunction(item):
                 item = ConvertAdditionalFunctionTypes(item)
                 self._list[key] = item
+                self._update_saved_lengths(key)
             else:
                 raise RuntimeError("Invalid function provided to FunctionsList.__setitem__()")
                 
+        # Previously saved files are outdated from the replaced function on (e.g. when Gram-Schmidt
+        # replaces the last function with its orthonormalized version), while previous ones are still valid
+        def _update_saved_lengths(self, key):
+            if key < 0:
+                key += len(self._list)
+            for (directory_and_filename, saved_length) in self._saved_lengths.items():
+                self._saved_lengths[directory_and_filename] = min(saved_length, key)
+        
         def __iter__(self):
             return self._list.__iter__()
     return _FunctionsList
@@ -17,8 +17,11 @@
 #
 
 from math import sqrt
-from numpy import abs, cumsum as compute_retained_energy, isclose, sum as compute_total_energy
+from numpy import abs, cumsum as compute_retained_energy, finfo, isclose, sum as compute_total_energy, zeros
+from numpy.linalg import svd
+from rbnics.utils.config import config
 from rbnics.utils.io import ExportableList
+from rbnics.utils.mpi import log, PROGRESS
 
 # Class containing the implementation of the POD
 def ProperOrthogonalDecompositionBase(backend, wrapping, online_backend, online_wrapping, ParentProperOrthogonalDecomposition, SnapshotsContainerType, BasisContainerType):
@@ -34,17 +37,118 @@ def ProperOrthogonalDecompositionBase(backend, wrapping, online_backend, online_
             # Declare a list to store eigenvalues
             self.eigenvalues = ExportableList("text")
             self.retained_energy = ExportableList("text")
+            # Incremental POD: rather than storing all snapshots, a truncated singular value decomposition of
+            # the snapshots matrix is updated every time a new snapshot is stored, and the snapshot is discarded
+            self.incremental = (config.get("POD", "method") == "incremental" and inner_product is not None)
+            self.incremental_tolerance = 0. # relative energy which can be discarded while updating the decomposition
+            self._init_incremental()
+            # Cholesky factor of the inner product, computed only once if the direct SVD is used
+            self._inner_product_cholesky_factor = None
+        
+        def set_incremental(self, incremental):
+            assert not incremental or self.inner_product is not None
+            self.incremental = incremental
+            self.snapshots_matrix.clear()
+            self._init_incremental()
+        
+        def _init_incremental(self):
+            if self.incremental:
+                self._incremental_basis = BasisContainerType(self.space, *self.args)
+                self._incremental_singular_values = list()
+                self._incremental_total_energy = 0.
+                self._incremental_discarded_energy = 0.
+                self._incremental_zero_snapshot = None # only stored in the trivial case, all snapshots are zero
             
         def clear(self):
             self.snapshots_matrix.clear()
             self.eigenvalues = ExportableList("text")
             self.retained_energy = ExportableList("text")
+            self._init_incremental()
             
+        # Store snapshots in a file on disk, rather than in memory
+        def store_snapshots_out_of_core(self, directory, filename):
+            self.snapshots_matrix.store_out_of_core(directory, filename)
+        
         # No implementation is provided for store_snapshot, because
         # it has different interface for the standard POD and
         # the tensor one.
+        
+        # Update the incremental decomposition with the snapshots which have just been stored, and then discard them
+        def _incremental_update(self):
+            if not self.incremental:
+                return
+            for snapshot in self.snapshots_matrix:
+                self._incremental_update_with_snapshot(snapshot)
+            self.snapshots_matrix.clear()
+        
+        def _incremental_update_with_snapshot(self, snapshot):
+            inner_product = self.inner_product
+            transpose = backend.transpose
+            
+            basis = self._incremental_basis
+            r = len(basis)
+            snapshot_energy = transpose(snapshot)*inner_product*snapshot
+            self._incremental_total_energy += snapshot_energy
+            
+            # Project the snapshot on the current basis, and orthogonalize it (in place) with respect to it.
+            # A second orthogonalization pass is carried out to recover the orthogonality lost to round-off
+            projection = [0. for _ in range(r)]
+            for _ in range(2):
+                for i in range(r):
+                    projection[i] += transpose(basis[i])*inner_product*snapshot
+                    snapshot = wrapping.gram_schmidt_projection_step(snapshot, inner_product, basis[i], transpose)
+            residual_norm = sqrt(abs(transpose(snapshot)*inner_product*snapshot))
+            # A residual which is negligible compared to the snapshot is only due to round-off, and normalizing it
+            # would add a spurious direction to the basis: the snapshot is then considered to lie in the current span
+            if residual_norm <= sqrt(finfo(float).eps)*sqrt(abs(snapshot_energy)):
+                residual_norm = 0.
+            
+            # Compute the singular value decomposition of the (r + 1) x (r + 1) matrix [diag(S), p; 0, |e|]
+            K = zeros((r + 1, r + 1))
+            for i in range(r):
+                K[i, i] = self._incremental_singular_values[i]
+                K[i, r] = projection[i]
+            K[r, r] = residual_norm
+            (K_U, K_S, _) = svd(K)
+            
+            # Truncate numerically zero modes, and then trailing modes (but the first one) as long as the discarded energy
+            # is within tolerance
+            r_new = r + 1
+            while r_new > 0:
+                discarded_energy = K_S[r_new - 1]**2
+                if (
+                    K_S[r_new - 1] <= finfo(float).eps*K_S[0]
+                        or
+                    (r_new > 1 and self._incremental_discarded_energy + discarded_energy <= self.incremental_tolerance*self._incremental_total_energy)
+                ):
+                    self._incremental_discarded_energy += discarded_energy
+                    r_new -= 1
+                else:
+                    break
+            
+            # Trivial case, all snapshots are zero: since all modes are truncated, keep the (zero) snapshot
+            # to be returned as basis function, as the method of snapshots does
+            if r_new is 0:
+                self._incremental_zero_snapshot = snapshot
+            
+            # Rotate the current basis, augmented by the normalized residual, according to the left singular vectors
+            if residual_norm > 0.:
+                snapshot /= residual_norm
+                basis.enrich(snapshot, copy=False)
+            new_basis = BasisContainerType(self.space, *self.args)
+            for j in range(r_new):
+                new_basis.enrich(basis*tuple(K_U[:len(basis), j].tolist()))
+            self._incremental_basis = new_basis
+            self._incremental_singular_values = K_S[:r_new].tolist()
                 
         def apply(self, Nmax, tol):
+            if self.incremental:
+                return self._apply_incremental(Nmax, tol)
+            elif self._use_SVD():
+                log(PROGRESS, "POD by direct SVD of the snapshots matrix")
+                return self._apply_SVD(Nmax, tol)
+            log(PROGRESS, "POD by method of snapshots")
+            
             inner_product = self.inner_product
             snapshots_matrix = self.snapshots_matrix
             transpose = backend.transpose
@@ -62,23 +166,34 @@ def ProperOrthogonalDecompositionBase(backend, wrapping, online_backend, online_
                 "spectrum": "largest real"
             }
             eigensolver.set_parameters(parameters)
-            eigensolver.solve()
             
-            Neigs = len(self.snapshots_matrix)
-            Nmax = min(Nmax, Neigs)
+            Nmax = min(Nmax, len(self.snapshots_matrix))
+            if config.get("POD", "eigensolver") == "truncated":
+                # Only compute the leading eigenpairs. The total energy is still available without computing
+                # the whole spectrum, since the sum of all eigenvalues of the correlation matrix is equal to its trace:
+                # the number of computed eigenpairs is then doubled (up to Nmax) until the retained energy satisfies tol
+                total_energy = compute_total_energy([abs(correlation[i, i]) for i in range(len(self.snapshots_matrix))])
+                Neigs = min(Nmax, 10)
+                while True:
+                    eigensolver.solve(Neigs)
+                    retained_energy = compute_total_energy([abs(eigensolver.get_eigenvalue(i)[0]) for i in range(Neigs)])
+                    if Neigs == Nmax or total_energy == 0. or retained_energy/total_energy > 1. - tol:
+                        break
+                    Neigs = min(2*Neigs, Nmax)
+                Nmax = Neigs
+            else:
+                Neigs = len(self.snapshots_matrix)
+                eigensolver.solve()
+                total_energy = None
             assert len(self.eigenvalues) is 0
             for i in range(Neigs):
                 (eig_i_real, eig_i_complex) = eigensolver.get_eigenvalue(i)
                 assert isclose(eig_i_complex, 0.)
                 self.eigenvalues.append(eig_i_real)
             
-            total_energy = compute_total_energy([abs(e) for e in self.eigenvalues])
-            retained_energy = compute_retained_energy([abs(e) for e in self.eigenvalues])
-            assert len(self.retained_energy) is 0
-            if total_energy > 0.:
-                self.retained_energy.extend([retained_energy_i/total_energy for retained_energy_i in retained_energy])
-            else:
-                self.retained_energy.extend([1. for _ in range(Neigs)]) # trivial case, all snapshots are zero
+            if total_energy is None:
+                total_energy = compute_total_energy([abs(e) for e in self.eigenvalues])
+            self._compute_retained_energy(total_energy)
             
             eigenvectors = list()
             for N in range(Nmax):
@@ -97,10 +212,79 @@ def ProperOrthogonalDecompositionBase(backend, wrapping, online_backend, online_
             N += 1
             
             return (self.eigenvalues[:N], eigenvectors, basis_functions, N)
+        
+        # The method of snapshots diagonalizes the Ns x Ns correlation matrix, while the direct (thin) SVD of the snapshots
+        # matrix costs O(Nh Ns min(Nh, Ns)) and does not square the condition number. The latter is thus preferred
+        # when the number Ns of snapshots exceeds the number Nh of dofs, provided that the backend implements it
+        def _use_SVD(self):
+            method = config.get("POD", "method")
+            if method not in ("automatic", "SVD") or not hasattr(wrapping, "snapshots_matrix_svd") or len(self.snapshots_matrix) is 0:
+                return False
+            elif method == "SVD":
+                return True
+            else:
+                return len(self.snapshots_matrix) > wrapping.snapshots_matrix_dimension(self.snapshots_matrix)
+        
+        def _apply_SVD(self, Nmax, tol):
+            if self.inner_product is not None and self._inner_product_cholesky_factor is None:
+                self._inner_product_cholesky_factor = wrapping.inner_product_cholesky_factor(self.inner_product)
+            (singular_values, right_singular_vectors) = wrapping.snapshots_matrix_svd(self.snapshots_matrix, self._inner_product_cholesky_factor)
+            
+            # Eigenvalues of the correlation matrix are the squares of the singular values, and its eigenvectors are the right singular vectors
+            assert len(self.eigenvalues) is 0
+            self.eigenvalues.extend([singular_value**2 for singular_value in singular_values])
+            self._compute_retained_energy(compute_total_energy([abs(e) for e in self.eigenvalues]))
+            
+            basis_functions = BasisContainerType(self.space, *self.args)
+            eigenvectors = list()
+            Nmax = min(Nmax, len(self.eigenvalues))
+            for N in range(Nmax):
+                eigenvectors.append(right_singular_vectors[N])
+                # Left singular vectors are already orthonormal with respect to the inner product
+                b = self.snapshots_matrix*right_singular_vectors[N]
+                if singular_values[N] != 0.:
+                    b /= singular_values[N]
+                basis_functions.enrich(b)
+                if self.retained_energy[N] > 1. - tol:
+                    break
+            N += 1
+            
+            return (self.eigenvalues[:N], eigenvectors, basis_functions, N)
+        
+        def _apply_incremental(self, Nmax, tol):
+            # Eigenvalues of the correlation matrix are the squares of the singular values of the snapshots matrix,
+            # and the incremental basis is already orthonormal with respect to the inner product
+            assert len(self.eigenvalues) is 0
+            incremental_basis = self._incremental_basis
+            if len(incremental_basis) is 0 and self._incremental_zero_snapshot is not None:
+                # Trivial case, all snapshots are zero: return a single zero basis function, as the method of snapshots does
+                self.eigenvalues.append(0.)
+                incremental_basis = [self._incremental_zero_snapshot]
+            else:
+                self.eigenvalues.extend([singular_value**2 for singular_value in self._incremental_singular_values])
+            self._compute_retained_energy(self._incremental_total_energy)
+            
+            basis_functions = BasisContainerType(self.space, *self.args)
+            Nmax = min(Nmax, len(self.eigenvalues))
+            for N in range(Nmax):
+                basis_functions.enrich(incremental_basis[N])
+                if self.retained_energy[N] > 1. - tol:
+                    break
+            N += 1
+            
+            return (self.eigenvalues[:N], list(), basis_functions, N)
+        
+        def _compute_retained_energy(self, total_energy):
+            retained_energy = compute_retained_energy([abs(e) for e in self.eigenvalues])
+            assert len(self.retained_energy) is 0
+            if total_energy > 0.:
+                self.retained_energy.extend([retained_energy_i/total_energy for retained_energy_i in retained_energy])
+            else:
+                self.retained_energy.extend([1. for _ in range(len(self.eigenvalues))]) # trivial case, all snapshots are zero
                 
         def print_eigenvalues(self, N=None):
             if N is None:
-                N = len(self.snapshots_matrix)
+                N = len(self.eigenvalues)
             for i in range(N):
                 print("lambda_" + str(i) + " = " + str(self.eigenvalues[i]))
             
@@ -17,6 +17,7 @@
 #
 
 import os
+from uuid import uuid4
 from rbnics.backends.abstract import TensorsList as AbstractTensorsList
 from rbnics.utils.cache import Cache
 from rbnics.utils.decorators import overload
@@ -29,6 +30,7 @@ def TensorsList(backend, wrapping, online_backend, online_wrapping):
             self.empty_tensor = empty_tensor
             self.mpi_comm = wrapping.get_mpi_comm(space)
             self._list = list() # of tensors
+            self._saved_lengths = dict() # from (directory, filename) to number of tensors already saved there
             self._precomputed_slices = Cache() # from tuple to TensorsList
         
         def enrich(self, tensors):
@@ -50,18 +52,27 @@ def TensorsList(backend, wrapping, online_backend, online_wrapping):
             
         def clear(self):
             self._list = list()
+            self._saved_lengths.clear()
             # Reset precomputed slices
             self._precomputed_slices.clear()
             
         def save(self, directory, filename):
+            # Tensors are only appended to the list (the list is only reset on clear()),
+            # so that only tensors which have not been saved to the same file yet need to be saved
+            saved_length = self._saved_lengths.get((str(directory), filename), 0)
+            for index in range(saved_length, len(self._list)):
+                wrapping.tensor_save(self._list[index], directory, filename + "_" + str(index))
+            # Update the length only after all tensors have been saved
             self._save_Nmax(directory, filename)
-            for (index, tensor) in enumerate(self._list):
-                wrapping.tensor_save(tensor, directory, filename + "_" + str(index))
+            self._saved_lengths[(str(directory), filename)] = len(self._list)
                     
         def _save_Nmax(self, directory, filename):
             if is_io_process(self.mpi_comm):
-                with open(os.path.join(str(directory), filename + ".length"), "w") as length:
+                # Write to a temporary file (with a unique name, as in TextIO) first, so that the length is updated atomically
+                temporary_filename = os.path.join(str(directory), filename + ".length." + uuid4().hex + ".tmp")
+                with open(temporary_filename, "w") as length:
                     length.write(str(len(self._list)))
+                os.replace(temporary_filename, os.path.join(str(directory), filename + ".length"))
             
         def load(self, directory, filename):
             if len(self._list) > 0: # avoid loading multiple times
@@ -71,6 +82,7 @@ def TensorsList(backend, wrapping, online_backend, online_wrapping):
                 tensor = wrapping.tensor_copy(self.empty_tensor)
                 wrapping.tensor_load(tensor, directory, filename + "_" + str(index))
                 self.enrich(tensor)
+            self._saved_lengths[(str(directory), filename)] = Nmax
             return True
             
         def _load_Nmax(self, directory, filename):
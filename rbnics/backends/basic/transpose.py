@@ -17,7 +17,7 @@
 #
 
 from rbnics.backends.basic.wrapping import DelayedTranspose
-from rbnics.utils.decorators import overload
+from rbnics.utils.decorators import list_of, overload
 from rbnics.utils.mpi import log, PROGRESS
 
 def transpose(backend, wrapping, online_backend, online_wrapping, AdditionalIsFunction=None, ConvertAdditionalFunctionTypes=None, AdditionalIsVector=None, ConvertAdditionalVectorTypes=None, AdditionalIsMatrix=None, ConvertAdditionalMatrixTypes=None):
@@ -186,6 +186,17 @@ def Vector_Transpose__times__Matrix(backend, wrapping, online_backend, online_wr
             log(PROGRESS, "End v^T A w")
             return output
             
+        @overload((backend.FunctionsList, list_of(backend.Function.Type())), )
+        def __mul__(self, functions):
+            log(PROGRESS, "Begin v^T A S")
+            # Compute A^T v only once, rather than A w for each function w
+            output = online_backend.OnlineVector(len(functions))
+            matrix_transpose_times_vector = wrapping.matrix_transpose_mul_vector(self.matrix, self.vector)
+            for (i, fun_i) in enumerate(functions):
+                output[i] = wrapping.vector_mul_vector(matrix_transpose_times_vector, wrapping.function_to_vector(fun_i))
+            log(PROGRESS, "End v^T A S")
+            return output
+        
         @overload(object, )
         def __mul__(self, other):
             if AdditionalIsFunction(other):
@@ -255,10 +266,7 @@ def FunctionsList_Transpose__times__Matrix(backend, wrapping, online_backend, on
         def __mul__(self, other_functions_list):
             log(PROGRESS, "Begin S^T*A*S")
             output = online_backend.OnlineMatrix(len(self.functions_list), len(other_functions_list))
-            for (j, fun_j) in enumerate(other_functions_list):
-                matrix_times_fun_j = wrapping.matrix_mul_vector(self.matrix, wrapping.function_to_vector(fun_j))
-                for (i, fun_i) in enumerate(self.functions_list):
-                    output[i, j] = wrapping.vector_mul_vector(wrapping.function_to_vector(fun_i), matrix_times_fun_j)
+            output[:, :] = wrapping.functions_list_transpose_mul_matrix_mul_functions_list(self.functions_list, self.matrix, other_functions_list)
             log(PROGRESS, "End S^T*A*S")
             return output
         
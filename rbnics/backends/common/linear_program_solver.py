@@ -36,10 +36,11 @@ else:
     linear_programming_backends["scipy"] = True
     
 from rbnics.backends.abstract import LinearProgramSolver as AbstractLinearProgramSolver
-from rbnics.utils.decorators import BackendFor, list_of, tuple_of
+from rbnics.utils.decorators import abstractmethod, BackendFor, list_of, tuple_of
 
 # Helper classes for linear pogram
-from numpy import eye, hstack, matrix as numpy_matrix, ndarray as numpy_vector, vstack, zeros
+from numpy import abs as vectorized_abs, argsort, array, asarray, eye, hstack, matrix as numpy_matrix, ndarray as numpy_vector, vstack, zeros
+from numpy.linalg import LinAlgError, solve as dense_solve
 def Matrix(m, n):
     return numpy_matrix(zeros((m, n)))
 def Vector(n):
@@ -47,45 +48,88 @@ def Vector(n):
 class Error(RuntimeError):
     pass
 
-if linear_programming_backends["cvxopt"]:
-    class CVXOPTLinearProgramSolver(AbstractLinearProgramSolver):
-        def __init__(self, cost, inequality_constraints_matrix, inequality_constraints_vector, bounds):
-            self.Q = len(cost)
-            # Store cost
-            self.cost = cvxopt.matrix(cost)
-            # Store inequality constraints matrix, also including a 2*Q x 2*Q submatrix for bound constraints
-            self.inequality_constraints_matrix = cvxopt.matrix(vstack((- inequality_constraints_matrix, - eye(self.Q), eye(self.Q))))
-            # Store inequality constraints vector, also including 2*Q rows for bound constraints
-            assert len(bounds) == self.Q
-            bounds_lower = zeros(self.Q)
-            bounds_upper = zeros(self.Q)
-            for (q, bounds_q) in enumerate(bounds):
-                assert bounds_q[0] <= bounds_q[1]
-                bounds_lower[q] = bounds_q[0]
-                bounds_upper[q] = bounds_q[1]
-            self.inequality_constraints_vector = cvxopt.matrix(hstack((- inequality_constraints_vector, bounds_lower, bounds_upper)))
+# Common base class, which stores all constraints (including bound constraints) in the form G x >= h,
+# and carries out the warm start. Since the solution of a linear program is a vertex of the feasible set,
+# the warm start computes the vertex defined by the provided active set, and checks if it is optimal, i.e.
+# if it is feasible and if the cost is a nonnegative combination of the active constraints
+class _LinearProgramSolverBase(AbstractLinearProgramSolver):
+    def __init__(self, cost, inequality_constraints_matrix, inequality_constraints_vector, bounds):
+        self.Q = len(cost)
+        # Store cost
+        self.cost = asarray(cost, dtype=float).reshape(self.Q)
+        # Store bounds
+        assert len(bounds) == self.Q
+        self.bounds = bounds
+        bounds_lower = zeros(self.Q)
+        bounds_upper = zeros(self.Q)
+        for (q, bounds_q) in enumerate(bounds):
+            assert bounds_q[0] <= bounds_q[1]
+            bounds_lower[q] = bounds_q[0]
+            bounds_upper[q] = bounds_q[1]
+        # Store inequality constraints matrix, also including a 2*Q x Q submatrix for bound constraints
+        self.inequality_constraints_matrix = vstack((asarray(inequality_constraints_matrix, dtype=float).reshape(-1, self.Q), eye(self.Q), - eye(self.Q)))
+        # Store inequality constraints vector, also including 2*Q rows for bound constraints
+        self.inequality_constraints_vector = hstack((asarray(inequality_constraints_vector, dtype=float).reshape(-1), bounds_lower, - bounds_upper))
+        # Active sets
+        self._warm_start_active_set = None
+        self.active_set = None
+    
+    def set_warm_start(self, active_set):
+        assert active_set is None or len(active_set) == self.Q
+        self._warm_start_active_set = active_set
+    
+    def solve(self):
+        solution = None
+        if self._warm_start_active_set is not None:
+            solution = self._solve_on_active_set(self._warm_start_active_set)
+            if solution is not None:
+                self.active_set = self._warm_start_active_set
+        if solution is None:
+            solution = self._solve()
+            # Store the Q constraints which are closest to be satisfied as equalities
+            residual = self.inequality_constraints_matrix.dot(solution) - self.inequality_constraints_vector
+            self.active_set = tuple(sorted(argsort(vectorized_abs(residual), kind="mergesort")[:self.Q].tolist()))
+        return self.cost.dot(solution)
+    
+    def _solve_on_active_set(self, active_set):
+        active_set = list(active_set)
+        if len(active_set) != self.Q or max(active_set) >= len(self.inequality_constraints_vector):
+            return None
+        active_matrix = self.inequality_constraints_matrix[active_set]
+        try:
+            solution = dense_solve(active_matrix, self.inequality_constraints_vector[active_set])
+            multipliers = dense_solve(active_matrix.T, self.cost)
+        except LinAlgError:
+            return None
+        tolerance = 1.e-10
+        residual = self.inequality_constraints_matrix.dot(solution) - self.inequality_constraints_vector
+        residual_scale = vectorized_abs(self.inequality_constraints_matrix).dot(vectorized_abs(solution)) + vectorized_abs(self.inequality_constraints_vector)
+        if (residual >= - tolerance*residual_scale).all() and (multipliers >= - tolerance*vectorized_abs(self.cost).max()).all():
+            return solution
+        else:
+            return None
             
-        def solve(self):
-            result = cvxopt.solvers.lp(self.cost, self.inequality_constraints_matrix, self.inequality_constraints_vector, solver="glpk", options={"glpk": {"msg_lev": "GLP_MSG_OFF"}})
+    @abstractmethod
+    def _solve(self):
+        raise NotImplementedError("The method _solve is backend-specific and needs to be overridden.")
+
+if linear_programming_backends["cvxopt"]:
+    class CVXOPTLinearProgramSolver(_LinearProgramSolverBase):
+        def _solve(self):
+            result = cvxopt.solvers.lp(cvxopt.matrix(self.cost), cvxopt.matrix(- self.inequality_constraints_matrix), cvxopt.matrix(- self.inequality_constraints_vector), solver="glpk", options={"glpk": {"msg_lev": "GLP_MSG_OFF"}})
             if result["status"] != "optimal":
                 raise Error("Linear program solver reports convergence failure with reason", result["status"])
             else:
-                return result["primal objective"]
+                return array(result["x"]).reshape(self.Q)
     
 if linear_programming_backends["scipy"]:
-    class SciPyLinearProgramSolver(AbstractLinearProgramSolver):
-        def __init__(self, cost, inequality_constraints_matrix, inequality_constraints_vector, bounds):
-            self.cost = cost
-            self.inequality_constraints_matrix = - inequality_constraints_matrix
-            self.inequality_constraints_vector = - inequality_constraints_vector
-            self.bounds = bounds
-            
-        def solve(self):
-            result = linprog(self.cost, self.inequality_constraints_matrix, self.inequality_constraints_vector, bounds=self.bounds)
+    class SciPyLinearProgramSolver(_LinearProgramSolverBase):
+        def _solve(self):
+            result = linprog(self.cost, - self.inequality_constraints_matrix[:- 2*self.Q], - self.inequality_constraints_vector[:- 2*self.Q], bounds=self.bounds)
             if not result.success:
                 raise Error("Linear program solver reports convergence failure with reason", result.status)
             else:
-                return result.fun
+                return asarray(result.x).reshape(self.Q)
             
 from numbers import Number
 if linear_programming_backends["cvxopt"]:
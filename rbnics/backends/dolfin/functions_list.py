@@ -20,8 +20,9 @@ from numbers import Number
 from ufl.core.operator import Operator
 from dolfin import FunctionSpace
 from rbnics.backends.basic import FunctionsList as BasicFunctionsList
+from rbnics.backends.dolfin.abs import PrettyTuple
 from rbnics.backends.dolfin.function import Function
-from rbnics.backends.dolfin.wrapping import function_extend_or_restrict, function_from_ufl_operators, function_load, function_save, function_to_vector, functions_list_mul_online_matrix, functions_list_mul_online_vector, get_function_subspace, get_mpi_comm
+from rbnics.backends.dolfin.wrapping import function_extend_or_restrict, function_from_ufl_operators, function_load, function_save, function_to_vector, functions_list_evaluate_at_dofs, functions_list_max_abs_of_residual, functions_list_mul_online_matrix, functions_list_mul_online_vector, functions_list_qdeim_dofs, get_function_subspace, get_global_dof_component, get_global_dof_coordinates, get_mpi_comm
 from rbnics.backends.online import OnlineFunction, OnlineMatrix, OnlineVector
 from rbnics.backends.online.wrapping import function_to_vector as online_function_to_online_vector
 from rbnics.utils.decorators import BackendFor, dict_of, list_of, ModuleWrapper, overload
@@ -52,3 +53,24 @@ class FunctionsList(FunctionsList_Base):
     def __setitem__(self, key, item):
         item = function_from_ufl_operators(item)
         FunctionsList_Base.__setitem__(self, key, item)
+    
+    # Evaluate all functions at the given dofs, returning a (number of dofs) x (number of functions) array
+    def evaluate_at_dofs(self, dofs_list):
+        return functions_list_evaluate_at_dofs(self, dofs_list)
+    
+    # Compute the maximum absolute value of each function minus the linear combination of basis functions
+    # with the corresponding column of coefficients
+    def max_abs_of_residual(self, basis_functions, coefficients):
+        return functions_list_max_abs_of_residual(self, basis_functions, coefficients)
+    
+    # Select as many interpolation locations as functions by Q-DEIM, returning them in the same format
+    # as the location of the maximum returned by max(abs(function)). Locations are nested, i.e. the first
+    # n locations are valid interpolation locations for the first n functions
+    def qdeim_locations(self):
+        space = self.space
+        locations = list()
+        for global_dof in functions_list_qdeim_dofs(self):
+            coordinates = get_global_dof_coordinates(global_dof, space)
+            component = get_global_dof_component(global_dof, space)
+            locations.append(PrettyTuple(coordinates, component, global_dof))
+        return locations
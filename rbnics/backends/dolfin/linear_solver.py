@@ -16,6 +16,7 @@
 # along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
 #
 
+from petsc4py import PETSc
 from ufl import Form
 from dolfin import assemble, DirichletBC, PETScLUSolver
 from rbnics.backends.abstract import LinearSolver as AbstractLinearSolver
@@ -27,32 +28,33 @@ from rbnics.backends.dolfin.vector import Vector
 from rbnics.backends.dolfin.wrapping.dirichlet_bc import ProductOutputDirichletBC
 from rbnics.utils.decorators import BackendFor, dict_of, list_of, overload
 
-@BackendFor("dolfin", inputs=((Form, Matrix.Type(), ParametrizedTensorFactory), Function.Type(), (Form, ParametrizedTensorFactory, Vector.Type()), (list_of(DirichletBC), ProductOutputDirichletBC, dict_of(str, list_of(DirichletBC)), dict_of(str, ProductOutputDirichletBC), None)))
+@BackendFor("dolfin", inputs=((Form, Matrix.Type(), ParametrizedTensorFactory), (Function.Type(), list_of(Function.Type())), (Form, ParametrizedTensorFactory, Vector.Type(), list_of((Form, ParametrizedTensorFactory, Vector.Type()))), (list_of(DirichletBC), ProductOutputDirichletBC, dict_of(str, list_of(DirichletBC)), dict_of(str, ProductOutputDirichletBC), None)))
 class LinearSolver(AbstractLinearSolver):
     def __init__(self, lhs, solution, rhs, bcs=None):
         self.solution = solution
+        self._bcs = bcs
         self._init_lhs(lhs, bcs)
         self._init_rhs(rhs, bcs)
-        self._apply_bcs(bcs)
+        self._apply_bcs(bcs, self.rhs)
         self._linear_solver = "default"
+        self._reuse_factorization = False
     
     @overload
     def _init_lhs(self, lhs: Form, bcs: (list_of(DirichletBC), ProductOutputDirichletBC, dict_of(str, list_of(DirichletBC)), dict_of(str, ProductOutputDirichletBC), None)):
         self.lhs = assemble(lhs, keep_diagonal=True)
+        self._lhs_is_original_reference = False
         
     @overload
     def _init_lhs(self, lhs: ParametrizedTensorFactory, bcs: (list_of(DirichletBC), ProductOutputDirichletBC, dict_of(str, list_of(DirichletBC)), dict_of(str, ProductOutputDirichletBC), None)):
         self.lhs = evaluate(lhs)
+        self._lhs_is_original_reference = False
         
     @overload
-    def _init_lhs(self, lhs: Matrix.Type(), bcs: None):
+    def _init_lhs(self, lhs: Matrix.Type(), bcs: (list_of(DirichletBC), ProductOutputDirichletBC, dict_of(str, list_of(DirichletBC)), dict_of(str, ProductOutputDirichletBC), None)):
+        # A copy of lhs will be created when applying bcs, in order not to change the original reference.
+        # The copy is postponed to solve(), since it is not needed if a previous factorization is reused
         self.lhs = lhs
-        
-    @overload
-    def _init_lhs(self, lhs: Matrix.Type(), bcs: (list_of(DirichletBC), ProductOutputDirichletBC, dict_of(str, list_of(DirichletBC)), dict_of(str, ProductOutputDirichletBC))):
-        # Create a copy of lhs, in order not to change
-        # the original references when applying bcs
-        self.lhs = lhs.copy()
+        self._lhs_is_original_reference = True
         
     @overload
     def _init_rhs(self, rhs: Form, bcs: (list_of(DirichletBC), ProductOutputDirichletBC, dict_of(str, list_of(DirichletBC)), dict_of(str, ProductOutputDirichletBC), None)):
@@ -73,27 +75,109 @@ class LinearSolver(AbstractLinearSolver):
         self.rhs = rhs.copy()
         
     @overload
-    def _apply_bcs(self, bcs: None):
+    def _init_rhs(self, rhs: list_of((Form, ParametrizedTensorFactory, Vector.Type())), bcs: (list_of(DirichletBC), ProductOutputDirichletBC, dict_of(str, list_of(DirichletBC)), dict_of(str, ProductOutputDirichletBC), None)):
+        # Multiple right-hand sides, which will be solved at once
+        rhs_list = list()
+        for rhs_i in rhs:
+            self._init_rhs(rhs_i, bcs)
+            rhs_list.append(self.rhs)
+        self.rhs = rhs_list
+    
+    @overload
+    def _apply_bcs(self, bcs: None, tensor: (Matrix.Type(), Vector.Type())):
         pass
         
     @overload
-    def _apply_bcs(self, bcs: (list_of(DirichletBC), ProductOutputDirichletBC)):
+    def _apply_bcs(self, bcs: (list_of(DirichletBC), ProductOutputDirichletBC), tensor: (Matrix.Type(), Vector.Type())):
         for bc in bcs:
-            bc.apply(self.lhs, self.rhs)
+            bc.apply(tensor)
             
     @overload
-    def _apply_bcs(self, bcs: (dict_of(str, list_of(DirichletBC)), dict_of(str, ProductOutputDirichletBC))):
+    def _apply_bcs(self, bcs: (dict_of(str, list_of(DirichletBC)), dict_of(str, ProductOutputDirichletBC)), tensor: (Matrix.Type(), Vector.Type())):
         for key in bcs:
             for bc in bcs[key]:
-                bc.apply(self.lhs, self.rhs)
+                bc.apply(tensor)
                 
+    @overload
+    def _apply_bcs(self, bcs: (list_of(DirichletBC), ProductOutputDirichletBC, dict_of(str, list_of(DirichletBC)), dict_of(str, ProductOutputDirichletBC), None), tensor: list_of(Vector.Type())):
+        for tensor_i in tensor:
+            self._apply_bcs(bcs, tensor_i)
+    
+    @overload
+    def _bcs_identifier(self, bcs: None):
+        return None
+    
+    @overload
+    def _bcs_identifier(self, bcs: (list_of(DirichletBC), ProductOutputDirichletBC)):
+        return tuple(bc.identifier() for bc in bcs)
+    
+    @overload
+    def _bcs_identifier(self, bcs: (dict_of(str, list_of(DirichletBC)), dict_of(str, ProductOutputDirichletBC))):
+        return tuple((key, tuple(bc.identifier() for bc in bcs[key])) for key in bcs)
+    
     def set_parameters(self, parameters):
-        assert len(parameters) in (0, 1)
-        if len(parameters) is 1:
-            assert "linear_solver" in parameters
+        assert len(parameters) in (0, 1, 2)
+        assert all([key in ("linear_solver", "reuse_factorization") for key in parameters])
         self._linear_solver = parameters.get("linear_solver", "default")
+        self._reuse_factorization = parameters.get("reuse_factorization", False)
         
     def solve(self):
-        solver = PETScLUSolver(self._linear_solver)
-        solver.solve(self.lhs, self.solution.vector(), self.rhs)
+        if self._reuse_factorization and self._lhs_is_original_reference:
+            solver = self._get_factorized_solver()
+        else:
+            solver = PETScLUSolver(self._linear_solver)
+            solver.set_operator(self._lhs_with_bcs())
+        self._solve(solver, self.solution, self.rhs)
         return self.solution
+    
+    @overload
+    def _solve(self, solver: PETScLUSolver, solution: Function.Type(), rhs: Vector.Type()):
+        solver.solve(solution.vector(), rhs)
+    
+    @overload
+    def _solve(self, solver: PETScLUSolver, solution: list_of(Function.Type()), rhs: list_of(Vector.Type())):
+        assert len(solution) == len(rhs)
+        # Compute the factorization, if not available yet
+        ksp = solver.ksp()
+        ksp.setUp()
+        factorization = ksp.getPC().getFactorMatrix()
+        (rows, columns) = factorization.getSizes()
+        # Store all right-hand sides as columns of a dense multivector
+        rhs_block = PETSc.Mat().createDense((rows, (PETSc.DECIDE, len(rhs))), comm=factorization.getComm())
+        rhs_block_array = rhs_block.getDenseArray()
+        for (j, rhs_j) in enumerate(rhs):
+            rhs_block_array[:, j] = rhs_j.get_local()
+        rhs_block.assemble()
+        # Carry out forward and backward substitutions for all right-hand sides at once
+        solution_block = PETSc.Mat().createDense((columns, (PETSc.DECIDE, len(rhs))), comm=factorization.getComm())
+        solution_block.assemble()
+        factorization.matSolve(rhs_block, solution_block)
+        # Copy back columns of the dense multivector to solutions
+        solution_block_array = solution_block.getDenseArray()
+        for (j, solution_j) in enumerate(solution):
+            solution_j.vector().set_local(solution_block_array[:, j])
+            solution_j.vector().apply("insert")
+        rhs_block.destroy()
+        solution_block.destroy()
+    
+    def _lhs_with_bcs(self):
+        if self._bcs is not None:
+            lhs = self.lhs.copy() if self._lhs_is_original_reference else self.lhs
+            self._apply_bcs(self._bcs, lhs)
+            return lhs
+        else:
+            return self.lhs
+    
+    def _get_factorized_solver(self):
+        # Factorized solvers are stored as an attribute of the original matrix, together with the identifier
+        # of the boundary conditions and the solver type, so that they are released together with the matrix
+        if not hasattr(self.lhs, "_factorized_solvers"):
+            self.lhs._factorized_solvers = list()
+        bcs_identifier = self._bcs_identifier(self._bcs)
+        for (factorized_solver_bcs_identifier, factorized_solver_linear_solver, factorized_solver) in self.lhs._factorized_solvers:
+            if factorized_solver_bcs_identifier == bcs_identifier and factorized_solver_linear_solver == self._linear_solver:
+                return factorized_solver
+        factorized_solver = PETScLUSolver(self._linear_solver)
+        factorized_solver.set_operator(self._lhs_with_bcs()) # the factorization will be computed at the first solve, and reused afterwards
+        self.lhs._factorized_solvers.append((bcs_identifier, self._linear_solver, factorized_solver))
+        return factorized_solver
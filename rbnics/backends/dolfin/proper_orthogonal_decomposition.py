@@ -23,7 +23,7 @@ from rbnics.backends.basic import ProperOrthogonalDecompositionBase as BasicProp
 from rbnics.backends.dolfin.functions_list import FunctionsList
 from rbnics.backends.dolfin.matrix import Matrix
 from rbnics.backends.dolfin.snapshots_matrix import SnapshotsMatrix
-from rbnics.backends.dolfin.wrapping import get_mpi_comm
+from rbnics.backends.dolfin.wrapping import get_mpi_comm, gram_schmidt_projection_step
 from rbnics.backends.online import OnlineEigenSolver
 from rbnics.utils.decorators import BackendFor, ModuleWrapper
 
@@ -32,7 +32,7 @@ def transpose(arg):
     return backend_transpose(arg)
 
 backend = ModuleWrapper(transpose)
-wrapping = ModuleWrapper(get_mpi_comm)
+wrapping = ModuleWrapper(get_mpi_comm, gram_schmidt_projection_step)
 online_backend = ModuleWrapper(OnlineEigenSolver=OnlineEigenSolver)
 online_wrapping = ModuleWrapper()
 ProperOrthogonalDecomposition_Base = BasicProperOrthogonalDecomposition(backend, wrapping, online_backend, online_wrapping, AbstractProperOrthogonalDecomposition, SnapshotsMatrix, FunctionsList)
@@ -44,3 +44,4 @@ class ProperOrthogonalDecomposition(ProperOrthogonalDecomposition_Base):
         
     def store_snapshot(self, snapshot, component=None, weight=None):
         self.snapshots_matrix.enrich(snapshot, component, weight)
+        self._incremental_update()
@@ -19,10 +19,21 @@
 from dolfin import FunctionSpace
 from rbnics.backends.basic import SnapshotsMatrix as BasicSnapshotsMatrix
 from rbnics.backends.dolfin.functions_list import FunctionsList
+from rbnics.backends.dolfin.wrapping import OutOfCoreFunctionsStorage
 from rbnics.utils.decorators import BackendFor
 
 SnapshotsMatrix_Base = BasicSnapshotsMatrix(FunctionsList)
 
 @BackendFor("dolfin", inputs=(FunctionSpace, (str, None)))
 class SnapshotsMatrix(SnapshotsMatrix_Base):
-    pass
+    # Store snapshots in a file on disk, rather than in memory
+    def store_out_of_core(self, directory, filename):
+        assert len(self._list) == 0
+        self._list = OutOfCoreFunctionsStorage(self.space, directory, filename)
+    
+    def clear(self):
+        storage = self._list
+        SnapshotsMatrix_Base.clear(self)
+        if isinstance(storage, OutOfCoreFunctionsStorage):
+            storage.clear()
+            self._list = storage
@@ -27,7 +27,7 @@ from rbnics.backends.dolfin.non_affine_expansion_storage import NonAffineExpansi
 from rbnics.backends.dolfin.parametrized_tensor_factory import ParametrizedTensorFactory
 from rbnics.backends.dolfin.tensors_list import TensorsList
 from rbnics.backends.dolfin.vector import Vector
-from rbnics.backends.dolfin.wrapping import function_from_ufl_operators, function_to_vector, matrix_mul_vector, vector_mul_vector, vectorized_matrix_inner_vectorized_matrix
+from rbnics.backends.dolfin.wrapping import function_from_ufl_operators, function_to_vector, functions_list_transpose_mul_matrix_mul_functions_list, matrix_mul_vector, matrix_transpose_mul_vector, vector_mul_vector, vectorized_matrix_inner_vectorized_matrix
 from rbnics.backends.online import OnlineMatrix, OnlineVector
 from rbnics.utils.decorators import backend_for, ModuleWrapper
 
@@ -38,7 +38,7 @@ def ConvertAdditionalFunctionTypes(arg):
     return function_from_ufl_operators(arg)
 
 backend = ModuleWrapper(BasisFunctionsMatrix, evaluate, Function, FunctionsList, Matrix, NonAffineExpansionStorage, ParametrizedTensorFactory, TensorsList, Vector)
-wrapping = ModuleWrapper(function_to_vector, matrix_mul_vector, vector_mul_vector, vectorized_matrix_inner_vectorized_matrix)
+wrapping = ModuleWrapper(function_to_vector, functions_list_transpose_mul_matrix_mul_functions_list, matrix_mul_vector, matrix_transpose_mul_vector, vector_mul_vector, vectorized_matrix_inner_vectorized_matrix)
 online_backend = ModuleWrapper(OnlineMatrix=OnlineMatrix, OnlineVector=OnlineVector)
 online_wrapping = ModuleWrapper()
 transpose_base = basic_transpose(backend, wrapping, online_backend, online_wrapping, AdditionalIsFunction, ConvertAdditionalFunctionTypes)
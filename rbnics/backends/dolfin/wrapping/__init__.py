@@ -49,7 +49,9 @@ from rbnics.backends.dolfin.wrapping.function_from_ufl_operators import function
 from rbnics.backends.dolfin.wrapping.function_load import function_load
 from rbnics.backends.dolfin.wrapping.function_save import function_save
 from rbnics.backends.dolfin.wrapping.function_space import FunctionSpace
-from rbnics.backends.dolfin.wrapping.functions_list_mul import functions_list_mul_online_matrix, functions_list_mul_online_vector
+from rbnics.backends.dolfin.wrapping.functions_list_evaluate_at_dofs import functions_list_evaluate_at_dofs, functions_list_max_abs_of_residual
+from rbnics.backends.dolfin.wrapping.functions_list_mul import functions_list_mul_online_matrix, functions_list_mul_online_vector, functions_list_transpose_mul_matrix_mul_functions_list
+from rbnics.backends.dolfin.wrapping.functions_list_qdeim_dofs import functions_list_qdeim_dofs
 from rbnics.backends.dolfin.wrapping.function_to_vector import function_to_vector
 from rbnics.backends.dolfin.wrapping.get_auxiliary_problem_for_non_parametrized_function import get_auxiliary_problem_for_non_parametrized_function
 from rbnics.backends.dolfin.wrapping.get_default_linear_solver import get_default_linear_solver
@@ -66,7 +68,8 @@ from rbnics.backends.dolfin.wrapping.is_parametrized import is_parametrized
 from rbnics.backends.dolfin.wrapping.is_problem_solution_or_problem_solution_component import is_problem_solution_or_problem_solution_component
 from rbnics.backends.dolfin.wrapping.is_problem_solution_or_problem_solution_component_type import is_problem_solution_or_problem_solution_component_type
 from rbnics.backends.dolfin.wrapping.is_time_dependent import is_time_dependent
-from rbnics.backends.dolfin.wrapping.matrix_mul import matrix_mul_vector, vectorized_matrix_inner_vectorized_matrix
+from rbnics.backends.dolfin.wrapping.matrix_mul import matrix_mul_vector, matrix_transpose_mul_vector, vectorized_matrix_inner_vectorized_matrix
+from rbnics.backends.dolfin.wrapping.out_of_core_functions_storage import OutOfCoreFunctionsStorage
 from rbnics.backends.dolfin.wrapping.parametrized_constant import is_parametrized_constant, ParametrizedConstant, parametrized_constant_to_float
 from rbnics.backends.dolfin.wrapping.parametrized_expression import ParametrizedExpression
 from rbnics.backends.dolfin.wrapping.plot import plot
@@ -114,8 +117,12 @@ __all__ = [
     'function_from_ufl_operators',
     'function_load',
     'function_save',
+    'functions_list_evaluate_at_dofs',
+    'functions_list_max_abs_of_residual',
     'functions_list_mul_online_matrix',
     'functions_list_mul_online_vector',
+    'functions_list_qdeim_dofs',
+    'functions_list_transpose_mul_matrix_mul_functions_list',
     'FunctionSpace',
     'function_to_vector',
     'get_auxiliary_problem_for_non_parametrized_function',
@@ -138,6 +145,8 @@ __all__ = [
     'is_time_dependent',
     'map_functionspaces_between_mesh_and_submesh',
     'matrix_mul_vector',
+    'matrix_transpose_mul_vector',
+    'OutOfCoreFunctionsStorage',
     'ParametrizedConstant',
     'parametrized_constant_to_float',
     'ParametrizedExpression',
@@ -0,0 +1,85 @@
+# Copyright (C) 2015-2018 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+from numpy import abs as vectorized_abs, array, float64, zeros
+from mpi4py.MPI import MAX
+from rbnics.backends.dolfin.wrapping.out_of_core_functions_storage import OutOfCoreFunctionsStorage
+from rbnics.backends.dolfin.wrapping.to_petsc4py import to_petsc4py
+
+# Evaluate all functions in the list at the given dofs, returning a (number of dofs) x (number of functions) array.
+# Each process fills in the rows corresponding to the dofs it owns, and a single reduction is then carried out
+def functions_list_evaluate_at_dofs(functions_list, dofs_list):
+    output_local = zeros((len(dofs_list), len(functions_list)))
+    output = zeros(output_local.shape)
+    if len(functions_list) is 0:
+        return output
+    mpi_comm = None
+    local_dofs_indices = list()
+    local_dofs_positions = list()
+    for (block_begin, block) in _local_blocks(functions_list):
+        if mpi_comm is None:
+            vec = to_petsc4py(functions_list[0].vector())
+            mpi_comm = vec.comm.tompi4py()
+            row_start, row_end = vec.getOwnershipRange()
+            for (index, dofs) in enumerate(dofs_list):
+                assert len(dofs) == 1
+                i = dofs[0]
+                if i >= row_start and i < row_end:
+                    local_dofs_indices.append(index)
+                    local_dofs_positions.append(i - row_start)
+        block_end = block_begin + block.shape[0]
+        output_local[local_dofs_indices, block_begin:block_end] = block[:, local_dofs_positions].T
+    mpi_comm.Allreduce(output_local, output)
+    return output
+    
+# Compute the maximum absolute value of each function in the list minus the corresponding linear combination
+# of basis functions, i.e. of each column of S - B*C, where C is a (number of basis functions) x (number of functions) array.
+# Residuals are computed one block of functions at a time, so that they are never stored as functions
+def functions_list_max_abs_of_residual(functions_list, basis_functions, coefficients):
+    assert coefficients.shape == (len(basis_functions), len(functions_list))
+    output_local = zeros(len(functions_list))
+    output = zeros(len(functions_list))
+    if len(functions_list) is 0:
+        return output
+    basis_functions_local = None
+    if len(basis_functions) > 0:
+        basis_functions_local = array([fun.vector().get_local() for fun in basis_functions], dtype=float64)
+    for (block_begin, block) in _local_blocks(functions_list):
+        block_end = block_begin + block.shape[0]
+        if block.shape[1] is 0:
+            continue
+        if basis_functions_local is not None:
+            residual = block - coefficients[:, block_begin:block_end].T.dot(basis_functions_local)
+        else:
+            residual = block
+        output_local[block_begin:block_end] = vectorized_abs(residual).max(axis=1)
+    mpi_comm = to_petsc4py(functions_list[0].vector()).comm.tompi4py()
+    mpi_comm.Allreduce(output_local, output, op=MAX)
+    return output
+    
+# Local dofs of the functions in the list, stored as rows of dense blocks of about 64MB each
+def _local_blocks(functions_list):
+    if isinstance(functions_list._list, OutOfCoreFunctionsStorage):
+        for (block_begin, block) in functions_list._list.local_blocks():
+            yield (block_begin, block)
+    else:
+        local_size = functions_list[0].vector().local_size()
+        block_size = max(1, 2**26//max(1, local_size*float64().itemsize))
+        for block_begin in range(0, len(functions_list), block_size):
+            block_end = min(block_begin + block_size, len(functions_list))
+            yield (block_begin, array([functions_list[i].vector().get_local() for i in range(block_begin, block_end)], dtype=float64).reshape(block_end - block_begin, local_size))
@@ -16,7 +16,15 @@
 # along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
 #
 
+from numpy import array, float64, zeros
+from mpi4py.MPI import MAX
+from petsc4py import PETSc
 from dolfin import Function, FunctionSpace
+from rbnics.backends.dolfin.wrapping.out_of_core_functions_storage import OutOfCoreFunctionsStorage
+from rbnics.backends.dolfin.wrapping.to_petsc4py import to_petsc4py
+
+# Memory (in bytes) taken up by each dense block of functions stored in memory in functions_list_transpose_mul_matrix_mul_functions_list
+_dense_block_memory = 2**26
 
 def functions_list_mul_online_matrix(functions_list, online_matrix, FunctionsListType):
     space = functions_list.space
@@ -24,6 +32,23 @@ def functions_list_mul_online_matrix(functions_list, online_matrix, FunctionsLis
     
     output = FunctionsListType(space)
     assert isinstance(online_matrix.M, int)
+    if isinstance(functions_list._list, OutOfCoreFunctionsStorage):
+        # Read functions in blocks, and accumulate the local dofs of all outputs at once
+        coefficients = array([[online_matrix[i, j] for j in range(online_matrix.M)] for i in range(len(functions_list))], dtype=float).reshape(len(functions_list), online_matrix.M)
+        output_local = None
+        for (block_begin, block) in functions_list._list.local_blocks():
+            block_output_local = block.T.dot(coefficients[block_begin:block_begin + block.shape[0]])
+            if output_local is None:
+                output_local = block_output_local
+            else:
+                output_local += block_output_local
+        for j in range(online_matrix.M):
+            output_j = Function(space)
+            if output_local is not None:
+                output_j.vector().add_local(output_local[:, j].copy())
+            output_j.vector().apply("add")
+            output.enrich(output_j)
+        return output
     for j in range(online_matrix.M):
         assert len(online_matrix[:, j]) == len(functions_list)
         output_j = Function(space)
@@ -40,8 +65,66 @@ def functions_list_mul_online_vector(functions_list, online_vector):
     output = Function(space)
     if len(functions_list) is 0:
         return output
+    elif isinstance(functions_list._list, OutOfCoreFunctionsStorage):
+        # Read functions in blocks
+        coefficients = array([online_vector[i] for i in range(len(functions_list))], dtype=float)
+        for (block_begin, block) in functions_list._list.local_blocks():
+            output.vector().add_local(block.T.dot(coefficients[block_begin:block_begin + block.shape[0]]))
+        output.vector().apply("add")
+        return output
     else:
         for (i, fun_i) in enumerate(functions_list):
             output.vector().add_local(fun_i.vector().get_local()*online_vector[i])
         output.vector().apply("add")
         return output
+
+def functions_list_transpose_mul_matrix_mul_functions_list(functions_list_1, matrix, functions_list_2):
+    # Store the local dofs of consecutive functions as columns of a dense block, so that the product
+    # is carried out as one sparse-dense matrix product, one local dense product and one reduction per block
+    def dense_local_block(functions_list, block_begin, block_end):
+        block = None
+        for j in range(block_begin, block_end):
+            fun_j_local = functions_list[j].vector().get_local()
+            if block is None:
+                block = zeros((len(fun_j_local), block_end - block_begin), order="F")
+            block[:, j - block_begin] = fun_j_local
+        return block
+    
+    # Functions are processed in blocks, so that only a few blocks are in memory at the same time. Functions stored
+    # out of core are read in their own blocks, while the number of columns of blocks of functions stored in memory
+    # is chosen so that each block takes up about _dense_block_memory bytes. The number of columns
+    # must be the same on all processes, because sparse-dense matrix products are collective
+    def dense_local_blocks(functions_list):
+        if isinstance(functions_list._list, OutOfCoreFunctionsStorage):
+            for (block_begin, block) in functions_list._list.local_blocks():
+                yield (block_begin, block.T.copy(order="F"))
+        else:
+            local_size = comm.tompi4py().allreduce(functions_list[0].vector().local_size(), op=MAX)
+            block_size = max(1, _dense_block_memory//max(1, local_size*float64().itemsize))
+            for block_begin in range(0, len(functions_list), block_size):
+                block_end = min(block_begin + block_size, len(functions_list))
+                yield (block_begin, dense_local_block(functions_list, block_begin, block_end))
+    
+    output = zeros((len(functions_list_1), len(functions_list_2)))
+    if len(functions_list_1) is 0 or len(functions_list_2) is 0:
+        return output
+    mat = to_petsc4py(matrix)
+    comm = mat.getComm()
+    output_local = zeros(output.shape)
+    for (block_2_begin, block_2) in dense_local_blocks(functions_list_2):
+        dense_2 = PETSc.Mat().createDense(((block_2.shape[0], None), (None, block_2.shape[1])), array=block_2, comm=comm)
+        dense_2.assemble()
+        matrix_times_dense_2 = mat.matMult(dense_2)
+        matrix_times_block_2 = matrix_times_dense_2.getDenseArray()
+        block_2_end = block_2_begin + block_2.shape[1]
+        if functions_list_2 is functions_list_1 and block_2_begin == 0 and block_2_end == len(functions_list_1):
+            # All functions fit in one block, which can be reused as left block
+            output_local[:, :] = block_2.T.dot(matrix_times_block_2)
+        else:
+            for (block_1_begin, block_1) in dense_local_blocks(functions_list_1):
+                block_1_end = block_1_begin + block_1.shape[1]
+                output_local[block_1_begin:block_1_end, block_2_begin:block_2_end] = block_1.T.dot(matrix_times_block_2)
+        dense_2.destroy()
+        matrix_times_dense_2.destroy()
+    comm.tompi4py().Allreduce(output_local, output)
+    return output
@@ -0,0 +1,71 @@
+# Copyright (C) 2015-2018 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+from numpy import argmax, array, dot, float64, hstack, zeros
+from numpy.linalg import norm
+from scipy.linalg import qr
+from rbnics.backends.dolfin.wrapping.to_petsc4py import to_petsc4py
+
+# Select as many dofs as functions in the list by a column pivoted QR factorization of the transpose of
+# the (dofs) x (functions) matrix (Q-DEIM). Since the matrix is distributed by rows, each process first
+# selects its candidate dofs by a pivoted QR factorization of its local rows, and then the final selection
+# is carried out (redundantly on all processes) among the gathered candidate rows (tournament pivoting).
+# The final selection is nested: the n-th dof is chosen by pivoting on the first n functions only, so that
+# the first n selected dofs are valid interpolation locations for the first n functions, for every n
+def functions_list_qdeim_dofs(functions_list):
+    N = len(functions_list)
+    if N == 0:
+        return list()
+    vec = to_petsc4py(functions_list[0].vector())
+    mpi_comm = vec.comm.tompi4py()
+    row_start, _ = vec.getOwnershipRange()
+    local_size = functions_list[0].vector().local_size()
+    # Select local candidates
+    if local_size > 0:
+        local_matrix = array([fun.vector().get_local() for fun in functions_list], dtype=float64).reshape(N, local_size)
+        (_, local_pivots) = qr(local_matrix, mode="r", pivoting=True, check_finite=False)
+        local_candidates = sorted(local_pivots[:min(N, local_size)])
+        local_candidates_matrix = local_matrix[:, local_candidates]
+        local_candidates_dofs = [row_start + int(i) for i in local_candidates]
+    else:
+        local_candidates_matrix = zeros((N, 0))
+        local_candidates_dofs = list()
+    # Gather candidates from all processes and carry out the final selection
+    candidates_matrix = hstack(mpi_comm.allgather(local_candidates_matrix))
+    candidates_dofs = [dof for dofs in mpi_comm.allgather(local_candidates_dofs) for dof in dofs]
+    assert candidates_matrix.shape[1] >= N
+    return [candidates_dofs[i] for i in _nested_pivots(candidates_matrix)]
+    
+# Pivots of a column pivoted QR factorization of the leading n rows of the N x M matrix, for n = 1, ..., N:
+# the n-th pivot maximizes the norm of the leading n rows of a column, once projected on the orthogonal
+# complement of the columns of the previous pivots. Since any subset of the rows of a full row rank matrix
+# has full row rank, the submatrix of the leading n rows and the first n pivots is nonsingular for every n
+def _nested_pivots(matrix):
+    N = matrix.shape[0]
+    pivots = list()
+    for n in range(1, N + 1):
+        leading_rows = matrix[:n]
+        if len(pivots) > 0:
+            (Q, _) = qr(leading_rows[:, pivots], mode="economic", check_finite=False)
+            residual = leading_rows - dot(Q, dot(Q.T, leading_rows))
+        else:
+            residual = leading_rows
+        residual_norms = norm(residual, axis=0)
+        residual_norms[pivots] = -1.
+        pivots.append(int(argmax(residual_norms)))
+    return pivots
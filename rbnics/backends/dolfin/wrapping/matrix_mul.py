@@ -16,7 +16,7 @@
 # along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
 #
 
-from dolfin import as_backend_type, has_pybind11
+from dolfin import as_backend_type, has_pybind11, Vector
 if has_pybind11():
     from dolfin import compile_cpp_code
 else: # legacy tr(A^T B) code, to be removed
@@ -25,6 +25,12 @@ else: # legacy tr(A^T B) code, to be removed
 def matrix_mul_vector(matrix, vector):
     return matrix*vector
     
+def matrix_transpose_mul_vector(matrix, vector):
+    output = Vector(vector.mpi_comm())
+    matrix.init_vector(output, 1)
+    matrix.transpmult(vector, output)
+    return output
+    
 if has_pybind11():
     cpp_code = """
         #include <pybind11/pybind11.h>
@@ -0,0 +1,107 @@
+# Copyright (C) 2015-2018 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+from numpy import float64, memmap, zeros
+from mpi4py.MPI import MAX
+from dolfin import Function
+from rbnics.backends.dolfin.wrapping.get_mpi_comm import get_mpi_comm
+
+# List-like storage of functions, to be used in place of a list of functions when snapshots do not fit in memory.
+# Local dofs of each function are appended as a row of a binary file (one file per process),
+# which is memory-mapped only when reading, so that functions can be read back either
+# one at a time or in blocks of consecutive rows
+class OutOfCoreFunctionsStorage(object):
+    def __init__(self, space, directory, filename):
+        self.space = space
+        mpi_comm = get_mpi_comm(space)
+        self._filename = os.path.join(str(directory), filename + "_" + str(mpi_comm.rank) + ".dat")
+        self._local_size = Function(space).vector().local_size()
+        self._row_size = self._local_size*float64().itemsize
+        self._length = 0
+        self._array = None # memory-mapped file, created only when reading
+        # Number of rows in each block, so that each block takes up about 64MB. The number of rows is the same
+        # on all processes, since blocks may be used in collective operations (e.g. sparse-dense matrix products)
+        self.block_size = max(1, 2**26//max(1, mpi_comm.allreduce(self._row_size, op=MAX)))
+        # Create an empty file, possibly overwriting any existing one
+        open(self._filename, "wb").close()
+    
+    def append(self, function):
+        # Only the whole storage (rather than one of its slices) can be enriched
+        assert os.path.getsize(self._filename) == self._length*self._row_size
+        local_dofs = function.vector().get_local().astype(float64)
+        assert len(local_dofs) == self._local_size
+        with open(self._filename, "ab") as file_:
+            file_.write(local_dofs.tobytes())
+        self._length += 1
+        self._array = None
+    
+    def clear(self):
+        open(self._filename, "wb").close()
+        self._length = 0
+        self._array = None
+    
+    def local_array(self):
+        if self._array is None:
+            if self._length > 0:
+                self._array = memmap(self._filename, dtype=float64, mode="r", shape=(self._length, self._local_size))
+            else:
+                self._array = zeros((0, self._local_size))
+        return self._array
+    
+    def local_blocks(self):
+        local_array = self.local_array()
+        for block_begin in range(0, self._length, self.block_size):
+            yield (block_begin, local_array[block_begin:block_begin + self.block_size])
+    
+    def __len__(self):
+        return self._length
+    
+    def __getitem__(self, key):
+        if isinstance(key, slice): # e.g. key = :N, return a storage for the first N functions
+            assert key.start is None
+            assert key.step is None
+            output = OutOfCoreFunctionsStorage.__new__(OutOfCoreFunctionsStorage)
+            output.__dict__.update(self.__dict__)
+            output._length = len(range(*key.indices(self._length)))
+            output._array = None
+            return output
+        else:
+            if key < 0:
+                key += self._length
+            if key < 0 or key >= self._length:
+                raise IndexError("Invalid index in OutOfCoreFunctionsStorage")
+            function = Function(self.space)
+            function.vector().set_local(self.local_array()[key].copy())
+            function.vector().apply("insert")
+            return function
+    
+    def __setitem__(self, key, function):
+        if key < 0:
+            key += self._length
+        assert key >= 0 and key < self._length
+        local_dofs = function.vector().get_local().astype(float64)
+        assert len(local_dofs) == self._local_size
+        with open(self._filename, "r+b") as file_:
+            file_.seek(key*self._row_size)
+            file_.write(local_dofs.tobytes())
+        self._array = None
+    
+    def __iter__(self):
+        for index in range(self._length):
+            yield self[index]
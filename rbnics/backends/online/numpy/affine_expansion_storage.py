@@ -15,8 +15,11 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
 #
-
+from copy import copy as shallow_copy
+from numbers import Number
+from numpy import array, einsum, nditer, tensordot
 from rbnics.backends.online.basic import AffineExpansionStorage as BasicAffineExpansionStorage
+from rbnics.backends.online.basic.wrapping import slice_to_array
 from rbnics.backends.online.numpy.copy import function_copy, tensor_copy
 from rbnics.backends.online.numpy.function import Function
 from rbnics.backends.online.numpy.matrix import Matrix
@@ -31,4 +34,95 @@ AffineExpansionStorage_Base = BasicAffineExpansionStorage(backend, wrapping)
 @BackendFor("numpy", inputs=((int, tuple_of(Matrix.Type()), tuple_of(Vector.Type())), (int, None)))
 class AffineExpansionStorage(AffineExpansionStorage_Base):
     def __init__(self, arg1, arg2=None):
+        # Dense array of shape (Q, ...) or (Q1, Q2, ...), which stores all matrices, vectors or scalars of the
+        # affine expansion contiguously. It is built on demand, and content items are then rebound to views of it
+        self._stacked_content = None
         AffineExpansionStorage_Base.__init__(self, arg1, arg2)
+    
+    def load(self, directory, filename):
+        loaded = AffineExpansionStorage_Base.load(self, directory, filename)
+        if loaded:
+            self._stacked_content = None
+        return loaded
+    
+    def __getitem__(self, key):
+        if (
+            isinstance(key, slice)
+                or
+            (isinstance(key, tuple) and all([isinstance(key_i, slice) for key_i in key]))
+        ):
+            return self._getitem_slices(key)
+        else:
+            return AffineExpansionStorage_Base.__getitem__(self, key)
+    
+    def _getitem_slices(self, key):
+        stacked_content = self._stack_content()
+        first_item = self._content[self._smallest_key]
+        if stacked_content is None or isinstance(first_item, Number):
+            return AffineExpansionStorage_Base.__getitem__(self, key)
+        slices = slice_to_array(first_item, key, self._component_name_to_basis_component_length, self._component_name_to_basis_component_index)
+        if slices in self._precomputed_slices:
+            return self._precomputed_slices[slices]
+        # Only slices which keep the leading rows/columns of each item can be represented as views
+        slices_per_axis = (slices, ) if isinstance(first_item, Vector.Type()) else slices
+        if not all([slice_ == tuple(range(len(slice_))) for slice_ in slices_per_axis]):
+            return AffineExpansionStorage_Base.__getitem__(self, key)
+        stacked_view = stacked_content[(Ellipsis, ) + tuple([slice(len(slice_)) for slice_ in slices_per_axis])]
+        # Sliced items share the auxiliary attributes of the slice of the first item, and their content is a view
+        first_item_slice = self._do_slicing(first_item, key)
+        output = AffineExpansionStorage.__new__(type(self), *self._content.shape)
+        output.__init__(*self._content.shape)
+        it = nditer(self._content, flags=["multi_index", "refs_ok"], op_flags=["readonly"])
+        while not it.finished:
+            item_slice = shallow_copy(first_item_slice)
+            item_slice.content = stacked_view[it.multi_index]
+            output[it.multi_index] = item_slice
+            it.iternext()
+        output._stacked_content = stacked_view
+        self._precomputed_slices[slices] = output
+        return output
+    
+    def __setitem__(self, key, item):
+        AffineExpansionStorage_Base.__setitem__(self, key, item)
+        self._stacked_content = None
+    
+    def _stack_content(self):
+        if self._stacked_content is None and self._content.size > 0:
+            items = list(self._content.flat)
+            if all([isinstance(item, (Matrix.Type(), Vector.Type())) for item in items]):
+                item_shape = items[0].content.shape
+                if not all([item.content.shape == item_shape for item in items]):
+                    return None
+                stacked_content = array([item.content for item in items], dtype=float)
+                for (item, stacked_item) in zip(items, stacked_content):
+                    item.content = stacked_item
+                self._stacked_content = stacked_content.reshape(self._content.shape + item_shape)
+            elif all([isinstance(item, Number) for item in items]):
+                self._stacked_content = array(items, dtype=float).reshape(self._content.shape)
+        return self._stacked_content
+    
+    # Compute the linear combination of affine expansion terms with coefficients thetas (and thetas2, for
+    # storages of order 2) by a single contraction of the stacked content.
+    # Returns NotImplemented if content cannot be stacked.
+    def _contract(self, thetas, thetas2):
+        stacked_content = self._stack_content()
+        if stacked_content is None:
+            return NotImplemented
+        order = self.order()
+        assert order in (1, 2)
+        if order == 1:
+            assert thetas2 is None
+            assert len(thetas) == stacked_content.shape[0]
+            output_content = tensordot(thetas, stacked_content, axes=1)
+        elif order == 2:
+            assert thetas2 is not None
+            assert len(thetas) == stacked_content.shape[0]
+            assert len(thetas2) == stacked_content.shape[1]
+            output_content = einsum("i,ij...,j->...", thetas, stacked_content, thetas2, optimize=True)
+        first_item = self._content[self._smallest_key]
+        if isinstance(first_item, Number):
+            return float(output_content)
+        else:
+            output = shallow_copy(first_item)
+            output.content = output_content
+            return output
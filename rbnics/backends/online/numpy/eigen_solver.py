@@ -16,8 +16,9 @@
 # along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
 #
 
-from numpy import real, imag
+from numpy import array, real, imag
 from scipy.linalg import eig, eigh
+from scipy.sparse.linalg import eigsh
 from rbnics.backends.abstract import FunctionsList as AbstractFunctionsList
 from rbnics.backends.abstract import EigenSolver as AbstractEigenSolver
 from rbnics.backends.online.numpy.function import Function
@@ -44,7 +45,14 @@ class EigenSolver(AbstractEigenSolver):
         self.parameters.update(parameters)
         
     def solve(self, n_eigs=None):
-        if self.parameters["problem_type"] == "hermitian":
+        if (
+            n_eigs is not None and n_eigs < self.A.N - 1
+                and
+            self.parameters["problem_type"] == "hermitian" and self.parameters["spectrum"] == "largest real"
+        ):
+            # Only compute the requested eigenpairs by Lanczos iterations
+            eigs, eigv = eigsh(array(self.A), k=n_eigs, M=(array(self.B) if self.B is not None else None), which="LA")
+        elif self.parameters["problem_type"] == "hermitian":
             eigs, eigv = eigh(self.A, self.B)
         else:
             eigs, eigv = eig(self.A, self.B)
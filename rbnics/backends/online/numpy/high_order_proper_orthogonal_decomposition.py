@@ -23,11 +23,11 @@ from rbnics.backends.online.numpy.eigen_solver import EigenSolver
 from rbnics.backends.online.numpy.tensor_snapshots_list import TensorSnapshotsList
 from rbnics.backends.online.numpy.tensor_basis_list import TensorBasisList
 from rbnics.backends.online.numpy.transpose import transpose
-from rbnics.backends.online.numpy.wrapping import get_mpi_comm
+from rbnics.backends.online.numpy.wrapping import get_mpi_comm, snapshots_matrix_dimension, snapshots_matrix_svd
 from rbnics.utils.decorators import BackendFor, ModuleWrapper
 
 backend = ModuleWrapper(transpose)
-wrapping = ModuleWrapper(get_mpi_comm)
+wrapping = ModuleWrapper(get_mpi_comm, snapshots_matrix_dimension, snapshots_matrix_svd)
 online_backend = ModuleWrapper(OnlineEigenSolver=EigenSolver)
 online_wrapping = ModuleWrapper()
 HighOrderProperOrthogonalDecomposition_Base = BasicHighOrderProperOrthogonalDecomposition(backend, wrapping, online_backend, online_wrapping, AbstractHighOrderProperOrthogonalDecomposition, TensorSnapshotsList, TensorBasisList)
@@ -17,6 +17,7 @@
 #
 
 from numpy.linalg import solve
+from scipy.linalg import solve_triangular
 from rbnics.backends.online.basic import LinearSolver as BasicLinearSolver
 from rbnics.backends.online.numpy.matrix import Matrix
 from rbnics.backends.online.numpy.product import DelayedTransposeWithArithmetic
@@ -30,10 +31,19 @@ LinearSolver_Base = BasicLinearSolver(backend, wrapping)
 
 @BackendFor("numpy", inputs=(Matrix.Type(), Function.Type(), Vector.Type(), ThetaType + DictOfThetaType + (None,)))
 class LinearSolver(LinearSolver_Base):
+    def __init__(self, lhs, solution, rhs, bcs=None):
+        LinearSolver_Base.__init__(self, lhs, solution, rhs, bcs)
+        self._lower_triangular = False
+    
     def set_parameters(self, parameters):
-        assert len(parameters) == 0, "NumPy linear solver does not accept parameters yet"
+        assert all([key in ("lower_triangular", "reuse_factorization") for key in parameters]), "NumPy linear solver only accepts lower_triangular and reuse_factorization parameters"
+        self._lower_triangular = parameters.get("lower_triangular", False)
         
     def solve(self):
-        solution = solve(self.lhs, self.rhs)
+        if self._lower_triangular:
+            # Forward substitution, rather than LU factorization
+            solution = solve_triangular(self.lhs, self.rhs, lower=True, check_finite=False)
+        else:
+            solution = solve(self.lhs, self.rhs)
         self.solution.vector()[:] = solution
         return self.solution
@@ -34,4 +34,8 @@ wrapping = ModuleWrapper(DelayedTransposeWithArithmetic=DelayedTransposeWithArit
 # even though this one actually carries out both the sum and the product!
 @backend_for("numpy", inputs=(ThetaType, (AffineExpansionStorage, NonAffineExpansionStorage), ThetaType + (None,)))
 def product(thetas, operators, thetas2=None):
+    if isinstance(operators, AffineExpansionStorage):
+        output = operators._contract(thetas, thetas2)
+        if output is not NotImplemented:
+            return ProductOutput(output)
     return product_base(thetas, operators, thetas2)
@@ -24,11 +24,11 @@ from rbnics.backends.online.numpy.functions_list import FunctionsList
 from rbnics.backends.online.numpy.matrix import Matrix
 from rbnics.backends.online.numpy.snapshots_matrix import SnapshotsMatrix
 from rbnics.backends.online.numpy.transpose import transpose
-from rbnics.backends.online.numpy.wrapping import get_mpi_comm
+from rbnics.backends.online.numpy.wrapping import get_mpi_comm, gram_schmidt_projection_step, inner_product_cholesky_factor, snapshots_matrix_dimension, snapshots_matrix_svd
 from rbnics.utils.decorators import BackendFor, ModuleWrapper
 
 backend = ModuleWrapper(transpose)
-wrapping = ModuleWrapper(get_mpi_comm)
+wrapping = ModuleWrapper(get_mpi_comm, gram_schmidt_projection_step, inner_product_cholesky_factor, snapshots_matrix_dimension, snapshots_matrix_svd)
 online_backend = ModuleWrapper(OnlineEigenSolver=EigenSolver)
 online_wrapping = ModuleWrapper()
 ProperOrthogonalDecomposition_Base = BasicProperOrthogonalDecomposition(backend, wrapping, online_backend, online_wrapping, AbstractProperOrthogonalDecomposition, SnapshotsMatrix, FunctionsList)
@@ -40,3 +40,4 @@ class ProperOrthogonalDecomposition(ProperOrthogonalDecomposition_Base):
         
     def store_snapshot(self, snapshot, component=None, weight=None):
         self.snapshots_matrix.enrich(snapshot, component, weight)
+        self._incremental_update()
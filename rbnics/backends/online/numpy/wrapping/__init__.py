@@ -21,10 +21,11 @@ from rbnics.backends.online.numpy.wrapping.basis_functions_matrix_mul import bas
 from rbnics.backends.online.numpy.wrapping.function_load import function_load
 from rbnics.backends.online.numpy.wrapping.function_save import function_save
 from rbnics.backends.online.numpy.wrapping.function_to_vector import function_to_vector
-from rbnics.backends.online.numpy.wrapping.functions_list_mul import functions_list_mul_online_matrix, functions_list_mul_online_vector
+from rbnics.backends.online.numpy.wrapping.functions_list_mul import functions_list_mul_online_matrix, functions_list_mul_online_vector, functions_list_transpose_mul_matrix_mul_functions_list
 from rbnics.backends.online.numpy.wrapping.get_mpi_comm import get_mpi_comm
 from rbnics.backends.online.numpy.wrapping.gram_schmidt_projection_step import gram_schmidt_projection_step
-from rbnics.backends.online.numpy.wrapping.matrix_mul import matrix_mul_vector, vectorized_matrix_inner_vectorized_matrix
+from rbnics.backends.online.numpy.wrapping.matrix_mul import matrix_mul_vector, matrix_transpose_mul_vector, vectorized_matrix_inner_vectorized_matrix
+from rbnics.backends.online.numpy.wrapping.snapshots_matrix_svd import inner_product_cholesky_factor, snapshots_matrix_dimension, snapshots_matrix_svd
 from rbnics.backends.online.numpy.wrapping.tensor_load import tensor_load
 from rbnics.backends.online.numpy.wrapping.tensor_save import tensor_save
 from rbnics.backends.online.numpy.wrapping.vector_mul import vector_mul_vector
@@ -37,10 +38,15 @@ __all__ = [
     'function_to_vector',
     'functions_list_mul_online_matrix',
     'functions_list_mul_online_vector',
+    'functions_list_transpose_mul_matrix_mul_functions_list',
     'get_mpi_comm',
     'gram_schmidt_projection_step',
+    'inner_product_cholesky_factor',
     'matrix_mul_vector',
+    'matrix_transpose_mul_vector',
     'Slicer',
+    'snapshots_matrix_dimension',
+    'snapshots_matrix_svd',
     'tensor_load',
     'tensor_save',
     'vector_mul_vector',
@@ -16,8 +16,26 @@
 # along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
 #
 
+from numpy import array
+from rbnics.backends.online.numpy.wrapping.function_to_vector import function_to_vector
+
 def functions_list_mul_online_matrix(functions_list, online_matrix, FunctionsListType):
-    raise RuntimeError("TODO") # TODO
+    output = FunctionsListType(functions_list.space)
+    assert isinstance(online_matrix.M, int)
+    for j in range(online_matrix.M):
+        assert len(online_matrix[:, j]) == len(functions_list)
+        output.enrich(functions_list_mul_online_vector(functions_list, [online_matrix[i, j] for i in range(len(functions_list))]))
+    return output
 
 def functions_list_mul_online_vector(functions_list, online_vector):
-    raise RuntimeError("TODO") # TODO
+    assert len(functions_list) > 0
+    output = functions_list[0]*float(online_vector[0])
+    for (i, fun_i) in enumerate(functions_list):
+        if i > 0:
+            output += fun_i*float(online_vector[i])
+    return output
+
+def functions_list_transpose_mul_matrix_mul_functions_list(functions_list_1, matrix, functions_list_2):
+    block_1 = array([array(function_to_vector(fun_i)) for fun_i in functions_list_1])
+    block_2 = array([array(function_to_vector(fun_j)) for fun_j in functions_list_2])
+    return block_1.dot(array(matrix).dot(block_2.T))
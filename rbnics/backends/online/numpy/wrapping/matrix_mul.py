@@ -19,5 +19,8 @@
 def matrix_mul_vector(matrix, vector):
     return matrix*vector
 
+def matrix_transpose_mul_vector(matrix, vector):
+    return type(vector)(matrix.N, matrix.content.T.dot(vector.content))
+
 def vectorized_matrix_inner_vectorized_matrix(matrix, other_matrix):
     return (matrix*other_matrix).sum()
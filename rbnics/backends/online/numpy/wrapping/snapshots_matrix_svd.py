@@ -0,0 +1,50 @@
+# Copyright (C) 2015-2018 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+from numpy import array
+from numpy.linalg import cholesky, svd
+
+# Number of entries of each snapshot, used to choose between the method of snapshots and the direct SVD
+def snapshots_matrix_dimension(snapshots_matrix):
+    assert len(snapshots_matrix) > 0
+    return _flatten(snapshots_matrix[0]).size
+    
+# Lower triangular L such that X = L L^T, where X is the inner product matrix
+def inner_product_cholesky_factor(inner_product):
+    return cholesky(array(inner_product))
+
+# Singular values and right singular vectors of the snapshots matrix S, weighted by the transpose of the
+# Cholesky factor L of the inner product (if provided), i.e. of the matrix L^T S. Right singular vectors
+# are returned as online functions, like the eigenvectors of the correlation matrix S^T X S
+def snapshots_matrix_svd(snapshots_matrix, cholesky_factor=None):
+    from rbnics.backends.online.numpy.function import Function # cannot import at global scope due to cyclic dependence
+    from rbnics.backends.online.numpy.vector import Vector # cannot import at global scope due to cyclic dependence
+    snapshots = array([_flatten(snapshot) for snapshot in snapshots_matrix]).T
+    if cholesky_factor is not None:
+        snapshots = cholesky_factor.T.dot(snapshots)
+    (_, singular_values, right_singular_vectors) = svd(snapshots, full_matrices=False)
+    Ns = len(snapshots_matrix)
+    return (
+        [float(singular_value) for singular_value in singular_values],
+        [Function(Vector.Type()(Ns, right_singular_vectors[i, :].copy())) for i in range(len(singular_values))]
+    )
+    
+def _flatten(snapshot):
+    if hasattr(snapshot, "vector"): # function
+        snapshot = snapshot.vector()
+    return array(snapshot).flatten()
@@ -17,7 +17,7 @@
 #
 
 from numbers import Number
-from rbnics.backends import LinearSolver
+from rbnics.backends import Function, LinearSolver
 from rbnics.backends.basic.wrapping import DelayedLinearSolver, DelayedProduct
 from rbnics.eim.backends.offline_online_switch import OfflineOnlineSwitch
 from rbnics.utils.cache import cache
@@ -52,25 +52,50 @@ def OfflineOnlineRieszSolver(problem_name):
             
             @overload
             def solve(self, rhs: object):
-                problem = self.problem
-                args = (problem._riesz_solve_inner_product, problem._riesz_solve_storage, rhs, problem._riesz_solve_homogeneous_dirichlet_bc)
+                return self._solve(self.problem._riesz_solve_storage, rhs)
+            
+            @overload
+            def solve(self, coef: Number, matrix: object, basis_function: object):
+                return self.solve(self._rhs(coef, matrix, basis_function))
+            
+            def solve_block(self, rhs_args):
+                if len(rhs_args) == 0:
+                    return list()
                 if not self.delay:
-                    solver = LinearSolver(*args)
-                    solver.set_parameters(problem._linear_solver_parameters)
-                    return solver.solve()
+                    rhs = [self._rhs(*rhs_args_i) for rhs_args_i in rhs_args]
+                    solutions = [Function(self.problem.truth_problem.V) for _ in rhs]
+                    return self._solve(solutions, rhs)
                 else:
-                    solver = DelayedLinearSolver(*args)
-                    solver.set_parameters(problem._linear_solver_parameters)
-                    return solver
-                    
+                    # Delayed solves are carried out one at a time when they are actually needed
+                    return [self.solve(*rhs_args_i) for rhs_args_i in rhs_args]
+            
             @overload
-            def solve(self, coef: Number, matrix: object, basis_function: object):
+            def _rhs(self, rhs: object):
+                return rhs
+            
+            @overload
+            def _rhs(self, coef: Number, matrix: object, basis_function: object):
                 if not self.delay:
                     rhs = coef*matrix*basis_function
                 else:
                     rhs = DelayedProduct(coef)
                     rhs *= matrix
                     rhs *= basis_function
-                return self.solve(rhs)
+                return rhs
+            
+            def _solve(self, solution, rhs):
+                problem = self.problem
+                args = (problem._riesz_solve_inner_product, solution, rhs, problem._riesz_solve_homogeneous_dirichlet_bc)
+                # All Riesz solves share the same inner product, so that its factorization can be reused
+                parameters = dict(problem._linear_solver_parameters)
+                parameters["reuse_factorization"] = True
+                if not self.delay:
+                    solver = LinearSolver(*args)
+                    solver.set_parameters(parameters)
+                    return solver.solve()
+                else:
+                    solver = DelayedLinearSolver(*args)
+                    solver.set_parameters(parameters)
+                    return solver
             
     return _OfflineOnlineRieszSolver
@@ -172,5 +172,10 @@ def DEIMDecoratedReducedProblem(ParametrizedReducedDifferentialProblem_DerivedCl
             # Update current stage in offline/online switch
             OfflineOnlineSwitch.set_current_stage(current_stage)
             
+        def _incremental_offline_assembly_key(self, term):
+            # Reduced operators are assembled in a different storage for each stage
+            OfflineOnlineSwitch = self.offline_online_backend.OfflineOnlineSwitch
+            return (OfflineOnlineSwitch.get_current_stage(), term)
+    
     # return value (a class) for the decorator
     return DEIMDecoratedReducedProblem_Class
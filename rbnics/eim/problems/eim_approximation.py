@@ -136,6 +136,10 @@ class EIMApproximation(ParametrizedProblem):
                 
                 # Solve the interpolation problem
                 solver = OnlineLinearSolver(lhs, self._interpolation_coefficients, rhs)
+                if self.basis_generation == "Greedy":
+                    # Since each basis function vanishes at the previous interpolation locations, the interpolation
+                    # matrix is lower triangular, and forward substitution is enough
+                    solver.set_parameters({"lower_triangular": True})
                 solver.solve()
         else:
             self._interpolation_coefficients = None # OnlineFunction
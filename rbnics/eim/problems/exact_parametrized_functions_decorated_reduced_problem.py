@@ -180,6 +180,11 @@ def ExactParametrizedFunctionsDecoratedReducedProblem(ParametrizedReducedDiffere
             # Update current stage in offline/online switch
             OfflineOnlineSwitch.set_current_stage(current_stage)
             
+        def _incremental_offline_assembly_key(self, term):
+            # Reduced operators are assembled in a different storage for each stage
+            OfflineOnlineSwitch = self.offline_online_backend.OfflineOnlineSwitch
+            return (OfflineOnlineSwitch.get_current_stage(), term)
+        
         def _cache_key_from_N_and_kwargs(self, N, **kwargs):
             if len(self.truth_problem._apply_exact_evaluation_at_stages) is 1: # uses EIM/DEIM online and exact evaluation offline
                 cache_key = ParametrizedReducedDifferentialProblem_DerivedClass._cache_key_from_N_and_kwargs(self, N, **kwargs)
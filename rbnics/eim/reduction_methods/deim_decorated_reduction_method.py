@@ -67,6 +67,14 @@ def DEIMDecoratedReductionMethod(DifferentialProblemReductionMethod_DerivedClass
                 DEIM_reduction.set_tolerance(max(DEIM_reduction.tol, tol_DEIM)) # kwargs are not needed
             self._propagate_setter_from_kwargs_to_DEIM_reductions(setter, Number, **kwargs)
             
+        # OFFLINE: split the computation of snapshots among groups of processes
+        def set_parameter_groups(self, group_mpi_comm):
+            DifferentialProblemReductionMethod_DerivedClass.set_parameter_groups(self, group_mpi_comm)
+            # Share the same groups with DEIM reductions
+            for DEIM_reductions_term in self.DEIM_reductions.values():
+                for DEIM_reduction in DEIM_reductions_term.values():
+                    DEIM_reduction._parameter_groups = self._parameter_groups
+        
         # OFFLINE: set the elements in the training set.
         def initialize_training_set(self, ntrain, enable_import=True, sampling=None, **kwargs):
             import_successful = DifferentialProblemReductionMethod_DerivedClass.initialize_training_set(self, ntrain, enable_import, sampling, **kwargs)
@@ -113,16 +121,16 @@ def DEIMDecoratedReductionMethod(DifferentialProblemReductionMethod_DerivedClass
             return return_value # an "and" with a None results in None, so this method returns only if necessary
             
         # Perform the offline phase of the reduced order model
-        def offline(self):
+        def offline(self, **kwargs):
             if "offline" not in self.truth_problem._apply_DEIM_at_stages:
                 assert hasattr(self.truth_problem, "_apply_exact_evaluation_at_stages"), "Please use @ExactParametrizedFunctions(\"offline\")"
                 assert "offline" in self.truth_problem._apply_exact_evaluation_at_stages, "Please use @ExactParametrizedFunctions(\"offline\")"
             lifting_mu = self.truth_problem.mu
             for (term, DEIM_reductions_term) in self.DEIM_reductions.items():
                 for (_, DEIM_reduction_term_q) in DEIM_reductions_term.items():
-                    DEIM_reduction_term_q.offline()
+                    DEIM_reduction_term_q.offline(**kwargs)
             self.truth_problem.set_mu(lifting_mu)
-            return DifferentialProblemReductionMethod_DerivedClass.offline(self)
+            return DifferentialProblemReductionMethod_DerivedClass.offline(self, **kwargs)
             
         # Compute the error of the reduced order approximation with respect to the full order one
         # over the testing set
@@ -17,9 +17,13 @@
 #
 
 import os
+from numpy import argmax, array
+from scipy.linalg import solve_triangular
 from rbnics.reduction_methods.base import ReductionMethod
 from rbnics.backends import abs, evaluate, max
-from rbnics.utils.io import ErrorAnalysisTable, Folders, GreedySelectedParametersList, GreedyErrorEstimatorsList, SpeedupAnalysisTable, TextBox, TextLine, Timer
+from rbnics.backends.online import OnlineMatrix
+from rbnics.utils.config import config
+from rbnics.utils.io import ErrorAnalysisTable, Folders, GreedySelectedParametersList, GreedyErrorEstimatorsList, SpeedupAnalysisTable, TextBox, TextIO as CheckpointIO, TextLine, Timer
 from rbnics.utils.test import PatchInstanceMethod
 
 # Empirical interpolation method for the interpolation of parametrized functions
@@ -36,6 +40,7 @@ class EIMApproximationReductionMethod(ReductionMethod):
         # Declare a new container to store the snapshots
         self.snapshots_container = self.EIM_approximation.parametrized_expression.create_snapshots_container()
         self._training_set_parameters_to_snapshots_container_index = dict()
+        self._snapshots_out_of_core = False
         # I/O
         self.folder["snapshots"] = os.path.join(self.folder_prefix, "snapshots")
         self.folder["post_processing"] = os.path.join(self.folder_prefix, "post_processing")
@@ -57,11 +62,21 @@ class EIMApproximationReductionMethod(ReductionMethod):
     def initialize_testing_set(self, ntest, enable_import=False, sampling=None, **kwargs):
         return ReductionMethod.initialize_testing_set(self, self.EIM_approximation.mu_range, ntest, enable_import, sampling, **kwargs)
     
-    # Perform the offline phase of EIM
-    def offline(self):
+    # Perform the offline phase of EIM. If resume is True, an interrupted offline phase is carried out again: intermediate
+    # data are not reused (interpolation locations stored in a reduced mesh cannot be truncated to the last
+    # completed iteration), but evaluations of the parametrized expression are read back from the cache
+    def offline(self, resume=False):
         need_to_do_offline_stage = self._init_offline()
+        if not need_to_do_offline_stage and resume and not self._offline_completed():
+            self._init_offline_data_structures()
+            need_to_do_offline_stage = True
         if need_to_do_offline_stage:
-            self._offline()
+            def compute_snapshot(mu_index, mu):
+                self.EIM_approximation.set_mu(mu)
+                self.EIM_approximation.evaluate_parametrized_expression()
+                self.EIM_approximation.export_solution(self.folder["snapshots"], "truth_" + str(mu_index))
+            
+            self._offline_by_parameter_groups(compute_snapshot, self._offline)
         self._finalize_offline()
         return self.EIM_approximation
         
@@ -81,8 +96,24 @@ class EIMApproximationReductionMethod(ReductionMethod):
         if not at_least_one_required_folder_created:
             return False # offline construction should be skipped, since data are already available
         else:
-            self.EIM_approximation.init("offline")
+            self._init_offline_data_structures()
             return True # offline construction should be carried out
+    
+    def _init_offline_data_structures(self):
+        self.EIM_approximation.init("offline")
+        # Store snapshots on disk rather than in memory, if required (tensors are always stored in memory)
+        if config.get("EIM", "snapshots storage") == "disk" and hasattr(self.snapshots_container, "store_out_of_core"):
+            self.snapshots_container.store_out_of_core(self.folder["snapshots"], "snapshots_container")
+            self._snapshots_out_of_core = True
+        # Mark the offline phase as not completed, until it actually ends
+        CheckpointIO.save_file({"completed": False}, self.folder["post_processing"], "offline_checkpoint")
+    
+    def _offline_completed(self):
+        # Offline data stored before checkpoints were introduced are considered to be complete
+        if CheckpointIO.exists_file(self.folder["post_processing"], "offline_checkpoint"):
+            return CheckpointIO.load_file(self.folder["post_processing"], "offline_checkpoint")["completed"]
+        else:
+            return True
         
     def _offline(self):
         interpolation_method_name = self.EIM_approximation.parametrized_expression.interpolation_method_name()
@@ -151,6 +182,21 @@ class EIMApproximationReductionMethod(ReductionMethod):
                 print("maximum interpolation relative error =", relative_error_max)
                 
                 print("")
+        elif config.get("EIM", "interpolation locations") == "QDEIM" and hasattr(self.EIM_approximation.basis_functions, "qdeim_locations") and N_POD > 0:
+            print(TextLine(interpolation_method_name + " N = " + str(N_POD), fill=":"))
+            
+            print("select all interpolation locations by pivoted QR")
+            for location in self.EIM_approximation.basis_functions[:N_POD].qdeim_locations():
+                self.EIM_approximation.interpolation_locations.append(location)
+            self.EIM_approximation.interpolation_locations.save(self.EIM_approximation.folder["reduced_operators"], "interpolation_locations")
+            
+            self.EIM_approximation.N = N_POD
+            
+            print("assemble interpolation matrix")
+            self.EIM_approximation.interpolation_matrix[0] = evaluate(self.EIM_approximation.basis_functions[:N_POD], self.EIM_approximation.interpolation_locations)
+            self.EIM_approximation.interpolation_matrix.save(self.EIM_approximation.folder["reduced_operators"], "interpolation_matrix")
+            
+            print("")
         else:
             while self.EIM_approximation.N < N_POD:
                 print(TextLine(interpolation_method_name + " N = " + str(self.EIM_approximation.N), fill=":"))
@@ -172,6 +218,8 @@ class EIMApproximationReductionMethod(ReductionMethod):
                 
                 print("")
                 
+        CheckpointIO.save_file({"completed": True}, self.folder["post_processing"], "offline_checkpoint")
+        
         print(TextBox(interpolation_method_name + " offline phase ends for" + "\n" + "\n".join(description), fill="="))
         print("")
         
@@ -200,6 +248,8 @@ class EIMApproximationReductionMethod(ReductionMethod):
     # Update basis (POD version)
     def compute_basis_POD(self):
         POD = self.EIM_approximation.parametrized_expression.create_POD_container()
+        if self._snapshots_out_of_core:
+            POD.store_snapshots_out_of_core(self.folder["snapshots"], "POD_snapshots_matrix")
         POD.store_snapshot(self.snapshots_container)
         (_, _, basis_functions, N) = POD.apply(self.Nmax, self.tol)
         self.EIM_approximation.basis_functions.enrich(basis_functions)
@@ -216,7 +266,27 @@ class EIMApproximationReductionMethod(ReductionMethod):
     
     # Assemble the interpolation matrix
     def update_interpolation_matrix(self):
-        self.EIM_approximation.interpolation_matrix[0] = evaluate(self.EIM_approximation.basis_functions[:self.EIM_approximation.N], self.EIM_approximation.interpolation_locations)
+        N = self.EIM_approximation.N
+        basis_functions = self.EIM_approximation.basis_functions
+        interpolation_locations = self.EIM_approximation.interpolation_locations
+        if N > 1 and hasattr(basis_functions, "evaluate_at_dofs"):
+            # The interpolation matrix for N - 1 basis functions is already available: copy it, and then
+            # only add the new column (new basis function at all locations) and the new row (previous
+            # basis functions at the new location)
+            previous_interpolation_matrix = self.EIM_approximation.interpolation_matrix[0]
+            interpolation_matrix = OnlineMatrix(N, N)
+            for i in range(N - 1):
+                for j in range(N - 1):
+                    interpolation_matrix[i, j] = previous_interpolation_matrix[i, j]
+            new_column = evaluate(basis_functions[N - 1], interpolation_locations)
+            for i in range(N):
+                interpolation_matrix[i, N - 1] = new_column[i]
+            new_row = basis_functions[:N - 1].evaluate_at_dofs(interpolation_locations.get_dofs_list()[N - 1:])
+            for j in range(N - 1):
+                interpolation_matrix[N - 1, j] = new_row[0, j]
+            self.EIM_approximation.interpolation_matrix[0] = interpolation_matrix
+        else:
+            self.EIM_approximation.interpolation_matrix[0] = evaluate(basis_functions[:N], interpolation_locations)
         self.EIM_approximation.interpolation_matrix.save(self.EIM_approximation.folder["reduced_operators"], "interpolation_matrix")
             
     # Load the precomputed snapshot
@@ -255,7 +325,10 @@ class EIMApproximationReductionMethod(ReductionMethod):
             print("find initial mu")
         else:
             print("find next mu")
-        (error_max, error_argmax) = self.training_set.max(solve_and_computer_error)
+        if hasattr(self.snapshots_container, "max_abs_of_residual"):
+            (error_max, error_argmax) = self._greedy_batch()
+        else:
+            (error_max, error_argmax) = self.training_set.max(solve_and_computer_error)
         self.EIM_approximation.set_mu(self.training_set[error_argmax])
         self.greedy_selected_parameters.append(self.training_set[error_argmax])
         self.greedy_selected_parameters.save(self.folder["post_processing"], "mu_greedy")
@@ -278,6 +351,23 @@ class EIMApproximationReductionMethod(ReductionMethod):
                 self.tol = 1.
             return (0., 0.)
     
+    # Compute the maximum interpolation error for all parameters in the training set at once: snapshots are
+    # evaluated at the interpolation locations, all interpolation systems are solved at once (since
+    # the interpolation matrix is lower triangular), and residuals are then computed one block at a time
+    def _greedy_batch(self):
+        N = self.EIM_approximation.N
+        assert len(self.snapshots_container) == len(self.training_set)
+        if N > 0:
+            interpolation_matrix = self.EIM_approximation.interpolation_matrix[0]
+            interpolation_matrix = array([[interpolation_matrix[i, j] for j in range(N)] for i in range(N)], dtype=float)
+            snapshots_on_interpolation_locations = self.snapshots_container.evaluate_at_dofs(self.EIM_approximation.interpolation_locations.get_dofs_list())
+            coefficients = solve_triangular(interpolation_matrix, snapshots_on_interpolation_locations, lower=True)
+        else:
+            coefficients = array([], dtype=float).reshape(0, len(self.snapshots_container))
+        errors = self.snapshots_container.max_abs_of_residual(self.EIM_approximation.basis_functions[:N], coefficients)
+        error_argmax = argmax(errors)
+        return (errors[error_argmax], error_argmax)
+    
     # Compute the error of the empirical interpolation approximation with respect to the
     # exact function over the testing set
     def error_analysis(self, N_generator=None, filename=None, **kwargs):
@@ -65,6 +65,13 @@ def EIMDecoratedReductionMethod(DifferentialProblemReductionMethod_DerivedClass)
                 EIM_reduction.set_tolerance(max(EIM_reduction.tol, tol_EIM)) # kwargs are not needed
             self._propagate_setter_from_kwargs_to_EIM_reductions(setter, Number, **kwargs)
             
+        # OFFLINE: split the computation of snapshots among groups of processes
+        def set_parameter_groups(self, group_mpi_comm):
+            DifferentialProblemReductionMethod_DerivedClass.set_parameter_groups(self, group_mpi_comm)
+            # Share the same groups with EIM reductions
+            for EIM_reduction in self.EIM_reductions.values():
+                EIM_reduction._parameter_groups = self._parameter_groups
+        
         # OFFLINE: set the elements in the training set.
         def initialize_training_set(self, ntrain, enable_import=True, sampling=None, **kwargs):
             import_successful = DifferentialProblemReductionMethod_DerivedClass.initialize_training_set(self, ntrain, enable_import, sampling, **kwargs)
@@ -113,15 +120,15 @@ def EIMDecoratedReductionMethod(DifferentialProblemReductionMethod_DerivedClass)
             return return_value # an "and" with a None results in None, so this method returns only if necessary
             
         # Perform the offline phase of the reduced order model
-        def offline(self):
+        def offline(self, **kwargs):
             if "offline" not in self.truth_problem._apply_EIM_at_stages:
                 assert hasattr(self.truth_problem, "_apply_exact_evaluation_at_stages"), "Please use @ExactParametrizedFunctions(\"offline\")"
                 assert "offline" in self.truth_problem._apply_exact_evaluation_at_stages, "Please use @ExactParametrizedFunctions(\"offline\")"
             lifting_mu = self.truth_problem.mu
             for (coeff, EIM_reduction_coeff) in self.EIM_reductions.items():
-                EIM_reduction_coeff.offline()
+                EIM_reduction_coeff.offline(**kwargs)
             self.truth_problem.set_mu(lifting_mu)
-            return DifferentialProblemReductionMethod_DerivedClass.offline(self)
+            return DifferentialProblemReductionMethod_DerivedClass.offline(self, **kwargs)
             
         # Compute the error of the reduced order approximation with respect to the full order one
         # over the testing set
@@ -19,10 +19,11 @@
 from abc import ABCMeta, abstractmethod
 import os
 from math import sqrt
-from numpy import isclose
+from numpy import array, isclose
 from rbnics.problems.base.parametrized_problem import ParametrizedProblem
 from rbnics.backends import assign, BasisFunctionsMatrix, copy, product, sum, transpose
-from rbnics.backends.online import OnlineAffineExpansionStorage, OnlineFunction, OnlineLinearSolver
+from rbnics.backends.abstract import AffineExpansionStorage as AbstractAffineExpansionStorage
+from rbnics.backends.online import OnlineAffineExpansionStorage, OnlineFunction, OnlineLinearSolver, OnlineMatrix, OnlineVector
 from rbnics.utils.cache import Cache
 from rbnics.utils.decorators import sync_setters
 from rbnics.utils.io import OnlineSizeDict
@@ -89,6 +90,9 @@ class ParametrizedReducedDifferentialProblem(ParametrizedProblem, metaclass=ABCM
         self.truth_problem = truth_problem
         # Basis functions matrix
         self.basis_functions = None # BasisFunctionsMatrix
+        # Incremental assembly of reduced operators, to be enabled only if the basis is enriched without modifying previous basis functions
+        self.incremental_offline_assembly = False
+        self._incremental_offline_assembly_data = dict() # from key (see _incremental_offline_assembly_key) to online size at the previous assembly
         # I/O
         self.folder["basis"] = os.path.join(self.folder_prefix, "basis")
         self.folder["reduced_operators"] = os.path.join(self.folder_prefix, "reduced_operators")
@@ -100,6 +104,27 @@ class ParametrizedReducedDifferentialProblem(ParametrizedProblem, metaclass=ABCM
         self._init_operators(current_stage)
         self._init_inner_products(current_stage)
         self._init_basis_functions(current_stage)
+    
+    def resume_offline(self, N):
+        """
+        Initialize data structures required to resume the offline phase from a checkpoint. Basis functions
+        stored after the checkpoint are discarded, both in memory and on disk.
+        
+        :param N: reduced dimension at the checkpoint.
+        """
+        self.init("online")
+        N_with_bc = OnlineSizeDict()
+        if len(self.components) > 1:
+            for component in self.components:
+                N_with_bc[component] = N[component] + self.N_bc[component]
+            self.N = OnlineSizeDict(N)
+        else:
+            N_with_bc[self.components[0]] = N + self.N_bc
+            self.N = N
+        for component in self.components:
+            assert len(self.basis_functions[component]) >= N_with_bc[component]
+        self.basis_functions = self.basis_functions[:N_with_bc]
+        self.basis_functions.save(self.folder["basis"], "basis")
             
     def _init_operators(self, current_stage="online"):
         """
@@ -402,6 +427,66 @@ class ParametrizedReducedDifferentialProblem(ParametrizedProblem, metaclass=ABCM
         """
         self._output = NotImplemented
         
+    def solve_batch(self, mus, N=None, **kwargs):
+        """
+        Perform an online solve for all parameters in mus at once. Problems which do not provide a batched
+        implementation fall back to an online solve for each parameter.
+        
+        :param mus: list of parameters
+        :param N : Dimension of the reduced problem
+        :type N : integer
+        :return: array of reduced solution coefficients, with one row for each parameter in mus
+        """
+        solution_batch = self._solve_batch(mus, N, **kwargs)
+        if solution_batch is NotImplemented:
+            current_mu = self.mu
+            solution_batch = list()
+            for mu in mus:
+                self.set_mu(mu)
+                solution_batch.append(array(self.solve(N, **kwargs).vector()))
+            self.set_mu(current_mu)
+            solution_batch = array(solution_batch)
+        return solution_batch
+    
+    def _solve_batch(self, mus, N, **kwargs):
+        """
+        Perform an online solve for all parameters in mus at once (internal). It returns NotImplemented
+        if the reduced problem does not support batched evaluation.
+        """
+        return NotImplemented
+    
+    def compute_output_batch(self, mus, N=None, **kwargs):
+        """
+        Perform an online evaluation of the output for all parameters in mus at once.
+        
+        :param mus: list of parameters
+        :param N : Dimension of the reduced problem
+        :type N : integer
+        :return: array of reduced outputs, one for each parameter in mus
+        """
+        output_batch = self._compute_output_batch(mus, N, **kwargs)
+        if output_batch is NotImplemented:
+            current_mu = self.mu
+            output_batch = list()
+            for mu in mus:
+                self.set_mu(mu)
+                self.solve(N, **kwargs)
+                output = self.compute_output()
+                if output is NotImplemented:
+                    self.set_mu(current_mu)
+                    return NotImplemented
+                output_batch.append(output)
+            self.set_mu(current_mu)
+            output_batch = array(output_batch)
+        return output_batch
+    
+    def _compute_output_batch(self, mus, N, **kwargs):
+        """
+        Perform an online evaluation of the output for all parameters in mus at once (internal). It returns
+        NotImplemented if the reduced problem does not support batched evaluation.
+        """
+        return NotImplemented
+    
     def _online_size_from_kwargs(self, N, **kwargs):
         return OnlineSizeDict.generate_from_N_and_kwargs(self.components, self.N, N, **kwargs)
         
@@ -692,16 +777,14 @@ class ParametrizedReducedDifferentialProblem(ParametrizedProblem, metaclass=ABCM
             # operator
             if term in self.terms:
                 assert self.Q[term] == self.truth_problem.Q[term]
-                for q in range(self.Q[term]):
-                    assert self.terms_order[term] in (0, 1, 2)
-                    if self.terms_order[term] == 2:
-                        self.operator[term][q] = transpose(self.basis_functions)*self.truth_problem.operator[term][q]*self.basis_functions
-                    elif self.terms_order[term] == 1:
-                        self.operator[term][q] = transpose(self.basis_functions)*self.truth_problem.operator[term][q]
-                    elif self.terms_order[term] == 0:
+                assert self.terms_order[term] in (0, 1, 2)
+                if self.terms_order[term] in (1, 2):
+                    self._project_operator(term, self.truth_problem.operator[term], self.operator[term], self.terms_order[term])
+                elif self.terms_order[term] == 0:
+                    for q in range(self.Q[term]):
                         self.operator[term][q] = self.truth_problem.operator[term][q]
-                    else:
-                        raise ValueError("Invalid value for order of term " + term)
+                else:
+                    raise ValueError("Invalid value for order of term " + term)
                 self.operator[term].save(self.folder["reduced_operators"], "operator_" + term)
                 return self.operator[term]
             elif term.startswith("inner_product"):
@@ -710,14 +793,14 @@ class ParametrizedReducedDifferentialProblem(ParametrizedProblem, metaclass=ABCM
                     assert component in self.components
                     assert len(self.inner_product[component]) == 1 # the affine expansion storage contains only the inner product matrix
                     assert len(self.truth_problem.inner_product[component]) == 1 # the affine expansion storage contains only the inner product matrix
-                    self.inner_product[component][0] = transpose(self.basis_functions)*self.truth_problem.inner_product[component][0]*self.basis_functions
+                    self._project_operator(term, self.truth_problem.inner_product[component], self.inner_product[component], 2)
                     self.inner_product[component].save(self.folder["reduced_operators"], term)
                     return self.inner_product[component]
                 else:
                     assert len(self.components) == 1 # single component case
                     assert len(self.inner_product) == 1 # the affine expansion storage contains only the inner product matrix
                     assert len(self.truth_problem.inner_product) == 1 # the affine expansion storage contains only the inner product matrix
-                    self.inner_product[0] = transpose(self.basis_functions)*self.truth_problem.inner_product[0]*self.basis_functions
+                    self._project_operator(term, self.truth_problem.inner_product, self.inner_product, 2)
                     self.inner_product.save(self.folder["reduced_operators"], term)
                     return self.inner_product
             elif term.startswith("projection_inner_product"):
@@ -726,14 +809,14 @@ class ParametrizedReducedDifferentialProblem(ParametrizedProblem, metaclass=ABCM
                     assert component in self.components
                     assert len(self.projection_inner_product[component]) == 1 # the affine expansion storage contains only the inner product matrix
                     assert len(self.truth_problem.projection_inner_product[component]) == 1 # the affine expansion storage contains only the inner product matrix
-                    self.projection_inner_product[component][0] = transpose(self.basis_functions)*self.truth_problem.projection_inner_product[component][0]*self.basis_functions
+                    self._project_operator(term, self.truth_problem.projection_inner_product[component], self.projection_inner_product[component], 2)
                     self.projection_inner_product[component].save(self.folder["reduced_operators"], term)
                     return self.projection_inner_product[component]
                 else:
                     assert len(self.components) == 1 # single component case
                     assert len(self.projection_inner_product) == 1 # the affine expansion storage contains only the inner product matrix
                     assert len(self.truth_problem.projection_inner_product) == 1 # the affine expansion storage contains only the inner product matrix
-                    self.projection_inner_product[0] = transpose(self.basis_functions)*self.truth_problem.projection_inner_product[0]*self.basis_functions
+                    self._project_operator(term, self.truth_problem.projection_inner_product, self.projection_inner_product, 2)
                     self.projection_inner_product.save(self.folder["reduced_operators"], term)
                     return self.projection_inner_product
             elif term.startswith("dirichlet_bc"):
@@ -781,6 +864,84 @@ class ParametrizedReducedDifferentialProblem(ParametrizedProblem, metaclass=ABCM
         else:
             raise ValueError("Invalid stage in assemble_operator().")
     
+    def _project_operator(self, term, truth_operator, reduced_operator, order):
+        """
+        Project all terms of the affine expansion of truth_operator onto the reduced basis, and store them in reduced_operator.
+        If incremental offline assembly is enabled, only entries related to basis functions which have been added since
+        the previous call are computed, while the remaining ones are copied from reduced_operator.
+        
+        :param term: the name of the operator.
+        :param truth_operator: the affine expansion of the truth operator.
+        :param reduced_operator: the affine expansion of the reduced operator.
+        :param order: the order of the operator (1 or 2).
+        """
+        assert order in (1, 2)
+        if not self.incremental_offline_assembly or not isinstance(truth_operator, AbstractAffineExpansionStorage):
+            for q in range(len(truth_operator)):
+                if order == 2:
+                    reduced_operator[q] = transpose(self.basis_functions)*truth_operator[q]*self.basis_functions
+                else:
+                    reduced_operator[q] = transpose(self.basis_functions)*truth_operator[q]
+            return
+        # Get current and previous online sizes
+        N = OnlineSizeDict()
+        if len(self.components) > 1:
+            for component in self.components:
+                N[component] = self.N[component] + self.N_bc[component]
+        else:
+            N[self.components[0]] = self.N + self.N_bc
+        key = self._incremental_offline_assembly_key(term)
+        N_previous = self._incremental_offline_assembly_data.get(key, None)
+        if N_previous is None or any(N_previous[component] > N[component] for component in self.components): # nothing to reuse
+            N_previous = OnlineSizeDict([(component, 0) for component in self.components])
+        # Split basis functions in previous and added ones, ordered as rows and columns of reduced operators
+        basis_functions = list()
+        previous_indices = list()
+        added_indices = list()
+        for component in self.components:
+            for n in range(N[component]):
+                if n < N_previous[component]:
+                    previous_indices.append(len(basis_functions))
+                else:
+                    added_indices.append(len(basis_functions))
+                basis_functions.append(self.basis_functions[component][n])
+        previous_basis_functions = [basis_functions[k] for k in previous_indices]
+        # Copy previous entries and compute new ones. For each added basis function z_j, the new column only
+        # requires A_q z_j and the new row only requires A_q^T z_j, so that no truth vector is kept in memory
+        has_previous_entries = len(previous_indices) > 0
+        for q in range(len(truth_operator)):
+            if order == 2:
+                reduced_operator_q = OnlineMatrix(N, N)
+                if has_previous_entries:
+                    reduced_operator_q[:N_previous, :N_previous] = reduced_operator[q]
+                for j in added_indices:
+                    truth_operator_q_times_basis_function_j = truth_operator[q]*basis_functions[j]
+                    for (i, basis_function_i) in enumerate(basis_functions):
+                        reduced_operator_q[i, j] = transpose(basis_function_i)*truth_operator_q_times_basis_function_j
+                    if has_previous_entries:
+                        reduced_operator_q_row_j = transpose(basis_functions[j])*truth_operator[q]*previous_basis_functions
+                        for (k_index, k) in enumerate(previous_indices):
+                            reduced_operator_q[j, k] = reduced_operator_q_row_j[k_index]
+            else:
+                reduced_operator_q = OnlineVector(N)
+                if has_previous_entries:
+                    reduced_operator_q[:N_previous] = reduced_operator[q]
+                for i in added_indices:
+                    reduced_operator_q[i] = transpose(basis_functions[i])*truth_operator[q]
+            reduced_operator[q] = reduced_operator_q
+        self._incremental_offline_assembly_data[key] = N
+    
+    def _incremental_offline_assembly_key(self, term):
+        """
+        Return the key under which the online size at the previous incremental assembly of term is stored.
+        Decorators which assemble the same term into several storages (e.g. one for each offline/online stage)
+        should override this method so that each storage is associated to a different key, which is then a tuple
+        whose last element is term, preceded by the name of the storage (e.g. the current stage).
+        
+        :param term: the name of the operator.
+        """
+        return term
+    
     def _lifting_truth_solve(self, term, i):
         # Since lifting solves for different values of i are associated to the same parameter
         # but with a patched call to compute_theta(), which returns the i-th component, we set
@@ -59,6 +59,10 @@ def PrimalDualReducedProblem(ParametrizedReducedDifferentialProblem_DerivedClass
             self._output = primal_output - dual_output
             return self._output
         
+        # Output correction requires the dual solution, hence outputs are evaluated one parameter at a time
+        def _compute_output_batch(self, mus, N, **kwargs):
+            return NotImplemented
+        
         # Return an error bound for the current non compliant output. Overriden to use dual problem in error estimation
         def estimate_error_output(self):
             return self.estimate_error()*self.dual_reduced_problem.estimate_error()
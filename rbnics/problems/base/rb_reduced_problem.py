@@ -19,9 +19,13 @@
 import os
 from abc import ABCMeta, abstractmethod
 from numbers import Number
+from numpy import array, zeros
 from rbnics.backends import BasisFunctionsMatrix, Function, FunctionsList, LinearSolver, transpose
-from rbnics.backends.online import OnlineAffineExpansionStorage
+from rbnics.backends.abstract import AffineExpansionStorage as AbstractAffineExpansionStorage
+from rbnics.backends.online import OnlineAffineExpansionStorage, OnlineMatrix, OnlineVector
 from rbnics.utils.decorators import overload, PreserveClassName, RequiredBaseDecorators
+from rbnics.utils.io import Folders, NumpyIO as ErrorEstimationOperatorBlockIO, OnlineSizeDict, TextIO as OnlineSizesIO
+from rbnics.utils.mpi import is_io_process
 
 @RequiredBaseDecorators(None)
 def RBReducedProblem(ParametrizedReducedDifferentialProblem_DerivedClass):
@@ -54,6 +58,8 @@ def RBReducedProblem(ParametrizedReducedDifferentialProblem_DerivedClass):
             self._riesz_solve_inner_product = None # setup by init()
             self._riesz_solve_homogeneous_dirichlet_bc = None # setup by init()
             self._error_estimation_inner_product = None # setup by init()
+            self._incremental_error_estimation_data = dict() # from key (see _incremental_offline_assembly_key) to tuple of online sizes of Riesz representors
+            self._incremental_error_estimation_online_sizes = dict() # from key (see _incremental_offline_assembly_key) to list of online sizes of saved blocks
             # I/O
             self.folder["error_estimation"] = os.path.join(self.folder_prefix, "error_estimation")
             
@@ -142,7 +148,77 @@ def RBReducedProblem(ParametrizedReducedDifferentialProblem_DerivedClass):
             It returns an relative error bound for the current output.
             """
             return NotImplemented
+        
+        def estimate_error_batch(self, mus, N=None, **kwargs):
+            """
+            It solves the reduced problem and returns an error bound for all parameters in mus at once.
+            Problems which do not provide a batched implementation fall back to an online solve for each parameter.
+            
+            :param mus: list of parameters.
+            :param N: dimension of the reduced problem.
+            :return: array of error bounds, one for each parameter in mus.
+            """
+            error_estimator_batch = self._estimate_error_batch(mus, N, **kwargs)
+            if error_estimator_batch is NotImplemented:
+                current_mu = self.mu
+                error_estimator_batch = list()
+                for mu in mus:
+                    self.set_mu(mu)
+                    self.solve(N, **kwargs)
+                    error_estimator_batch.append(self.estimate_error())
+                self.set_mu(current_mu)
+                error_estimator_batch = array(error_estimator_batch)
+            return error_estimator_batch
+        
+        def solve_and_estimate_error_batch(self, mus):
+            """
+            It solves the reduced problem and returns an error bound for all parameters in mus at once,
+            or NotImplemented if the reduced problem does not support batched evaluation.
+            
+            :param mus: list of parameters.
+            """
+            return self._estimate_error_batch(mus, None)
+        
+        def _estimate_error_batch(self, mus, N, **kwargs):
+            """
+            It solves the reduced problem and returns an error bound for all parameters in mus at once (internal),
+            or NotImplemented if the reduced problem does not support batched evaluation.
+            """
+            return NotImplemented
+        
+        def resume_offline(self, N):
+            # Call to parent
+            ParametrizedReducedDifferentialProblem_DerivedClass.resume_offline(self, N)
+            
+            # Discard Riesz representors stored after the checkpoint
+            N_with_bc = OnlineSizeDict()
+            for component in self.components:
+                N_with_bc[component] = len(self.basis_functions[component])
+            for term in self.riesz_terms:
+                if self.terms_order[term] > 1:
+                    for q in range(self.Q[term]):
+                        self.riesz[term][q] = self.riesz[term][q][:N_with_bc]
+                    self.riesz[term].save(self.folder["error_estimation"], "riesz_" + term)
             
+            # Discard entries of error estimation operators computed after the checkpoint, and
+            # store the current online sizes, so that they will be updated incrementally
+            for term in self.error_estimation_terms:
+                if self._assemble_error_estimation_operators_incrementally_enabled(term):
+                    N0 = self._riesz_representors_online_size(term[0])
+                    if self.terms_order[term[1]] > 1:
+                        N1 = self._riesz_representors_online_size(term[1])
+                    else:
+                        N1 = None
+                    for q0 in range(self.Q[term[0]]):
+                        for q1 in range(self.Q[term[1]]):
+                            if N1 is not None:
+                                self.error_estimation_operator[term][q0, q1] = self.error_estimation_operator[term][q0, q1][:N0, :N1]
+                            else:
+                                self.error_estimation_operator[term][q0, q1] = self.error_estimation_operator[term][q0, q1][:N0]
+                    self._incremental_error_estimation_data[self._incremental_offline_assembly_key(term)] = (N0, N1)
+                    # Overwrite saved blocks with the truncated operators, so that no entries computed after the checkpoint are kept on disk
+                    self._save_error_estimation_operators_incrementally(term, None, None)
+        
         def build_error_estimation_operators(self, current_stage="offline"):
             self._build_error_estimation_operators(current_stage)
         
@@ -179,27 +255,32 @@ def RBReducedProblem(ParametrizedReducedDifferentialProblem_DerivedClass):
             :param term: the forms of the truth problem.
             """
             solver = self.RieszSolver(self)
-            # Compute the Riesz representor
+            # Compute the Riesz representors. All right-hand sides are collected and solved at once,
+            # so that the factorization of the inner product is applied to a block of right-hand sides
             assert self.terms_order[term] in (1, 2)
             if self.terms_order[term] == 1:
+                riesz_term = solver.solve_block([
+                    (self.truth_problem.operator[term][q], ) for q in range(self.Q[term])
+                ])
                 for q in range(self.Q[term]):
-                    self.riesz[term][q].enrich(
-                        solver.solve(self.truth_problem.operator[term][q])
-                    )
+                    self.riesz[term][q].enrich(riesz_term[q])
                 self.riesz[term].save(self.folder["error_estimation"], "riesz_" + term)
             elif self.terms_order[term] == 2:
+                rhs_args = list()
+                rhs_storage = list()
                 for q in range(self.Q[term]):
                     if len(self.components) > 1:
                         for component in self.components:
                             for n in range(len(self.riesz[term][q][component]), self.N[component] + self.N_bc[component]):
-                                self.riesz[term][q][component].enrich(
-                                    solver.solve(-1., self.truth_problem.operator[term][q], self.basis_functions[component][n])
-                                )
+                                rhs_args.append((-1., self.truth_problem.operator[term][q], self.basis_functions[component][n]))
+                                rhs_storage.append(self.riesz[term][q][component])
                     else:
                         for n in range(len(self.riesz[term][q]), self.N + self.N_bc):
-                            self.riesz[term][q].enrich(
-                                solver.solve(-1., self.truth_problem.operator[term][q], self.basis_functions[n])
-                            )
+                            rhs_args.append((-1., self.truth_problem.operator[term][q], self.basis_functions[n]))
+                            rhs_storage.append(self.riesz[term][q])
+                riesz_term = solver.solve_block(rhs_args)
+                for (riesz_term_q, storage) in zip(riesz_term, rhs_storage):
+                    storage.enrich(riesz_term_q)
                 self.riesz[term].save(self.folder["error_estimation"], "riesz_" + term)
             else:
                 raise ValueError("Invalid value for order of term " + term)
@@ -210,14 +291,39 @@ def RBReducedProblem(ParametrizedReducedDifferentialProblem_DerivedClass):
             
             @overload
             def solve(self, rhs: object):
-                problem = self.problem
-                solver = LinearSolver(problem._riesz_solve_inner_product, problem._riesz_solve_storage, rhs, problem._riesz_solve_homogeneous_dirichlet_bc)
-                solver.set_parameters(problem._linear_solver_parameters)
-                return solver.solve()
-                
+                return self._solve(self.problem._riesz_solve_storage, rhs)
+            
             @overload
             def solve(self, coef: Number, matrix: object, basis_function: object):
-                return self.solve(coef*matrix*basis_function)
+                return self.solve(self._rhs(coef, matrix, basis_function))
+            
+            def solve_block(self, rhs_args):
+                """
+                It solves at once the Riesz problems associated to several right-hand sides, each of them
+                being provided as the tuple of arguments that would have been passed to solve().
+                """
+                if len(rhs_args) == 0:
+                    return list()
+                rhs = [self._rhs(*rhs_args_i) for rhs_args_i in rhs_args]
+                solutions = [Function(self.problem.truth_problem.V) for _ in rhs]
+                return self._solve(solutions, rhs)
+            
+            @overload
+            def _rhs(self, rhs: object):
+                return rhs
+            
+            @overload
+            def _rhs(self, coef: Number, matrix: object, basis_function: object):
+                return coef*matrix*basis_function
+            
+            def _solve(self, solution, rhs):
+                problem = self.problem
+                solver = LinearSolver(problem._riesz_solve_inner_product, solution, rhs, problem._riesz_solve_homogeneous_dirichlet_bc)
+                # All Riesz solves share the same inner product, so that its factorization can be reused
+                parameters = dict(problem._linear_solver_parameters)
+                parameters["reuse_factorization"] = True
+                solver.set_parameters(parameters)
+                return solver.solve()
                 
         def assemble_error_estimation_operators(self, term, current_stage="online"):
             """
@@ -227,13 +333,17 @@ def RBReducedProblem(ParametrizedReducedDifferentialProblem_DerivedClass):
             assert isinstance(term, tuple)
             assert len(term) == 2
             if current_stage == "online": # load from file
-                self.error_estimation_operator[term].load(self.folder["error_estimation"], "error_estimation_operator_" + term[0] + "_" + term[1])
+                if not self._load_error_estimation_operators_incrementally(term):
+                    self.error_estimation_operator[term].load(self.folder["error_estimation"], "error_estimation_operator_" + term[0] + "_" + term[1])
                 return self.error_estimation_operator[term]
             elif current_stage == "offline":
                 assert self.terms_order[term[0]] in (1, 2)
                 assert self.terms_order[term[1]] in (1, 2)
                 assert self.terms_order[term[0]] >= self.terms_order[term[1]], "Please swap the order of " + str(term) + " in self.error_estimation_terms" # otherwise for (term1, term2) of orders (1, 2) we would have a row vector, rather than a column one
-                if self.terms_order[term[0]] == 2 and self.terms_order[term[1]] == 2:
+                if self._assemble_error_estimation_operators_incrementally_enabled(term):
+                    self._assemble_error_estimation_operators_incrementally(term)
+                    return self.error_estimation_operator[term]
+                elif self.terms_order[term[0]] == 2 and self.terms_order[term[1]] == 2:
                     for q0 in range(self.Q[term[0]]):
                         for q1 in range(self.Q[term[1]]):
                             self.error_estimation_operator[term][q0, q1] = transpose(self.riesz[term[0]][q0])*self._error_estimation_inner_product*self.riesz[term[1]][q1]
@@ -251,9 +361,257 @@ def RBReducedProblem(ParametrizedReducedDifferentialProblem_DerivedClass):
                 else:
                     raise ValueError("Invalid term order for assemble_error_estimation_operators().")
                 self.error_estimation_operator[term].save(self.folder["error_estimation"], "error_estimation_operator_" + term[0] + "_" + term[1])
+                self._remove_error_estimation_operators_blocks(term)
                 return self.error_estimation_operator[term]
             else:
                 raise ValueError("Invalid stage in assemble_error_estimation_operators().")
         
+        def _assemble_error_estimation_operators_incrementally_enabled(self, term):
+            """
+            It returns True if the error estimation operator associated to term is assembled incrementally. This is
+            possible only if it is affinely decomposed, since otherwise its content is evaluated when required
+            rather than stored, and if Riesz representors are added as the basis is enriched.
+            """
+            return (
+                self.incremental_offline_assembly
+                    and
+                isinstance(self.error_estimation_operator[term], AbstractAffineExpansionStorage)
+                    and
+                (self.terms_order[term[0]], self.terms_order[term[1]]) != (1, 1)
+            )
+        
+        def _assemble_error_estimation_operators_incrementally(self, term):
+            """
+            It assembles operators for error estimation, only computing entries related to Riesz representors
+            which have been added since the previous call. The remaining entries are copied from the current operators.
+            """
+            # Get Riesz representors, split in previous and added ones (ordered as rows/columns of error estimation operators)
+            key = self._incremental_offline_assembly_key(term)
+            if key in self._incremental_error_estimation_data:
+                (N0_previous, N1_previous) = self._incremental_error_estimation_data[key]
+            else:
+                (N0_previous, N1_previous) = (None, None)
+            (N0, riesz0, previous_indices0, added_indices0) = self._split_riesz_representors(term[0], N0_previous)
+            # Compute the action of the inner product on added Riesz representors. Since the inner product is
+            # symmetric, this is enough to compute both the new columns and the new rows of error estimation operators
+            inner_product = self._error_estimation_inner_product
+            inner_product_times_riesz0 = [
+                {i: inner_product*riesz0[q0][i] for i in added_indices0} for q0 in range(self.Q[term[0]])
+            ]
+            assert self.terms_order[term[0]] == 2
+            assert self.terms_order[term[1]] in (1, 2)
+            if self.terms_order[term[1]] == 2:
+                if term[1] == term[0]:
+                    (N1, riesz1, previous_indices1, added_indices1) = (N0, riesz0, previous_indices0, added_indices0)
+                    inner_product_times_riesz1 = inner_product_times_riesz0
+                else:
+                    (N1, riesz1, previous_indices1, added_indices1) = self._split_riesz_representors(term[1], N1_previous)
+                    inner_product_times_riesz1 = [
+                        {j: inner_product*riesz1[q1][j] for j in added_indices1} for q1 in range(self.Q[term[1]])
+                    ]
+                has_previous_entries = len(previous_indices0) > 0 and len(previous_indices1) > 0
+                for q0 in range(self.Q[term[0]]):
+                    for q1 in range(self.Q[term[1]]):
+                        error_estimation_operator_q0_q1 = OnlineMatrix(N0, N1)
+                        if has_previous_entries:
+                            error_estimation_operator_q0_q1[:N0_previous, :N1_previous] = self.error_estimation_operator[term][q0, q1]
+                        for j in added_indices1:
+                            for (i, riesz0_q0_i) in enumerate(riesz0[q0]):
+                                error_estimation_operator_q0_q1[i, j] = transpose(riesz0_q0_i)*inner_product_times_riesz1[q1][j]
+                        for i in added_indices0:
+                            for j in previous_indices1:
+                                error_estimation_operator_q0_q1[i, j] = transpose(riesz1[q1][j])*inner_product_times_riesz0[q0][i]
+                        self.error_estimation_operator[term][q0, q1] = error_estimation_operator_q0_q1
+            else:
+                N1 = None
+                has_previous_entries = len(previous_indices0) > 0
+                for q1 in range(self.Q[term[1]]):
+                    assert len(self.riesz[term[1]][q1]) == 1
+                    for q0 in range(self.Q[term[0]]):
+                        error_estimation_operator_q0_q1 = OnlineVector(N0)
+                        if has_previous_entries:
+                            error_estimation_operator_q0_q1[:N0_previous] = self.error_estimation_operator[term][q0, q1]
+                        for i in added_indices0:
+                            error_estimation_operator_q0_q1[i] = transpose(self.riesz[term[1]][q1][0])*inner_product_times_riesz0[q0][i]
+                        self.error_estimation_operator[term][q0, q1] = error_estimation_operator_q0_q1
+            self._incremental_error_estimation_data[key] = (N0, N1)
+            self._save_error_estimation_operators_incrementally(term, N0_previous, N1_previous)
+        
+        def _save_error_estimation_operators_incrementally(self, term, N0_previous, N1_previous):
+            """
+            It saves the entries of error estimation operators related to Riesz representors which have been added
+            since the online sizes (N0_previous, N1_previous), rather than the whole operators. Saved blocks
+            are appended to the ones of the previous calls.
+            """
+            directory = self._error_estimation_operator_blocks_folder(term)
+            directory.create()
+            key = self._incremental_offline_assembly_key(term)
+            (N0, N1) = self._incremental_error_estimation_data[key]
+            previous_online_sizes = self._incremental_error_estimation_online_sizes.get(key, list())
+            if (
+                N0_previous is None
+                    or len(previous_online_sizes) == 0
+                    or previous_online_sizes[-1] != (N0_previous, N1_previous)
+                    or any(N0_previous[component] > N0[component] for component in self.components)
+                    or (N1 is not None and any(N1_previous[component] > N1[component] for component in self.components))
+            ): # start again from the first block
+                online_sizes = list()
+                (N0_previous, N1_previous) = (None, None)
+            else:
+                online_sizes = list(previous_online_sizes)
+            block = len(online_sizes)
+            (previous_indices0, added_indices0) = self._split_online_indices(N0_previous, N0)
+            if N1 is not None:
+                (_, added_indices1) = self._split_online_indices(N1_previous, N1)
+                N1_sum = sum(N1.values())
+            for q0 in range(self.Q[term[0]]):
+                for q1 in range(self.Q[term[1]]):
+                    error_estimation_operator_q0_q1 = self.error_estimation_operator[term][q0, q1]
+                    filename = "content_item_" + str(q0*self.Q[term[1]] + q1) + "_block_" + str(block)
+                    if N1 is not None:
+                        rows = zeros((len(added_indices0), N1_sum))
+                        for (r, i) in enumerate(added_indices0):
+                            for j in range(N1_sum):
+                                rows[r, j] = error_estimation_operator_q0_q1[i, j]
+                        columns = zeros((len(previous_indices0), len(added_indices1)))
+                        for (r, i) in enumerate(previous_indices0):
+                            for (c, j) in enumerate(added_indices1):
+                                columns[r, c] = error_estimation_operator_q0_q1[i, j]
+                        ErrorEstimationOperatorBlockIO.save_file(rows, directory, filename + "_rows")
+                        ErrorEstimationOperatorBlockIO.save_file(columns, directory, filename + "_columns")
+                    else:
+                        rows = zeros(len(added_indices0))
+                        for (r, i) in enumerate(added_indices0):
+                            rows[r] = error_estimation_operator_q0_q1[i]
+                        ErrorEstimationOperatorBlockIO.save_file(rows, directory, filename + "_rows")
+            # Online sizes are saved last, so that blocks of an interrupted save are never loaded
+            online_sizes.append((N0, N1))
+            OnlineSizesIO.save_file(online_sizes, directory, "incremental_online_sizes")
+            self._incremental_error_estimation_online_sizes[key] = online_sizes
+            # Remove blocks which are not used anymore
+            self._remove_error_estimation_operators_blocks(term, len(online_sizes), len(previous_online_sizes))
+        
+        def _load_error_estimation_operators_incrementally(self, term):
+            """
+            It loads error estimation operators which have been saved incrementally, if any, by adding
+            saved blocks in the same order in which they have been assembled.
+            """
+            directory = self._error_estimation_operator_blocks_folder(term)
+            if not OnlineSizesIO.exists_file(directory, "incremental_online_sizes"):
+                return False
+            online_sizes = OnlineSizesIO.load_file(directory, "incremental_online_sizes", globals={"OnlineSizeDict": OnlineSizeDict})
+            error_estimation_operator = dict()
+            (N0_previous, N1_previous) = (None, None)
+            for (block, (N0, N1)) in enumerate(online_sizes):
+                (previous_indices0, added_indices0) = self._split_online_indices(N0_previous, N0)
+                if N1 is not None:
+                    (previous_indices1, added_indices1) = self._split_online_indices(N1_previous, N1)
+                    N1_sum = sum(N1.values())
+                for q0 in range(self.Q[term[0]]):
+                    for q1 in range(self.Q[term[1]]):
+                        filename = "content_item_" + str(q0*self.Q[term[1]] + q1) + "_block_" + str(block)
+                        rows = ErrorEstimationOperatorBlockIO.load_file(directory, filename + "_rows")
+                        if N1 is not None:
+                            columns = ErrorEstimationOperatorBlockIO.load_file(directory, filename + "_columns")
+                            error_estimation_operator_q0_q1 = OnlineMatrix(N0, N1)
+                            if len(previous_indices0) > 0 and len(previous_indices1) > 0:
+                                error_estimation_operator_q0_q1[:N0_previous, :N1_previous] = error_estimation_operator[q0, q1]
+                            for (r, i) in enumerate(added_indices0):
+                                for j in range(N1_sum):
+                                    error_estimation_operator_q0_q1[i, j] = rows[r, j]
+                            for (r, i) in enumerate(previous_indices0):
+                                for (c, j) in enumerate(added_indices1):
+                                    error_estimation_operator_q0_q1[i, j] = columns[r, c]
+                        else:
+                            error_estimation_operator_q0_q1 = OnlineVector(N0)
+                            if len(previous_indices0) > 0:
+                                error_estimation_operator_q0_q1[:N0_previous] = error_estimation_operator[q0, q1]
+                            for (r, i) in enumerate(added_indices0):
+                                error_estimation_operator_q0_q1[i] = rows[r]
+                        error_estimation_operator[q0, q1] = error_estimation_operator_q0_q1
+                (N0_previous, N1_previous) = (N0, N1)
+            for q0 in range(self.Q[term[0]]):
+                for q1 in range(self.Q[term[1]]):
+                    self.error_estimation_operator[term][q0, q1] = error_estimation_operator[q0, q1]
+            key = self._incremental_offline_assembly_key(term)
+            self._incremental_error_estimation_data[key] = online_sizes[-1]
+            self._incremental_error_estimation_online_sizes[key] = online_sizes
+            return True
+        
+        def _remove_error_estimation_operators_blocks(self, term, first_block=0, last_block=None):
+            """
+            It removes blocks of error estimation operators saved incrementally, from first_block (included) to last_block
+            (excluded). If all blocks are removed, the file of online sizes is removed as well.
+            """
+            directory = self._error_estimation_operator_blocks_folder(term)
+            if last_block is None:
+                if not OnlineSizesIO.exists_file(directory, "incremental_online_sizes"):
+                    return
+                last_block = len(OnlineSizesIO.load_file(directory, "incremental_online_sizes", globals={"OnlineSizeDict": OnlineSizeDict}))
+            if is_io_process():
+                if first_block == 0:
+                    os.remove(os.path.join(str(directory), "incremental_online_sizes.txt"))
+                for block in range(first_block, last_block):
+                    for index in range(self.Q[term[0]]*self.Q[term[1]]):
+                        for suffix in ("_rows", "_columns"):
+                            filename = os.path.join(str(directory), "content_item_" + str(index) + "_block_" + str(block) + suffix + ".npy")
+                            if os.path.exists(filename):
+                                os.remove(filename)
+            is_io_process.mpi_comm.barrier()
+            if first_block == 0:
+                self._incremental_error_estimation_online_sizes.pop(self._incremental_offline_assembly_key(term), None)
+        
+        def _error_estimation_operator_blocks_folder(self, term):
+            """
+            It returns the folder in which blocks of the error estimation operator associated to term are saved incrementally.
+            If the operator is assembled in several storages (e.g. one for each offline/online stage), each of them
+            has its own subfolder, consistently with the folders in which such storages are saved.
+            """
+            key = self._incremental_offline_assembly_key(term)
+            if key != term:
+                subfolders = [str(key_i) for key_i in key[:-1]]
+            else:
+                subfolders = list()
+            return Folders.Folder(os.path.join(str(self.folder["error_estimation"]), *subfolders, "error_estimation_operator_" + term[0] + "_" + term[1]))
+        
+        def _riesz_representors_online_size(self, term):
+            # Online size of Riesz representors of term (equal for all q)
+            N = OnlineSizeDict()
+            for component in self.components:
+                lengths = set([len(self.riesz[term][q][component]) for q in range(self.Q[term])])
+                assert len(lengths) == 1
+                N[component] = lengths.pop()
+            return N
+        
+        def _split_riesz_representors(self, term, N_previous):
+            N = self._riesz_representors_online_size(term)
+            if N_previous is None or any(N_previous[component] > N[component] for component in self.components): # nothing to reuse
+                N_previous = OnlineSizeDict([(component, 0) for component in self.components])
+            # Split Riesz representors in previous and added ones
+            riesz = [list() for _ in range(self.Q[term])]
+            for component in self.components:
+                for n in range(N[component]):
+                    for q in range(self.Q[term]):
+                        riesz[q].append(self.riesz[term][q][component][n])
+            (previous_indices, added_indices) = self._split_online_indices(N_previous, N)
+            return (N, riesz, previous_indices, added_indices)
+        
+        def _split_online_indices(self, N_previous, N):
+            # Split online indices (ordered as rows/columns of error estimation operators) in the ones which were
+            # already available at online size N_previous and the ones which have been added afterwards
+            if N_previous is None:
+                N_previous = OnlineSizeDict([(component, 0) for component in self.components])
+            previous_indices = list()
+            added_indices = list()
+            index = 0
+            for component in self.components:
+                for n in range(N[component]):
+                    if n < N_previous[component]:
+                        previous_indices.append(index)
+                    else:
+                        added_indices.append(index)
+                    index += 1
+            return (previous_indices, added_indices)
+    
     # return value (a class) for the decorator
     return RBReducedProblem_Class
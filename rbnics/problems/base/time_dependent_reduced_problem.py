@@ -17,7 +17,7 @@
 #
 
 from numbers import Number
-from numpy import linspace
+from numpy import array, linspace
 from rbnics.backends import assign, copy, product, sum, TimeDependentProblem1Wrapper, TimeQuadrature, transpose
 from rbnics.backends.online import OnlineAffineExpansionStorage, OnlineFunction, OnlineLinearSolver, OnlineTimeStepping
 from rbnics.utils.cache import Cache
@@ -241,6 +241,16 @@ def TimeDependentReducedProblem(ParametrizedReducedDifferentialProblem_DerivedCl
                 assign(self._solution_dot, self._solution_dot_over_time[-1])
             return self._solution_over_time
             
+        # Perform an online solve for all parameters in mus, stacking solutions over time for each of them
+        def solve_batch(self, mus, N=None, **kwargs):
+            current_mu = self.mu
+            solution_batch = list()
+            for mu in mus:
+                self.set_mu(mu)
+                solution_batch.append([array(solution.vector()) for solution in self.solve(N, **kwargs)])
+            self.set_mu(current_mu)
+            return array(solution_batch)
+        
         class ProblemSolver(ParametrizedReducedDifferentialProblem_DerivedClass.ProblemSolver, TimeDependentProblem1Wrapper):
             def set_time(self, t):
                 problem = self.problem
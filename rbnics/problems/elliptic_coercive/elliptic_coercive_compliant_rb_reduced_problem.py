@@ -17,7 +17,7 @@
 #
 
 from math import sqrt
-from numpy import isclose
+from numpy import isclose, sqrt as vectorized_sqrt
 from rbnics.problems.elliptic_coercive.elliptic_coercive_compliant_problem import EllipticCoerciveCompliantProblem
 from rbnics.problems.elliptic_coercive.elliptic_coercive_compliant_reduced_problem import EllipticCoerciveCompliantReducedProblem
 from rbnics.problems.elliptic_coercive.elliptic_coercive_rb_reduced_problem import EllipticCoerciveRBReducedProblem
@@ -36,6 +36,16 @@ class EllipticCoerciveCompliantRBReducedProblem(EllipticCoerciveCompliantRBReduc
         assert alpha >= 0.
         return sqrt(abs(eps2)/alpha)
         
+    # Return an error bound for all parameters in mus at once (internal)
+    def _estimate_error_batch(self, mus, N, **kwargs):
+        residual_norm_squared_and_stability_factor = self._get_residual_norm_squared_and_stability_factor_batch(mus, N, **kwargs)
+        if residual_norm_squared_and_stability_factor is NotImplemented:
+            return NotImplemented
+        (eps2, alpha) = residual_norm_squared_and_stability_factor
+        assert ((eps2 >= 0.) | isclose(eps2, 0.)).all()
+        assert (alpha >= 0.).all()
+        return vectorized_sqrt(abs(eps2)/alpha)
+    
     # Return an error bound for the current compliant output
     def estimate_error_output(self):
         return self.estimate_error()**2
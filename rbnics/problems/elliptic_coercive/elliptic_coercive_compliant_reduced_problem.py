@@ -29,6 +29,10 @@ def EllipticCoerciveCompliantReducedProblem(EllipticCoerciveReducedProblem_Deriv
         def _compute_output(self, N):
             self._output = transpose(self._solution)*sum(product(self.compute_theta("f"), self.operator["f"][:N]))
         
+        # Perform an online evaluation of the compliant output for all parameters in mus at once (internal)
+        def _compute_output_batch(self, mus, N, **kwargs):
+            return self._compute_linear_output_batch("f", mus, N, **kwargs)
+        
         # Internal method for error computation
         def _compute_error(self, **kwargs):
             inner_product = dict()
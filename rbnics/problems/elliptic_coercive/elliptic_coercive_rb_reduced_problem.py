@@ -17,8 +17,9 @@
 #
 
 from math import sqrt
-from numpy import isclose
+from numpy import array, einsum, isclose, sqrt as vectorized_sqrt
 from rbnics.backends import product, sum, transpose
+from rbnics.backends.abstract import AffineExpansionStorage as AbstractAffineExpansionStorage
 from rbnics.problems.base import LinearRBReducedProblem, ParametrizedReducedDifferentialProblem, PrimalDualReducedProblem
 from rbnics.problems.elliptic_coercive.elliptic_coercive_problem import EllipticCoerciveProblem
 from rbnics.problems.elliptic_coercive.elliptic_coercive_reduced_problem import EllipticCoerciveReducedProblem
@@ -72,6 +73,53 @@ class EllipticCoerciveRBReducedProblem(EllipticCoerciveRBReducedProblem_Base):
             + 2.0*(transpose(self._solution)*sum(product(theta_a, self.error_estimation_operator["a", "f"][:N], theta_f)))
             + transpose(self._solution)*sum(product(theta_a, self.error_estimation_operator["a", "a"][:N, :N], theta_a))*self._solution
         )
+    
+    # Return an error bound for all parameters in mus at once (internal)
+    def _estimate_error_batch(self, mus, N, **kwargs):
+        residual_norm_squared_and_stability_factor = self._get_residual_norm_squared_and_stability_factor_batch(mus, N, **kwargs)
+        if residual_norm_squared_and_stability_factor is NotImplemented:
+            return NotImplemented
+        (eps2, alpha) = residual_norm_squared_and_stability_factor
+        assert ((eps2 >= 0.) | isclose(eps2, 0.)).all()
+        assert (alpha >= 0.).all()
+        return vectorized_sqrt(abs(eps2))/alpha
+    
+    # Solve the reduced problem for all parameters in mus by a batched dense solve, and return the numerator
+    # and the denominator of the error bound for each of them
+    def _get_residual_norm_squared_and_stability_factor_batch(self, mus, N, **kwargs):
+        # Batched evaluation requires affine expansions stored as dense online arrays
+        error_estimation_operator_ff = self.error_estimation_operator["f", "f"]
+        error_estimation_operator_af = self.error_estimation_operator["a", "f"]
+        error_estimation_operator_aa = self.error_estimation_operator["a", "a"]
+        for storage in (error_estimation_operator_ff, error_estimation_operator_af, error_estimation_operator_aa):
+            if not isinstance(storage, AbstractAffineExpansionStorage):
+                return NotImplemented
+        solution_and_theta_batch = self._solve_and_compute_theta_batch(mus, N, **kwargs)
+        if solution_and_theta_batch is NotImplemented:
+            return NotImplemented
+        (solution_batch, theta_a, theta_f) = solution_and_theta_batch
+        N, _ = self._online_size_from_kwargs(N, **kwargs)
+        N += self.N_bc
+        Qa = self.Q["a"]
+        Qf = self.Q["f"]
+        C_ff = array([[error_estimation_operator_ff[qf0, qf1] for qf1 in range(Qf)] for qf0 in range(Qf)])
+        C_af = array([[array(error_estimation_operator_af[:N][qa, qf]) for qf in range(Qf)] for qa in range(Qa)])
+        C_aa = array([[array(error_estimation_operator_aa[:N, :N][qa0, qa1]) for qa1 in range(Qa)] for qa0 in range(Qa)])
+        # Evaluate stability factors for all parameters
+        current_mu = self.mu
+        alpha = list()
+        for mu in mus:
+            self.set_mu(mu)
+            alpha.append(self.get_stability_factor())
+        self.set_mu(current_mu)
+        alpha = array(alpha)
+        # Evaluate the residual norm for all parameters at once
+        eps2 = (
+              einsum("pi,ij,pj->p", theta_f, C_ff, theta_f, optimize=True)
+            + 2.0*einsum("pn,pi,ijn,pj->p", solution_batch, theta_a, C_af, theta_f, optimize=True)
+            + einsum("pn,pi,ijnm,pj,pm->p", solution_batch, theta_a, C_aa, theta_a, solution_batch, optimize=True)
+        )
+        return (eps2, alpha)
 
 # Add dual reduced problem if an output is provided in the term "s"
 def _problem_has_output(truth_problem, reduction_method, **kwargs):
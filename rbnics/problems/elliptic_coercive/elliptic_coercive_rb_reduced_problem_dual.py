@@ -69,6 +69,10 @@ class EllipticCoerciveRBReducedProblem_Dual(EllipticCoerciveRBReducedProblem_Dua
         assembled_output_correction_and_estimation_operator["f"] = sum(product(self.primal_reduced_problem.compute_theta("f"), self.output_correction_and_estimation["f"][:dual_N]))
         self._output = transpose(dual_solution)*assembled_output_correction_and_estimation_operator["f"] - transpose(dual_solution)*assembled_output_correction_and_estimation_operator["a"]*primal_solution
     
+    # Output correction requires the primal solution, hence it is evaluated one parameter at a time
+    def _compute_output_batch(self, mus, dual_N, **kwargs):
+        return NotImplemented
+    
     # Build operators for output correction and error estimation
     def build_output_correction_and_estimation_operators(self):
         self.assemble_output_correction_and_estimation_operators("output_correction_and_estimation_a", "offline")
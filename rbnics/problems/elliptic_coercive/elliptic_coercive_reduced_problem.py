@@ -16,8 +16,12 @@
 # along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
 #
 
+from numpy import array, einsum, newaxis
+from numpy.linalg import solve as batched_solve
 from rbnics.problems.base import LinearReducedProblem
 from rbnics.backends import product, sum, transpose
+from rbnics.backends.abstract import AffineExpansionStorage as AbstractAffineExpansionStorage
+from rbnics.backends.online.basic.wrapping import DirichletBC
 
 def EllipticCoerciveReducedProblem(ParametrizedReducedDifferentialProblem_DerivedClass):
     
@@ -42,5 +46,85 @@ def EllipticCoerciveReducedProblem(ParametrizedReducedDifferentialProblem_Derive
         def _compute_output(self, N):
             self._output = transpose(self._solution)*sum(product(self.compute_theta("s"), self.operator["s"][:N]))
             
+        # Perform an online solve for all parameters in mus at once (internal)
+        def _solve_batch(self, mus, N, **kwargs):
+            solution_and_theta_batch = self._solve_and_compute_theta_batch(mus, N, **kwargs)
+            if solution_and_theta_batch is NotImplemented:
+                return NotImplemented
+            (solution_batch, _, _) = solution_and_theta_batch
+            return solution_batch
+        
+        # Perform an online evaluation of the output for all parameters in mus at once (internal)
+        def _compute_output_batch(self, mus, N, **kwargs):
+            return self._compute_linear_output_batch("s", mus, N, **kwargs)
+        
+        def _compute_linear_output_batch(self, term, mus, N, **kwargs):
+            # Batched evaluation requires affine expansions stored as dense online arrays
+            operator_s = self.operator[term]
+            if not isinstance(operator_s, AbstractAffineExpansionStorage):
+                return NotImplemented
+            current_mu = self.mu
+            theta_s = list()
+            try:
+                for mu in mus:
+                    self.set_mu(mu)
+                    theta_s.append(self.compute_theta(term))
+            except ValueError: # raised by compute_theta if output computation is optional
+                return NotImplemented
+            finally:
+                self.set_mu(current_mu)
+            theta_s = array(theta_s)
+            solution_batch = self.solve_batch(mus, N, **kwargs)
+            N, _ = self._online_size_from_kwargs(N, **kwargs)
+            N += self.N_bc
+            operator_s = operator_s[:N]
+            S = array([array(operator_s[qs]) for qs in range(self.Q[term])])
+            return einsum("pn,pi,in->p", solution_batch, theta_s, S, optimize=True)
+        
+        # Solve the reduced problem for all parameters in mus by a batched dense solve, and return also
+        # the theta coefficients of the left-hand and right-hand sides
+        def _solve_and_compute_theta_batch(self, mus, N, **kwargs):
+            # Batched evaluation requires affine expansions stored as dense online arrays
+            operator_a = self.operator["a"]
+            operator_f = self.operator["f"]
+            for storage in (operator_a, operator_f):
+                if not isinstance(storage, AbstractAffineExpansionStorage):
+                    return NotImplemented
+            N, _ = self._online_size_from_kwargs(N, **kwargs)
+            N += self.N_bc
+            operator_a = operator_a[:N, :N]
+            operator_f = operator_f[:N]
+            A = array([array(operator_a[qa]) for qa in range(self.Q["a"])])
+            F = array([array(operator_f[qf]) for qf in range(self.Q["f"])])
+            # Evaluate theta coefficients and boundary conditions for all parameters
+            current_mu = self.mu
+            problem_solver = self.ProblemSolver(self, N)
+            theta_a = list()
+            theta_f = list()
+            theta_bc = list()
+            for mu in mus:
+                self.set_mu(mu)
+                theta_a.append(self.compute_theta("a"))
+                theta_f.append(self.compute_theta("f"))
+                theta_bc.append(problem_solver.bc_eval())
+            self.set_mu(current_mu)
+            theta_a = array(theta_a)
+            theta_f = array(theta_f)
+            # Assemble all reduced systems at once and apply boundary conditions, if any
+            A_batch = einsum("pi,inm->pnm", theta_a, A, optimize=True)
+            F_batch = einsum("pi,in->pn", theta_f, F, optimize=True)
+            for (p, theta_bc_p) in enumerate(theta_bc):
+                if theta_bc_p is None:
+                    continue
+                elif isinstance(theta_bc_p, dict):
+                    bcs = DirichletBC(theta_bc_p, operator_f[0]._component_name_to_basis_component_index, operator_f[0].N)
+                else:
+                    bcs = DirichletBC(theta_bc_p)
+                bcs.apply_to_vector(F_batch[p])
+                bcs.apply_to_matrix(A_batch[p])
+            # Solve all reduced systems with one batched dense solve
+            solution_batch = batched_solve(A_batch, F_batch[..., newaxis])[..., 0]
+            return (solution_batch, theta_a, theta_f)
+    
     # return value (a class) for the decorator
     return EllipticCoerciveReducedProblem_Class
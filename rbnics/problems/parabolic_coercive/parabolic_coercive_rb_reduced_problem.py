@@ -71,6 +71,10 @@ class ParabolicCoerciveRBReducedProblem(ParabolicCoerciveRBReducedProblem_Base):
     # Return a relative error bound for the current output
     def estimate_relative_error_output(self):
         return NotImplemented
+    
+    # Batched evaluation of error bounds is only available for steady problems
+    def solve_and_estimate_error_batch(self, mus):
+        return NotImplemented
 
     # Return the numerator of the error bound for the current solution
     def get_residual_norm_squared(self):
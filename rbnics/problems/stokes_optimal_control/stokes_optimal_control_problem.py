@@ -178,7 +178,10 @@ class StokesOptimalControlProblem(StokesOptimalControlProblem_Base):
             assembled_operator_rhs,
             assembled_dirichlet_bc
         )
-        solver.set_parameters(self._linear_solver_parameters)
+        # The inner product matrix is the same for every supremizer solve, so that its factorization can be reused
+        parameters = dict(self._linear_solver_parameters)
+        parameters["reuse_factorization"] = True
+        solver.set_parameters(parameters)
         solver.solve()
         
     def solve_adjoint_supremizer(self, solution):
@@ -205,7 +208,10 @@ class StokesOptimalControlProblem(StokesOptimalControlProblem_Base):
             assembled_operator_rhs,
             assembled_dirichlet_bc
         )
-        solver.set_parameters(self._linear_solver_parameters)
+        # The inner product matrix is the same for every supremizer solve, so that its factorization can be reused
+        parameters = dict(self._linear_solver_parameters)
+        parameters["reuse_factorization"] = True
+        solver.set_parameters(parameters)
         solver.solve()
         
     def _supremizer_cache_key_from_kwargs(self, **kwargs):
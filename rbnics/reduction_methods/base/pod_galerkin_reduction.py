@@ -19,6 +19,7 @@
 import os
 from numbers import Number
 from rbnics.backends import ProperOrthogonalDecomposition
+from rbnics.utils.config import config
 from rbnics.utils.decorators import PreserveClassName, RequiredBaseDecorators
 from rbnics.utils.io import ErrorAnalysisTable, SpeedupAnalysisTable, TextBox, TextLine, Timer
 
@@ -105,6 +106,14 @@ def PODGalerkinReduction(DifferentialProblemReductionMethod_DerivedClass):
                 inner_product = self.truth_problem.inner_product[0]
                 self.POD = ProperOrthogonalDecomposition(self.truth_problem.V, inner_product)
                 
+            # Store snapshots on disk rather than in memory, if required
+            if config.get("POD", "snapshots storage") == "disk":
+                if len(self.truth_problem.components) > 1:
+                    for component in self.truth_problem.components:
+                        self.POD[component].store_snapshots_out_of_core(self.folder["snapshots"], "snapshots_matrix_" + component)
+                else:
+                    self.POD.store_snapshots_out_of_core(self.folder["snapshots"], "snapshots_matrix")
+            
             # Return
             return output
             
@@ -116,7 +125,12 @@ def PODGalerkinReduction(DifferentialProblemReductionMethod_DerivedClass):
             """
             need_to_do_offline_stage = self._init_offline()
             if need_to_do_offline_stage:
-                self._offline()
+                def compute_snapshot(mu_index, mu):
+                    self.truth_problem.set_mu(mu)
+                    snapshot = self.truth_problem.solve()
+                    self.truth_problem.export_solution(self.folder["snapshots"], "truth_" + str(mu_index), snapshot)
+                
+                self._offline_by_parameter_groups(compute_snapshot, self._offline)
             self._finalize_offline()
             return self.reduced_problem
             
@@ -124,6 +138,13 @@ def PODGalerkinReduction(DifferentialProblemReductionMethod_DerivedClass):
             print(TextBox(self.truth_problem.name() + " " + self.label + " offline phase begins", fill="="))
             print("")
             
+            # Incremental POD can discard modes while snapshots are being stored, as long as their energy is within tolerance
+            if len(self.truth_problem.components) > 1:
+                for component in self.truth_problem.components:
+                    self.POD[component].incremental_tolerance = self.tol[component]
+            else:
+                self.POD.incremental_tolerance = self.tol
+            
             for (mu_index, mu) in enumerate(self.training_set):
                 print(TextLine(str(mu_index), fill="#"))
                 
@@ -82,11 +82,11 @@ def PrimalDualReductionMethod(DualProblem):
                 return import_successful and import_successful_dual
                 
             # Perform the offline phase of the reduced order model
-            def offline(self):
+            def offline(self, **kwargs):
                 # Carry out primal offline stage ...
-                primal_reduced_problem = DifferentialProblemReductionMethod_DerivedClass.offline(self)
+                primal_reduced_problem = DifferentialProblemReductionMethod_DerivedClass.offline(self, **kwargs)
                 # ... and then dual offline stage
-                self.dual_reduced_problem = self.dual_reduction_method.offline()
+                self.dual_reduced_problem = self.dual_reduction_method.offline(**kwargs)
                 # Attach reduced dual problem to reduced primal problem, and viceversa
                 primal_reduced_problem.dual_reduced_problem = self.dual_reduced_problem
                 self.dual_reduced_problem.primal_reduced_problem = primal_reduced_problem
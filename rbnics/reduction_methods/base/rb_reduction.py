@@ -20,7 +20,7 @@ import os
 from math import sqrt
 from rbnics.backends import GramSchmidt
 from rbnics.utils.decorators import PreserveClassName, RequiredBaseDecorators
-from rbnics.utils.io import ErrorAnalysisTable, GreedySelectedParametersList, GreedyErrorEstimatorsList, SpeedupAnalysisTable, TextBox, TextLine, Timer
+from rbnics.utils.io import ErrorAnalysisTable, GreedySelectedParametersList, GreedyErrorEstimatorsList, OnlineSizeDict, SpeedupAnalysisTable, TextBox, TextIO as CheckpointIO, TextLine, Timer
 from rbnics.utils.mpi import log, DEBUG
 
 @RequiredBaseDecorators(None)
@@ -48,7 +48,38 @@ def RBReduction(DifferentialProblemReductionMethod_DerivedClass):
             self.greedy_selected_parameters = GreedySelectedParametersList()
             self.greedy_error_estimators = GreedyErrorEstimatorsList()
             self.label = "RB"
+            # Greedy search: if not None, error estimators are evaluated for batches of (at most) greedy_batch_size parameters at once
+            self.greedy_batch_size = None
+            # Lazy greedy search: if enabled, error estimators computed at previous iterations are stored in a heap and
+            # only parameters with the largest stale error estimators are re-evaluated, until the maximum is certified
+            self.lazy_greedy = False
+            self.lazy_greedy_full_sweep_frequency = None
+            self.lazy_greedy_evaluations = 0 # over all greedy iterations
+            self.lazy_greedy_skipped_evaluations = 0 # over all greedy iterations
+            self._lazy_greedy_heap = list() # of (minus error estimator, training set index)
+            self._lazy_greedy_iterations_since_full_sweep = 0
+        
+        def set_greedy_batch_size(self, batch_size):
+            """
+            It sets the number of training parameters for which error estimators are evaluated at once during the greedy search.
+            
+            :param batch_size: batch size, or None to evaluate error estimators one parameter at a time.
+            """
+            assert batch_size is None or batch_size > 0
+            self.greedy_batch_size = batch_size
+            
+        def set_lazy_greedy(self, lazy_greedy, full_sweep_frequency=None):
+            """
+            It enables or disables the lazy greedy search. The lazy greedy search is only correct if the error estimator
+            is non-increasing with respect to the reduced dimension N.
             
+            :param lazy_greedy: True to enable the lazy greedy search.
+            :param full_sweep_frequency: if not None, all training parameters are re-evaluated every full_sweep_frequency iterations as a safeguard.
+            """
+            assert full_sweep_frequency is None or full_sweep_frequency > 0
+            self.lazy_greedy = lazy_greedy
+            self.lazy_greedy_full_sweep_frequency = full_sweep_frequency
+        
         def _init_offline(self):
             # Call parent to initialize inner product and reduced problem
             output = DifferentialProblemReductionMethod_DerivedClass._init_offline(self)
@@ -65,18 +96,33 @@ def RBReduction(DifferentialProblemReductionMethod_DerivedClass):
                 inner_product = self.truth_problem.inner_product[0]
                 self.GS = GramSchmidt(inner_product)
                 
+            # The greedy algorithm only enriches the basis, without modifying previous basis functions,
+            # so that reduced operators can be assembled incrementally
+            self.reduced_problem.incremental_offline_assembly = True
+            
+            # Reset lazy greedy data
+            self.lazy_greedy_evaluations = 0
+            self.lazy_greedy_skipped_evaluations = 0
+            self._lazy_greedy_heap = list()
+            self._lazy_greedy_iterations_since_full_sweep = 0
+            
             # Return
             return output
             
-        def offline(self):
+        def offline(self, resume=False):
             """
             It performs the offline phase of the reduced order model.
             
+            :param resume: if True, an interrupted offline phase is resumed from its last checkpoint.
             :return: reduced_problem where all offline data are stored.
             """
             need_to_do_offline_stage = self._init_offline()
             if need_to_do_offline_stage:
                 self._offline()
+            elif resume:
+                checkpoint = self._load_offline_checkpoint()
+                if checkpoint is not None and not checkpoint["completed"]:
+                    self._resume_offline(checkpoint)
             self._finalize_offline()
             return self.reduced_problem
             
@@ -94,6 +140,49 @@ def RBReduction(DifferentialProblemReductionMethod_DerivedClass):
             print("")
             
             iteration = 0
+            self._save_offline_checkpoint(iteration, completed=False)
+            self._offline_iterations(iteration, relative_error_estimator_max)
+            
+            print(TextBox(self.truth_problem.name() + " " + self.label + " offline phase ends", fill="="))
+            print("")
+        
+        def _resume_offline(self, checkpoint):
+            print(TextBox(self.truth_problem.name() + " " + self.label + " offline phase resumes", fill="="))
+            print("")
+            
+            # Restore offline data up to the checkpoint, discarding data stored afterwards
+            iteration = checkpoint["iteration"]
+            self._restore_offline_checkpoint(checkpoint)
+            
+            # Restore the parameter selected by the last greedy iteration
+            self.truth_problem.set_mu(self.greedy_selected_parameters[iteration])
+            absolute_error_estimator_max = self.greedy_error_estimators[iteration]
+            relative_error_estimator_max = absolute_error_estimator_max/self.greedy_error_estimators[0]
+            print("resuming from N =", self.reduced_problem.N)
+            print("maximum absolute error estimator over training set =", absolute_error_estimator_max)
+            print("maximum relative error estimator over training set =", relative_error_estimator_max)
+            
+            print("")
+            
+            self._offline_iterations(iteration, relative_error_estimator_max)
+            
+            print(TextBox(self.truth_problem.name() + " " + self.label + " offline phase ends", fill="="))
+            print("")
+        
+        def _restore_offline_checkpoint(self, checkpoint):
+            iteration = checkpoint["iteration"]
+            self.reduced_problem.resume_offline(checkpoint["N"])
+            # Files are overwritten with the truncated lists, so that no data stored after the checkpoint are kept on disk
+            self.greedy_selected_parameters.load(self.folder["post_processing"], "mu_greedy")
+            self.greedy_selected_parameters = self.greedy_selected_parameters[:iteration + 1]
+            self.greedy_selected_parameters.save(self.folder["post_processing"], "mu_greedy")
+            self.greedy_error_estimators.load(self.folder["post_processing"], "error_estimator_max")
+            greedy_error_estimators = GreedyErrorEstimatorsList()
+            greedy_error_estimators.extend(self.greedy_error_estimators[:iteration + 1])
+            self.greedy_error_estimators = greedy_error_estimators
+            self.greedy_error_estimators.save(self.folder["post_processing"], "error_estimator_max")
+        
+        def _offline_iterations(self, iteration, relative_error_estimator_max):
             while self.reduced_problem.N < self.Nmax and relative_error_estimator_max >= self.tol:
                 print(TextLine("N = " + str(self.reduced_problem.N), fill="#"))
                 
@@ -118,11 +207,28 @@ def RBReduction(DifferentialProblemReductionMethod_DerivedClass):
                 (absolute_error_estimator_max, relative_error_estimator_max) = self.greedy()
                 print("maximum absolute error estimator over training set =", absolute_error_estimator_max)
                 print("maximum relative error estimator over training set =", relative_error_estimator_max)
-
+                
                 print("")
                 
-            print(TextBox(self.truth_problem.name() + " " + self.label + " offline phase ends", fill="="))
-            print("")
+                self._save_offline_checkpoint(iteration, completed=False)
+            
+            self._save_offline_checkpoint(iteration, completed=True)
+        
+        def _save_offline_checkpoint(self, iteration, completed):
+            # All offline data of the current iteration have already been stored: the checkpoint manifest
+            # is written atomically, so that data of an interrupted iteration are never considered
+            checkpoint = {
+                "iteration": iteration,
+                "N": self.reduced_problem.N,
+                "completed": completed
+            }
+            CheckpointIO.save_file(checkpoint, self.folder["post_processing"], "offline_checkpoint")
+        
+        def _load_offline_checkpoint(self):
+            if CheckpointIO.exists_file(self.folder["post_processing"], "offline_checkpoint"):
+                return CheckpointIO.load_file(self.folder["post_processing"], "offline_checkpoint", globals={"OnlineSizeDict": OnlineSizeDict})
+            else:
+                return None
             
         def update_basis_matrix(self, snapshot):
             """
@@ -176,12 +282,46 @@ def RBReduction(DifferentialProblemReductionMethod_DerivedClass):
                 log(DEBUG, "Error estimator for mu = " + str(mu) + " is " + str(error_estimator))
                 return error_estimator
                 
+            def solve_and_estimate_error_batch(mus):
+                error_estimators = self.reduced_problem.solve_and_estimate_error_batch(mus)
+                if error_estimators is NotImplemented: # fall back to one parameter at a time
+                    return [solve_and_estimate_error(mu) for mu in mus]
+                for (mu, error_estimator) in zip(mus, error_estimators):
+                    log(DEBUG, "Error estimator for mu = " + str(mu) + " is " + str(error_estimator))
+                return error_estimators
+            
             if self.reduced_problem.N == 0:
                 print("find initial mu")
             else:
                 print("find next mu")
                 
-            return self.training_set.max(solve_and_estimate_error)
+            if self.lazy_greedy:
+                return self._lazy_greedy(solve_and_estimate_error, solve_and_estimate_error_batch)
+            elif self.greedy_batch_size is None:
+                return self.training_set.max(solve_and_estimate_error)
+            else:
+                return self.training_set.max(solve_and_estimate_error_batch, batch_size=self.greedy_batch_size)
+        
+        def _lazy_greedy(self, solve_and_estimate_error, solve_and_estimate_error_batch):
+            # Discard stale error estimators if a safeguard full sweep is required
+            self._lazy_greedy_iterations_since_full_sweep += 1
+            if (
+                self.lazy_greedy_full_sweep_frequency is not None
+                    and
+                self._lazy_greedy_iterations_since_full_sweep >= self.lazy_greedy_full_sweep_frequency
+            ):
+                self._lazy_greedy_heap.clear()
+            if len(self._lazy_greedy_heap) == 0:
+                self._lazy_greedy_iterations_since_full_sweep = 0
+            # Carry out the lazy greedy search
+            if self.greedy_batch_size is None:
+                (error_estimator_max, error_estimator_argmax, evaluations) = self.training_set.lazy_max(solve_and_estimate_error, self._lazy_greedy_heap)
+            else:
+                (error_estimator_max, error_estimator_argmax, evaluations) = self.training_set.lazy_max(solve_and_estimate_error_batch, self._lazy_greedy_heap, batch_size=self.greedy_batch_size)
+            self.lazy_greedy_evaluations += evaluations
+            self.lazy_greedy_skipped_evaluations += len(self.training_set) - evaluations
+            print("lazy greedy evaluated", evaluations, "error estimators and skipped", len(self.training_set) - evaluations)
+            return (error_estimator_max, error_estimator_argmax)
             
         def error_analysis(self, N_generator=None, filename=None, **kwargs):
             """
@@ -20,6 +20,7 @@ import os
 from abc import ABCMeta, abstractmethod
 from rbnics.sampling import ParameterSpaceSubset
 from rbnics.utils.io import Folders
+from rbnics.utils.mpi import io_mpi_comm, is_io_process
 
 # Implementation of a class containing an offline/online decomposition of ROM for parametrized problems
 class ReductionMethod(object, metaclass=ABCMeta):
@@ -35,6 +36,8 @@ class ReductionMethod(object, metaclass=ABCMeta):
         self.tol = 0.
         # Training set
         self.training_set = ParameterSpaceSubset()
+        # Groups of processes among which snapshots computation is split (if any)
+        self._parameter_groups = None
         # I/O
         self.folder["training_set"] = os.path.join(self.folder_prefix, "training_set")
         
@@ -54,6 +57,15 @@ class ReductionMethod(object, metaclass=ABCMeta):
     def set_tolerance(self, tol, **kwargs):
         self.tol = tol
 
+    # OFFLINE: split the computation of snapshots among groups of processes. group_mpi_comm is the communicator
+    # of the group the current process belongs to (e.g. as returned by split_mpi_comm), and it is expected that
+    # the mesh (and thus the truth problem) have been created on such communicator
+    def set_parameter_groups(self, group_mpi_comm):
+        mpi_comm = is_io_process.mpi_comm
+        groups_roots = [rank for rank in mpi_comm.allgather(mpi_comm.rank if group_mpi_comm.rank == 0 else -1) if rank >= 0]
+        group_index = group_mpi_comm.bcast(groups_roots.index(mpi_comm.rank) if group_mpi_comm.rank == 0 else None, root=0)
+        self._parameter_groups = (group_mpi_comm, group_index, len(groups_roots))
+    
     # OFFLINE: set the elements in the training set.
     def initialize_training_set(self, mu_range, ntrain, enable_import=True, sampling=None, **kwargs):
         # Create I/O folder
@@ -101,6 +113,43 @@ class ReductionMethod(object, metaclass=ABCMeta):
     def _init_offline(self):
         pass
         
+    # Carry out the offline stage, possibly splitting the computation of snapshots among groups of processes.
+    # In such case, each group calls compute_snapshot(mu_index, mu) on its own portion of the training set,
+    # which is expected to store the snapshot in the disk cache. The offline stage is then carried out by the
+    # first group, which reads back snapshots from the disk cache, while the remaining groups wait for offline
+    # data to be available on disk
+    def _offline_by_parameter_groups(self, compute_snapshot, offline_stage):
+        if self._parameter_groups is None:
+            offline_stage()
+        else:
+            (group_mpi_comm, group_index, n_groups) = self._parameter_groups
+            with io_mpi_comm(group_mpi_comm):
+                for mu_index in range(group_index, len(self.training_set), n_groups):
+                    compute_snapshot(mu_index, self.training_set[mu_index])
+            is_io_process.mpi_comm.barrier()
+            if group_index == 0:
+                with io_mpi_comm(group_mpi_comm):
+                    offline_stage()
+            is_io_process.mpi_comm.barrier()
+    
+    # Evaluate function(key) for each of the given keys, returning a dict from keys to (picklable) results.
+    # If groups of processes have been set, keys are split among groups, each group evaluating its own keys
+    # with I/O restricted to the group, and results are then shared among all processes
+    def _map_by_parameter_groups(self, function, keys):
+        if self._parameter_groups is None:
+            return dict((key, function(key)) for key in keys)
+        else:
+            (group_mpi_comm, group_index, n_groups) = self._parameter_groups
+            group_results = dict()
+            with io_mpi_comm(group_mpi_comm):
+                for key in keys[group_index::n_groups]:
+                    group_results[key] = function(key)
+            results = dict()
+            for results_from_group_root in is_io_process.mpi_comm.allgather(group_results if group_mpi_comm.rank == 0 else dict()):
+                results.update(results_from_group_root)
+            assert len(results) == len(keys)
+            return results
+    
     # Finalize data structures required after the offline phase
     def _finalize_offline(self):
         pass
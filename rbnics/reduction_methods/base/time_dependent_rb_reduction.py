@@ -44,6 +44,11 @@ def TimeDependentRBReduction(DifferentialProblemReductionMethod_DerivedClass):
             # Declare POD objects for basis computation using POD-Greedy
             self.POD_time_trajectory = None # ProperOrthogonalDecomposition (for problems with one component) or dict of ProperOrthogonalDecomposition (for problem with several components)
             self.POD_basis = None # ProperOrthogonalDecomposition (for problems with one component) or dict of ProperOrthogonalDecomposition (for problem with several components)
+            # Nested POD: if True, each time trajectory is compressed in streaming fashion by an incremental POD,
+            # which is fed one time step at a time and only keeps the current modes and singular values
+            self.POD_greedy_nested = False
+            self._POD_greedy_streamed_time_steps = None # number of time steps fed by the time stepping monitor, None if not streaming
+            self._POD_greedy_user_monitor = None # time stepping monitor provided by the user, still called while streaming
             # POD-Greedy size
             self.N1 = 0
             self.N2 = 0
@@ -145,15 +150,58 @@ def TimeDependentRBReduction(DifferentialProblemReductionMethod_DerivedClass):
                 if self.POD_greedy_basis_extension == "POD":
                     self.POD_basis = ProperOrthogonalDecomposition(self.truth_problem.V, inner_product)
             
+            # Compress time trajectories incrementally, if required
+            if self.POD_greedy_nested:
+                if len(self.truth_problem.components) > 1:
+                    for component in self.truth_problem.components:
+                        self.POD_time_trajectory[component].set_incremental(True)
+                else:
+                    self.POD_time_trajectory.set_incremental(True)
+            
+            # Basis functions are recomputed from scratch at each iteration when using POD basis extension
+            self.reduced_problem.incremental_offline_assembly = (self.POD_greedy_basis_extension == "orthogonal")
+            
             # Return
             return output
             
+        # Restore offline data stored up to the last checkpoint, in order to resume an interrupted offline phase
+        def _restore_offline_checkpoint(self, checkpoint):
+            DifferentialProblemReductionMethod_DerivedClass._restore_offline_checkpoint(self, checkpoint)
+            # The POD basis extension requires the compressed time trajectories of all previous iterations, which are
+            # not stored: compress them again, importing the time trajectories exported by previous iterations
+            if self.POD_greedy_basis_extension == "POD":
+                for snapshot_index in range(checkpoint["iteration"]):
+                    mu = self.greedy_selected_parameters[snapshot_index]
+                    self.truth_problem.set_mu(mu)
+                    self.reduced_problem.set_mu(mu)
+                    print("compress time trajectory of truth solve for mu =", mu)
+                    snapshot_over_time = list()
+                    self.truth_problem.import_solution(self.folder["snapshots"], "truth_" + str(snapshot_index), snapshot_over_time)
+                    snapshot_over_time = self.postprocess_snapshot(snapshot_over_time, snapshot_index)
+                    snapshot_over_time = snapshot_over_time[self.reduction_first_index:self.reduction_last_index:self.reduction_delta_index]
+                    if len(self.truth_problem.components) > 1:
+                        for component in self.truth_problem.components:
+                            self._POD_greedy_store_compressed_time_trajectory(snapshot_over_time, component=component)
+                    else:
+                        self._POD_greedy_store_compressed_time_trajectory(snapshot_over_time)
+            # Get ready to stream the time trajectory of the next truth solve
+            self._POD_greedy_start_streaming()
+        
+        # Finalize data structures required after the offline phase
+        def _finalize_offline(self):
+            self._POD_greedy_stop_streaming()
+            DifferentialProblemReductionMethod_DerivedClass._finalize_offline(self)
+        
         # Update basis matrix by POD-Greedy
         def update_basis_matrix(self, snapshot_over_time):
             snapshot_over_time = snapshot_over_time[self.reduction_first_index:self.reduction_last_index:self.reduction_delta_index]
             
             if self.POD_greedy_basis_extension == "orthogonal":
-                orthogonal_snapshot_over_time = self._POD_greedy_orthogonalize_snapshot(snapshot_over_time)
+                if self.POD_greedy_nested:
+                    # Each time step will be orthogonalized only while being stored in the POD, see _POD_greedy_store_time_trajectory
+                    orthogonal_snapshot_over_time = snapshot_over_time
+                else:
+                    orthogonal_snapshot_over_time = self._POD_greedy_orthogonalize_snapshot(snapshot_over_time)
                 if len(self.truth_problem.components) > 1:
                     for component in self.truth_problem.components:
                         print("# POD-Greedy for component", component)
@@ -177,6 +225,7 @@ def TimeDependentRBReduction(DifferentialProblemReductionMethod_DerivedClass):
                     self.reduced_problem.basis_functions.enrich(basis_functions2)
                     self.reduced_problem.N = N_plus_N2
                     
+            self._POD_greedy_stop_streaming()
             self.reduced_problem.basis_functions.save(self.reduced_problem.folder["basis"], "basis")
                 
         def _POD_greedy_orthogonalize_snapshot(self, snapshot_over_time):
@@ -190,6 +239,72 @@ def TimeDependentRBReduction(DifferentialProblemReductionMethod_DerivedClass):
             else:
                 return snapshot_over_time
                 
+        def _POD_greedy_start_streaming(self):
+            # With nested POD, the time trajectory of the next truth solve is fed to the incremental POD(s) by the
+            # time stepping monitor while being computed, see _POD_greedy_monitor
+            if self.POD_greedy_nested:
+                if len(self.truth_problem.components) > 1:
+                    for component in self.truth_problem.components:
+                        self.POD_time_trajectory[component].clear()
+                        self.POD_time_trajectory[component].incremental_tolerance = self.tol1[component]
+                else:
+                    self.POD_time_trajectory.clear()
+                    self.POD_time_trajectory.incremental_tolerance = self.tol1
+                if self._POD_greedy_streamed_time_steps is None:
+                    self._POD_greedy_user_monitor = self.truth_problem._time_stepping_parameters.get("monitor")
+                    self.truth_problem._time_stepping_parameters["monitor"] = self._POD_greedy_monitor
+                self._POD_greedy_streamed_time_steps = 0
+        
+        def _POD_greedy_stop_streaming(self):
+            if self._POD_greedy_streamed_time_steps is not None:
+                self._POD_greedy_streamed_time_steps = None
+                if self._POD_greedy_user_monitor is not None:
+                    self.truth_problem._time_stepping_parameters["monitor"] = self._POD_greedy_user_monitor
+                    self._POD_greedy_user_monitor = None
+                else:
+                    del self.truth_problem._time_stepping_parameters["monitor"]
+        
+        def _POD_greedy_monitor(self, t, solution, *solution_derivatives):
+            # Do not override the monitor provided by the user, if any
+            if self._POD_greedy_user_monitor is not None:
+                self._POD_greedy_user_monitor(t, solution, *solution_derivatives)
+            # Only keep time steps which would be kept by undersampling the time trajectory in update_basis_matrix
+            k = int(round((t - self.truth_problem.t0)/self.truth_problem.dt))
+            Nt = int(round((self.truth_problem.T - self.truth_problem.t0)/self.truth_problem.dt)) + 1
+            if k not in range(Nt)[self.reduction_first_index:self.reduction_last_index:self.reduction_delta_index]:
+                return
+            snapshot = self._postprocess_snapshot_at_time_step(solution, k, len(self.greedy_selected_parameters) - 1)
+            orthogonalize = (self.POD_greedy_basis_extension == "orthogonal" and self.reduced_problem.N > 0)
+            if orthogonalize:
+                snapshot = snapshot - self.reduced_problem.basis_functions*self.reduced_problem.project([snapshot], on_dirichlet_bc=False)[0]
+            if len(self.truth_problem.components) > 1:
+                for component in self.truth_problem.components:
+                    self.POD_time_trajectory[component].store_snapshot(snapshot, component=component)
+            else:
+                self.POD_time_trajectory.store_snapshot(snapshot)
+            self._POD_greedy_streamed_time_steps += 1
+        
+        def _POD_greedy_time_trajectory_streamed(self, snapshot_over_time):
+            # The time trajectory has been fed to the incremental POD(s) by the time stepping monitor, unless
+            # the truth solve was served from cache and the monitor has never been called
+            return self._POD_greedy_streamed_time_steps == len(snapshot_over_time) > 0
+        
+        def _POD_greedy_store_time_trajectory(self, POD_time_trajectory, snapshot_over_time, component=None, orthogonalize=False):
+            if self.POD_greedy_nested:
+                # Store one time step at a time, so that the incremental POD never holds the whole time trajectory,
+                # orthogonalizing it with respect to the current basis if required
+                if orthogonalize and self.reduced_problem.N > 0:
+                    basis_functions = self.reduced_problem.basis_functions
+                    projected_snapshot_N_over_time = self.reduced_problem.project(snapshot_over_time, on_dirichlet_bc=False)
+                    for (snapshot, projected_snapshot_N) in zip(snapshot_over_time, projected_snapshot_N_over_time):
+                        POD_time_trajectory.store_snapshot(snapshot - basis_functions*projected_snapshot_N, component=component)
+                else:
+                    for snapshot in snapshot_over_time:
+                        POD_time_trajectory.store_snapshot(snapshot, component=component)
+            else:
+                assert not orthogonalize
+                POD_time_trajectory.store_snapshot(snapshot_over_time, component=component)
+        
         def _POD_greedy_compute_basis_extension_with_orthogonal_snapshot(self, orthogonal_snapshot_over_time, component=None):
             N1 = self.N1
             if component is None:
@@ -198,8 +313,10 @@ def TimeDependentRBReduction(DifferentialProblemReductionMethod_DerivedClass):
             else:
                 POD_time_trajectory = self.POD_time_trajectory[component]
                 tol1 = self.tol1[component]
-            POD_time_trajectory.clear()
-            POD_time_trajectory.store_snapshot(orthogonal_snapshot_over_time, component=component)
+            if not self._POD_greedy_time_trajectory_streamed(orthogonal_snapshot_over_time):
+                POD_time_trajectory.clear()
+                POD_time_trajectory.incremental_tolerance = tol1
+                self._POD_greedy_store_time_trajectory(POD_time_trajectory, orthogonal_snapshot_over_time, component, orthogonalize=self.POD_greedy_nested)
             (_, _, basis_functions1, N1) = POD_time_trajectory.apply(N1, tol1)
             POD_time_trajectory.print_eigenvalues(N1)
             if component is None:
@@ -212,17 +329,7 @@ def TimeDependentRBReduction(DifferentialProblemReductionMethod_DerivedClass):
             
         def _POD_greedy_compute_basis_extension_with_POD(self, snapshot_over_time, component=None):
             # First, compress the time trajectory stored in snapshot
-            N1 = self.N1
-            if component is None:
-                POD_time_trajectory = self.POD_time_trajectory
-                tol1 = self.tol1
-            else:
-                POD_time_trajectory = self.POD_time_trajectory[component]
-                tol1 = self.tol1[component]
-            POD_time_trajectory.clear()
-            POD_time_trajectory.store_snapshot(snapshot_over_time, component=component)
-            (eigs1, _, basis_functions1, N1) = POD_time_trajectory.apply(N1, tol1)
-            POD_time_trajectory.print_eigenvalues(N1)
+            self._POD_greedy_store_compressed_time_trajectory(snapshot_over_time, component)
             
             # Then, compress parameter dependence (thus, we do not clear the POD object)
             N2 = self.N2
@@ -232,7 +339,6 @@ def TimeDependentRBReduction(DifferentialProblemReductionMethod_DerivedClass):
             else:
                 POD_basis = self.POD_basis[component]
                 tol2 = self.tol2[component]
-            POD_basis.store_snapshot(basis_functions1, weight=[sqrt(e) for e in eigs1], component=component)
             (_, _, basis_functions2, N_plus_N2) = POD_basis.apply(self.reduced_problem.N + N2, tol2)
             POD_basis.print_eigenvalues(N_plus_N2)
             if component is None:
@@ -252,6 +358,35 @@ def TimeDependentRBReduction(DifferentialProblemReductionMethod_DerivedClass):
             # Return
             return (basis_functions2, N_plus_N2)
         
+        def _POD_greedy_store_compressed_time_trajectory(self, snapshot_over_time, component=None):
+            # Compress the time trajectory stored in snapshot, and store its POD modes (weighted by the square root
+            # of the corresponding eigenvalues) in the POD over parameters
+            N1 = self.N1
+            if component is None:
+                POD_time_trajectory = self.POD_time_trajectory
+                tol1 = self.tol1
+            else:
+                POD_time_trajectory = self.POD_time_trajectory[component]
+                tol1 = self.tol1[component]
+            if not self._POD_greedy_time_trajectory_streamed(snapshot_over_time):
+                POD_time_trajectory.clear()
+                POD_time_trajectory.incremental_tolerance = tol1
+                self._POD_greedy_store_time_trajectory(POD_time_trajectory, snapshot_over_time, component)
+            (eigs1, _, basis_functions1, N1) = POD_time_trajectory.apply(N1, tol1)
+            POD_time_trajectory.print_eigenvalues(N1)
+            if component is None:
+                POD_basis = self.POD_basis
+            else:
+                POD_basis = self.POD_basis[component]
+            POD_basis.store_snapshot(basis_functions1, weight=[sqrt(e) for e in eigs1], component=component)
+        
+        # Choose the next parameter in the offline stage in a greedy fashion, and get ready to stream the time trajectory
+        # of the truth solve for such parameter
+        def greedy(self):
+            output = DifferentialProblemReductionMethod_DerivedClass.greedy(self)
+            self._POD_greedy_start_streaming()
+            return output
+        
         # Choose the next parameter in the offline stage in a greedy fashion
         def _greedy(self):
             
@@ -61,11 +61,14 @@ def TimeDependentReductionMethod(DifferentialProblemReductionMethod_DerivedClass
         def postprocess_snapshot(self, snapshot_over_time, snapshot_index):
             postprocessed_snapshot = list()
             for (k, snapshot_k) in enumerate(snapshot_over_time):
-                self.reduced_problem.set_time(k*self.reduced_problem.dt)
-                postprocessed_snapshot_k = DifferentialProblemReductionMethod_DerivedClass.postprocess_snapshot(self, snapshot_k, snapshot_index)
+                postprocessed_snapshot_k = self._postprocess_snapshot_at_time_step(snapshot_k, k, snapshot_index)
                 postprocessed_snapshot.append(postprocessed_snapshot_k)
             return postprocessed_snapshot
         
+        def _postprocess_snapshot_at_time_step(self, snapshot_k, k, snapshot_index):
+            self.reduced_problem.set_time(k*self.reduced_problem.dt)
+            return DifferentialProblemReductionMethod_DerivedClass.postprocess_snapshot(self, snapshot_k, snapshot_index)
+        
         def _patch_truth_solve(self, force, **kwargs):
             if "with_respect_to" in kwargs:
                 assert inspect.isfunction(kwargs["with_respect_to"])
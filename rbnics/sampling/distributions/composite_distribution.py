@@ -62,3 +62,6 @@ class CompositeDistribution(Distribution):
         # ... and convert each mu to a tuple
         set_ = [tuple(mu) for mu in set_as_list]
         return set_
+    
+    def is_reproducible(self):
+        return all([distribution.is_reproducible() for distribution in self.distribution_to_components])
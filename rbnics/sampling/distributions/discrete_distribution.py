@@ -33,3 +33,6 @@ class DiscreteDistribution(Distribution):
                 rounded_mu.append(round(mu[p]/step_size)*step_size)
             rounded_set.append(tuple(rounded_mu))
         return rounded_set
+    
+    def is_reproducible(self):
+        return self.distribution.is_reproducible()
@@ -23,6 +23,11 @@ class Distribution(object, metaclass=ABCMeta):
     def sample(self, box, n):
         raise NotImplementedError("The method sample is distribution-specific and needs to be overridden.")
         
+    # Return True if sample() returns the same set when called on different processes with the same arguments,
+    # so that the set can be generated locally by each process rather than being broadcast
+    def is_reproducible(self):
+        return False
+    
     # Override the following methods to use a Distribution as a dict key
     def __hash__(self):
         dict_for_hash = list()
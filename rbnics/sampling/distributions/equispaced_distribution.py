@@ -32,3 +32,6 @@ class EquispacedDistribution(Distribution):
         for mu in set_itertools:
             set_.append(mu)
         return set_
+    
+    def is_reproducible(self):
+        return True
@@ -0,0 +1,24 @@
+# Copyright (C) 2015-2018 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+from rbnics.sampling.distributions.quasi_monte_carlo_distribution import QuasiMonteCarloDistribution
+
+class HaltonDistribution(QuasiMonteCarloDistribution):
+    def _create_engine(self, dimension):
+        from scipy.stats import qmc # requires scipy >= 1.7, so it is only imported when actually needed
+        return qmc.Halton(dimension, scramble=True, seed=self.seed)
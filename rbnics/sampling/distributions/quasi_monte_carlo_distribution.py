@@ -0,0 +1,44 @@
+# Copyright (C) 2015-2018 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+from abc import abstractmethod
+from numpy import array
+from rbnics.sampling.distributions.distribution import Distribution
+
+# Base class for distributions which sample points in [0, 1]^P by a generator of scipy.stats.qmc, and then
+# map them to the box. If seed is provided, scrambling is reproducible, so that every process can generate
+# the same set locally
+class QuasiMonteCarloDistribution(Distribution):
+    def __init__(self, seed=None):
+        self.seed = seed
+    
+    def sample(self, box, n):
+        if n == 0:
+            return list()
+        unit_set = self._create_engine(len(box)).random(n)
+        box_min = array([box_p[0] for box_p in box])
+        box_max = array([box_p[1] for box_p in box])
+        set_ = box_min + unit_set*(box_max - box_min)
+        return [tuple(mu) for mu in set_.tolist()]
+    
+    def is_reproducible(self):
+        return self.seed is not None
+    
+    @abstractmethod
+    def _create_engine(self, dimension):
+        raise NotImplementedError("The method _create_engine is distribution-specific and needs to be overridden.")
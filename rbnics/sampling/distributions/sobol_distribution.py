@@ -0,0 +1,32 @@
+# Copyright (C) 2015-2018 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import warnings
+from rbnics.sampling.distributions.quasi_monte_carlo_distribution import QuasiMonteCarloDistribution
+
+class SobolDistribution(QuasiMonteCarloDistribution):
+    # Balance properties of Sobol' points are only guaranteed if n is a power of 2. Any other n is allowed
+    # as well, as for the other distributions, and the corresponding warning from scipy is silenced
+    def sample(self, box, n):
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", message="The balance properties of Sobol")
+            return QuasiMonteCarloDistribution.sample(self, box, n)
+    
+    def _create_engine(self, dimension):
+        from scipy.stats import qmc # requires scipy >= 1.7, so it is only imported when actually needed
+        return qmc.Sobol(dimension, scramble=True, seed=self.seed)
@@ -21,10 +21,9 @@ from rbnics.sampling.distributions.distribution import Distribution
 
 class UniformDistribution(Distribution):
     def sample(self, box, n):
-        set_ = list() # of tuples
-        for i in range(n):
-            mu = list() # of numbers
-            for box_p in box:
-                mu.append(random.uniform(box_p[0], box_p[1]))
-            set_.append(tuple(mu))
-        return set_
+        # Draw all numbers at once: since they are drawn row by row, the set is the same as the one obtained
+        # by drawing each component of each parameter in turn
+        box_min = [box_p[0] for box_p in box]
+        box_max = [box_p[1] for box_p in box]
+        set_ = random.uniform(box_min, box_max, size=(n, len(box)))
+        return [tuple(mu) for mu in set_.tolist()]
@@ -16,20 +16,39 @@
 # along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
 #
 
-import operator # to find closest parameters
-from math import sqrt
+import os
+from heapq import heapify, heappop, heappush
 from numpy import zeros as array
-from numpy import argmax
+from numpy import argmax, asarray, atleast_1d, empty, log as vectorized_log
+from scipy.spatial import cKDTree as KDTree # to find closest parameters
 from rbnics.sampling.distributions import CompositeDistribution, UniformDistribution
 from rbnics.utils.decorators import overload
 from rbnics.utils.io import ExportableList
+from rbnics.utils.io.numpy_io import NumpyIO
+from rbnics.utils.io.text_io import TextIO
 from rbnics.utils.mpi import is_io_process, parallel_max
 
+# Number of parameters which are converted at once to tuples when iterating over a set stored as an array
+_default_chunk_size = 10000
+
+# Sets with at least this number of parameters are saved in binary format, while smaller ones (e.g. greedily
+# selected parameters) are saved as text
+_binary_storage_threshold = 10000
+
 class ParameterSpaceSubset(ExportableList): # equivalent to a list of tuples
     def __init__(self):
         ExportableList.__init__(self, "text")
         self.mpi_comm = is_io_process.mpi_comm # default communicator
         self.distributed_max = True
+        self.distance_scaling = None
+        # KD-tree of (scaled) parameters, lazily built by closest() and rebuilt when the list changes
+        self._kdtree = None
+        self._kdtree_list = None
+        self._kdtree_length = None
+        # Hash set of parameters, lazily built by __contains__() and diff() and rebuilt when the list changes
+        self._set = None
+        self._set_list = None
+        self._set_length = None
         
     @overload
     def __getitem__(self, key: int):
@@ -40,37 +59,102 @@ class ParameterSpaceSubset(ExportableList): # equivalent to a list of tuples
         output = ParameterSpaceSubset()
         output.mpi_comm = self.mpi_comm
         output.distributed_max = self.distributed_max
+        output.distance_scaling = self.distance_scaling
         output._list = self._list[key]
         return output
     
+    def __setitem__(self, key, item):
+        if isinstance(self._list, _ParametersArray) and not isinstance(item, tuple):
+            self._list = list(self._list) # e.g. enlarged parameters of time dependent problems, which cannot be stored in an array
+        ExportableList.__setitem__(self, key, item)
+        self._kdtree = None
+        self._set = None
+    
+    def __contains__(self, mu):
+        return mu in self._get_set()
+    
+    def save(self, directory, filename):
+        if len(self._list) >= _binary_storage_threshold and isinstance(self._list, _ParametersArray):
+            NumpyIO.save_file(self._list.array, directory, filename)
+            (stale_FileIO, stale_extension) = (TextIO, ".txt")
+        else: # small sets, or enlarged parameters of time dependent problems which cannot be stored in an array
+            TextIO.save_file(list(self._list), directory, filename)
+            (stale_FileIO, stale_extension) = (NumpyIO, ".npy")
+        # Remove a file previously saved in the other format, which would be loaded in place of the current one
+        if stale_FileIO.exists_file(directory, filename):
+            if is_io_process():
+                os.remove(os.path.join(str(directory), filename + stale_extension))
+            is_io_process.mpi_comm.barrier()
+    
+    def load(self, directory, filename):
+        if len(self._list) > 0: # avoid loading multiple times
+            return False
+        if NumpyIO.exists_file(directory, filename):
+            # Memory map the file, so that parameters are read from disk only when they are accessed
+            self._list = _ParametersArray(NumpyIO.load_file(directory, filename, mmap_mode="r"))
+            return True
+        elif TextIO.exists_file(directory, filename):
+            self._list = TextIO.load_file(directory, filename)
+            return True
+        else:
+            raise OSError
+    
     # Method for generation of parameter space subsets
     def generate(self, box, n, sampling=None):
         if len(box) > 0:
-            if is_io_process():
-                if sampling is None:
-                    sampling = UniformDistribution()
-                elif isinstance(sampling, tuple):
-                    assert len(sampling) == len(box)
-                    sampling = CompositeDistribution(sampling)
-                self._list = sampling.sample(box, n)
-            self._list = is_io_process.mpi_comm.bcast(self._list, root=0)
+            if sampling is None:
+                sampling = UniformDistribution()
+            elif isinstance(sampling, tuple):
+                assert len(sampling) == len(box)
+                sampling = CompositeDistribution(sampling)
+            if sampling.is_reproducible(): # every process generates the same set, no need to broadcast
+                set_ = asarray(sampling.sample(box, n), dtype=float).reshape(-1, len(box))
+            else:
+                # Broadcast the set as a buffer of floats, rather than pickling a list of tuples
+                if is_io_process():
+                    set_ = asarray(sampling.sample(box, n), dtype=float).reshape(-1, len(box))
+                    shape = set_.shape
+                else:
+                    shape = None
+                shape = is_io_process.mpi_comm.bcast(shape, root=is_io_process.root)
+                if not is_io_process():
+                    set_ = empty(shape)
+                is_io_process.mpi_comm.Bcast(set_, root=is_io_process.root)
+            self._list = _ParametersArray(set_)
         else:
-            for i in range(n):
-                self._list.append(tuple())
+            self._list = _ParametersArray(empty((n, 0)))
+    
+    # Iterate over this set by chunks of (at most) chunk_size parameters. Only the current chunk is converted to
+    # a list of tuples, so that a large set (possibly memory mapped from file) can be streamed
+    def chunks(self, chunk_size=_default_chunk_size):
+        assert chunk_size > 0
+        if isinstance(self._list, _ParametersArray):
+            return self._list.chunks(chunk_size)
+        else:
+            return (self._list[chunk_begin:chunk_begin + chunk_size] for chunk_begin in range(0, len(self._list), chunk_size))
         
-    def max(self, generator, postprocessor=None):
+    # Maximize generator over this set. If batch_size is provided, generator is called on lists of (at most)
+    # batch_size parameters, and should return the corresponding list of values
+    def max(self, generator, postprocessor=None, batch_size=None):
         if postprocessor is None:
             def postprocessor(value):
                 return value
-        if self.distributed_max:
-            local_list_indices = list(range(self.mpi_comm.rank, len(self._list), self.mpi_comm.size)) # start from index rank and take steps of length equal to size
-        else:
-            local_list_indices = list(range(len(self._list)))
+        local_list_indices = self._local_list_indices()
         values = array(len(local_list_indices))
         values_with_postprocessing = array(len(local_list_indices))
-        for i in range(len(local_list_indices)):
-            values[i] = generator(self._list[local_list_indices[i]])
-            values_with_postprocessing[i] = postprocessor(values[i])
+        if batch_size is None:
+            for i in range(len(local_list_indices)):
+                values[i] = generator(self._list[local_list_indices[i]])
+                values_with_postprocessing[i] = postprocessor(values[i])
+        else:
+            assert batch_size > 0
+            for batch_begin in range(0, len(local_list_indices), batch_size):
+                batch_end = min(batch_begin + batch_size, len(local_list_indices))
+                batch_values = generator([self._list[local_list_indices[i]] for i in range(batch_begin, batch_end)])
+                assert len(batch_values) == batch_end - batch_begin
+                for (i, value) in zip(range(batch_begin, batch_end), batch_values):
+                    values[i] = value
+                    values_with_postprocessing[i] = postprocessor(value)
         if self.distributed_max:
             local_i_max = argmax(values_with_postprocessing)
             local_value_max = values[local_i_max]
@@ -83,13 +167,96 @@ class ParameterSpaceSubset(ExportableList): # equivalent to a list of tuples
             global_value_max = values[global_i_max]
         return (global_value_max, global_i_max)
     
+    # Maximize generator over this set, assuming that generator is non-increasing between consecutive calls.
+    # heap is a list of (minus value, index) pairs, which stores the last known value of generator for each index,
+    # and it is updated in place. Since last known values are upper bounds of current ones, only the indices
+    # on top of the heap are re-evaluated, until the maximum is certified. If heap is empty, generator is
+    # evaluated on the whole set. If batch_size is provided, generator is called on lists of (at most)
+    # batch_size parameters, as in max(). Returns also the number of evaluations of generator.
+    def lazy_max(self, generator, heap, batch_size=None):
+        if batch_size is None:
+            def evaluate(indices):
+                return [generator(self._list[i]) for i in indices]
+        else:
+            assert batch_size > 0
+            def evaluate(indices):
+                values = list()
+                for batch_begin in range(0, len(indices), batch_size):
+                    batch_values = generator([self._list[i] for i in indices[batch_begin:batch_begin + batch_size]])
+                    assert len(batch_values) == len(indices[batch_begin:batch_begin + batch_size])
+                    values.extend(batch_values)
+                return values
+        if len(heap) == 0:
+            local_list_indices = self._local_list_indices()
+            heap.extend([(- value, i) for (i, value) in zip(local_list_indices, evaluate(local_list_indices))])
+            heapify(heap)
+            local_evaluations = len(local_list_indices)
+        else:
+            evaluated = set()
+            while heap[0][1] not in evaluated: # the maximum is certified as soon as the top of the heap has been updated
+                stale_indices = list()
+                while len(heap) > 0 and heap[0][1] not in evaluated and len(stale_indices) < (batch_size or 1):
+                    stale_indices.append(heappop(heap)[1])
+                for (i, value) in zip(stale_indices, evaluate(stale_indices)):
+                    heappush(heap, (- value, i))
+                    evaluated.add(i)
+            local_evaluations = len(evaluated)
+        (local_value_max, local_i_max) = (- heap[0][0], heap[0][1])
+        if self.distributed_max:
+            (global_value_max, global_i_max) = parallel_max(self.mpi_comm, local_value_max, local_i_max)
+            assert isinstance(global_i_max, tuple)
+            assert len(global_i_max) == 1
+            global_i_max = global_i_max[0]
+            global_evaluations = self.mpi_comm.allreduce(local_evaluations)
+        else:
+            (global_value_max, global_i_max) = (local_value_max, local_i_max)
+            global_evaluations = local_evaluations
+        return (global_value_max, global_i_max, global_evaluations)
+    
+    def _local_list_indices(self):
+        if self.distributed_max:
+            return range(self.mpi_comm.rank, len(self._list), self.mpi_comm.size) # start from index rank and take steps of length equal to size
+        else:
+            return range(len(self._list))
+    
     def diff(self, other_set):
         output = ParameterSpaceSubset()
         output.mpi_comm = self.mpi_comm
         output.distributed_max = self.distributed_max
-        output._list = [mu for mu in self._list if mu not in other_set]
+        output.distance_scaling = self.distance_scaling
+        # Use a hash set for lookup, rather than a linear search in other_set for each parameter
+        if isinstance(other_set, ParameterSpaceSubset):
+            other_set = other_set._get_set()
+        else:
+            other_set = set(other_set)
+        if isinstance(self._list, _ParametersArray):
+            mask = [mu not in other_set for chunk in self._list.chunks(_default_chunk_size) for mu in chunk]
+            output._list = _ParametersArray(self._list.array[asarray(mask, dtype=bool)])
+        else:
+            output._list = [mu for mu in self._list if mu not in other_set]
         return output
         
+    def _get_set(self):
+        if (
+            self._set is None
+                or
+            self._set_list is not self._list # e.g. after load
+                or
+            self._set_length != len(self._list) # e.g. after append
+        ):
+            self._set = set(self._list)
+            self._set_list = self._list
+            self._set_length = len(self._list)
+        return self._set
+    
+    # Set the scaling of each parameter component to be used when computing distances in closest(). Each entry
+    # is either a positive number, which multiplies the corresponding component, or "log", for components
+    # spanning several orders of magnitude. If scaling is None, the Euclidean distance is used
+    def set_distance_scaling(self, scaling):
+        assert scaling is None or all([s == "log" or s > 0. for s in scaling])
+        self.distance_scaling = scaling
+        self._kdtree = None
+    
     # M parameters in this set closest to mu
     def closest(self, M, mu):
         assert M <= len(self)
@@ -101,15 +268,104 @@ class ParameterSpaceSubset(ExportableList): # equivalent to a list of tuples
         output = ParameterSpaceSubset()
         output.mpi_comm = self.mpi_comm
         output.distributed_max = self.distributed_max
+        output.distance_scaling = self.distance_scaling
             
         # Trivial case 2:
         if M == 0:
             return output
         
-        parameters_and_distances = list()
-        for xi_i in self:
-            distance = sqrt(sum([(x - y)**2 for (x, y) in zip(mu, xi_i)]))
-            parameters_and_distances.append((xi_i, distance))
-        parameters_and_distances.sort(key=operator.itemgetter(1))
-        output._list = [xi_i for (xi_i, _) in parameters_and_distances[:M]]
+        output._list = [self._list[i] for i in self.closest_indices(M, mu)]
         return output
+    
+    # Indices of the M parameters in this set closest to mu, sorted by increasing distance
+    def closest_indices(self, M, mu):
+        assert M <= len(self)
+        if M == 0:
+            return list()
+        elif len(mu) == 0: # all parameters are at zero distance
+            return list(range(M))
+        else:
+            (_, indices) = self._get_kdtree().query(self._scale([mu])[0], k=M)
+            return [int(i) for i in atleast_1d(indices)]
+    
+    def _get_kdtree(self):
+        if (
+            self._kdtree is None
+                or
+            self._kdtree_list is not self._list # e.g. after load
+                or
+            self._kdtree_length != len(self._list) # e.g. after append
+        ):
+            self._kdtree = KDTree(self._scale(self._list))
+            self._kdtree_list = self._list
+            self._kdtree_length = len(self._list)
+        return self._kdtree
+    
+    def _scale(self, parameters):
+        parameters = asarray(parameters, dtype=float)
+        if self.distance_scaling is not None:
+            parameters = parameters.copy()
+            assert len(self.distance_scaling) == parameters.shape[1]
+            for (p, scaling) in enumerate(self.distance_scaling):
+                if scaling == "log":
+                    parameters[:, p] = vectorized_log(parameters[:, p])
+                else:
+                    parameters[:, p] *= scaling
+        return parameters
+    
+# Storage of a parameter space subset as a two dimensional array, with a row for each parameter. It behaves as a
+# list of tuples, but it requires far less memory for large sets, and it can be memory mapped from file
+class _ParametersArray(object):
+    def __init__(self, array_):
+        assert len(array_.shape) == 2
+        self._array = array_
+        self._length = array_.shape[0]
+    
+    @property
+    def array(self):
+        return self._array[:self._length]
+    
+    def append(self, element):
+        assert len(element) == self._array.shape[1]
+        if self._length == self._array.shape[0]:
+            self._reallocate(max(2*self._length, 1)) # amortized constant time append
+        self._array[self._length] = element
+        self._length += 1
+    
+    def extend(self, other_list):
+        for element in other_list:
+            self.append(element)
+    
+    def chunks(self, chunk_size):
+        for chunk_begin in range(0, self._length, chunk_size):
+            chunk_end = min(chunk_begin + chunk_size, self._length)
+            yield [tuple(mu) for mu in self._array[chunk_begin:chunk_end].tolist()]
+    
+    def _reallocate(self, capacity):
+        array_ = empty((capacity, self._array.shape[1]))
+        array_[:self._length] = self._array[:self._length]
+        self._array = array_
+    
+    def __array__(self, dtype=None, copy=None):
+        return asarray(self.array, dtype=dtype)
+    
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return _ParametersArray(self.array[key].copy())
+        else:
+            return tuple(self.array[key].tolist())
+    
+    def __setitem__(self, key, item):
+        if not self._array.flags.writeable: # e.g. memory mapped from file
+            self._reallocate(self._length)
+        self.array[key] = item
+    
+    def __iter__(self):
+        for chunk in self.chunks(_default_chunk_size):
+            yield from chunk
+    
+    def __len__(self):
+        return self._length
+    
+    def __str__(self):
+        return str(list(self))
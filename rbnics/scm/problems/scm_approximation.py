@@ -18,6 +18,7 @@
 
 import os
 import hashlib
+from numpy import array, zeros
 from rbnics.backends import export, import_, LinearProgramSolver
 from rbnics.backends.common.linear_program_solver import Error as LinearProgramSolverError, Matrix, Vector
 from rbnics.problems.base import ParametrizedProblem
@@ -45,6 +46,7 @@ class SCMApproximation(ParametrizedProblem):
         self.training_set = None # SCM algorithm needs the training set also in the online stage
         self.greedy_selected_parameters = GreedySelectedParametersList() # list storing the parameters selected during the training phase
         self.greedy_selected_parameters_complement = dict() # dict, over N, of list storing the complement of parameters selected during the training phase
+        self._greedy_selected_parameters_first_N = dict() # dict, over N, of list storing the first N parameters selected during the training phase
         self.UB_vectors = UpperBoundsList() # list of Q-dimensional vectors storing the infimizing elements at the greedily selected parameters
         self.N = 0
         self.M_e = kwargs["M_e"] # integer denoting the number of constraints based on the exact eigenvalues, or None
@@ -53,6 +55,11 @@ class SCMApproximation(ParametrizedProblem):
         # Storage for online computations
         self._alpha_LB = 0.
         self._alpha_UB = 0.
+        self._training_set_theta_a = None # dense array storing theta_a for all parameters in the training set
+        self._training_set_theta_a_training_set = None # training set used to compute theta_a, to detect changes
+        self._training_set_parameters_to_index = dict()
+        self._stability_factors_at_greedy_selected_parameters = dict()
+        self._linear_program_active_sets = dict() # dict, over N, of active sets of the last linear program, to be used for warm start
         
         # I/O
         self.folder["cache"] = os.path.join(self.folder_prefix, "reduced_cache")
@@ -129,6 +136,26 @@ class SCMApproximation(ParametrizedProblem):
         else:
             raise ValueError("Invalid stage in init().")
     
+    # Initialize data structures required to resume the offline phase from a checkpoint, discarding
+    # (both in memory and on disk) data stored after the checkpoint
+    def resume_offline(self, N):
+        self.truth_problem.init()
+        self.B_min.load(self.folder["reduced_operators"], "B_min")
+        self.B_max.load(self.folder["reduced_operators"], "B_max")
+        if N > 0:
+            self.greedy_selected_parameters.load(self.folder["reduced_operators"], "greedy_selected_parameters")
+            assert len(self.greedy_selected_parameters) >= N
+            self.greedy_selected_parameters = self.greedy_selected_parameters[:N]
+            self.greedy_selected_parameters.save(self.folder["reduced_operators"], "greedy_selected_parameters")
+            self.UB_vectors.load(self.folder["reduced_operators"], "UB_vectors")
+            assert len(self.UB_vectors) >= N
+            UB_vectors = UpperBoundsList()
+            UB_vectors.extend(self.UB_vectors[:N])
+            self.UB_vectors = UB_vectors
+            self.UB_vectors.save(self.folder["reduced_operators"], "UB_vectors")
+        self.N = N
+        self.exact_coercivity_constant_calculator.init()
+    
     def evaluate_stability_factor(self):
         return self.exact_coercivity_constant_calculator.solve()
     
@@ -160,67 +187,60 @@ class SCMApproximation(ParametrizedProblem):
         #       a^T * x >= b
         constraints_matrix = Matrix(M_e + M_p + 1, Q)
         constraints_vector = Vector(M_e + M_p + 1)
+        training_set_theta_a = self._get_training_set_theta_a()
         
         # 2a. Add constraints: a constraint is added for the closest samples to mu among the selected parameters
-        mu_bak = self.mu
         closest_selected_parameters = self._closest_selected_parameters(M_e, N, self.mu)
+        closest_selected_parameters_indices = [self._training_set_parameters_to_index[omega] for omega in closest_selected_parameters]
+        
+        # Assemble the LHS of the constraints
+        constraints_matrix[:M_e, :] = training_set_theta_a[closest_selected_parameters_indices]
+        
+        # Assemble the RHS of the constraints
         for (j, omega) in enumerate(closest_selected_parameters):
-            # Overwrite parameter values
-            self.set_mu(omega)
-            
-            # Compute theta
-            current_theta_a = self.truth_problem.compute_theta("a")
-            
-            # Assemble the LHS of the constraint
-            for q in range(Q):
-                constraints_matrix[j, q] = current_theta_a[q]
-            
-            # Assemble the RHS of the constraint
-            (constraints_vector[j], _) = self.evaluate_stability_factor() # note that computations for this call may be already cached
-        self.set_mu(mu_bak)
+            constraints_vector[j] = self._get_stability_factor_at_greedy_selected_parameter(omega)
         
         # 2b. Add constraints: also constrain the closest point in the complement of selected parameters,
         #                      with RHS depending on previously computed lower bounds
-        mu_bak = self.mu
         closest_selected_parameters_complement = self._closest_unselected_parameters(M_p, N, self.mu)
-        for (j, nu) in enumerate(closest_selected_parameters_complement):
-            # Overwrite parameter values
-            self.set_mu(nu)
-            
-            # Compute theta
-            current_theta_a = self.truth_problem.compute_theta("a")
-            
-            # Assemble the LHS of the constraint
-            for q in range(Q):
-                constraints_matrix[M_e + j, q] = current_theta_a[q]
+        closest_selected_parameters_complement_indices = [self._training_set_parameters_to_index[nu] for nu in closest_selected_parameters_complement]
+        
+        # Assemble the LHS of the constraints
+        constraints_matrix[M_e:M_e + M_p, :] = training_set_theta_a[closest_selected_parameters_complement_indices]
+        
+        # Assemble the RHS of the constraints
+        if N > 1:
+            mu_bak = self.mu
+            for (j, nu) in enumerate(closest_selected_parameters_complement):
+                # Overwrite parameter values
+                self.set_mu(nu)
                 
-            # Assemble the RHS of the constraint
-            if N > 1:
+                # Compute lower bound
                 constraints_vector[M_e + j] = self.get_stability_factor_lower_bound(N - 1) # note that computations for this call may be already cached
-            else:
-                constraints_vector[M_e + j] = 0.
-        self.set_mu(mu_bak)
+            self.set_mu(mu_bak)
+        else:
+            constraints_vector[M_e:M_e + M_p] = 0.
         
         # 2c. Add constraints: also constrain the coercivity constant for mu to be positive
         # Compute theta
-        current_theta_a = self.truth_problem.compute_theta("a")
+        current_theta_a = self._compute_theta_a()
         
         # Assemble the LHS of the constraint
-        for q in range(Q):
-            constraints_matrix[M_e + M_p, q] = current_theta_a[q]
+        constraints_matrix[M_e + M_p, :] = current_theta_a
             
         # Assemble the RHS of the constraint
         constraints_vector[M_e + M_p] = 0.
         
         # 3. Add cost function coefficients
         cost = Vector(Q)
-        for q in range(Q):
-            cost[q] = current_theta_a[q]
+        cost[:] = current_theta_a
         
-        # 4. Solve the linear programming problem
+        # 4. Solve the linear programming problem, warm starting from the solution of the last one with the same N
         linear_program = LinearProgramSolver(cost, constraints_matrix, constraints_vector, bounds)
+        linear_program.set_warm_start(self._linear_program_active_sets.get(N))
         try:
             alpha_LB = linear_program.solve()
+            self._linear_program_active_sets[N] = linear_program.active_set
         except LinearProgramSolverError:
             print("SCM warning at mu = " + str(self.mu) + ": error occured while solving linear program.")
             print("Please consider switching to a different solver. A truth eigensolve will be performed.")
@@ -229,6 +249,17 @@ class SCMApproximation(ParametrizedProblem):
         
         self._alpha_LB = alpha_LB
         
+    # Get a lower bound for alpha for each parameter in mus. Since the linear programs for consecutive parameters
+    # are warm started from each other, parameters should preferably be sorted so that consecutive ones are close
+    def get_stability_factor_lower_bound_batch(self, mus, N=None):
+        mu_bak = self.mu
+        alpha_LB = list()
+        for mu in mus:
+            self.set_mu(mu)
+            alpha_LB.append(self.get_stability_factor_lower_bound(N))
+        self.set_mu(mu_bak)
+        return alpha_LB
+    
     # Get an upper bound for alpha
     def get_stability_factor_upper_bound(self, N=None):
         if N is None:
@@ -245,7 +276,7 @@ class SCMApproximation(ParametrizedProblem):
         UB_vectors = self.UB_vectors
         
         alpha_UB = None
-        current_theta_a = self.truth_problem.compute_theta("a")
+        current_theta_a = self._compute_theta_a()
         
         for j in range(N):
             UB_vector = UB_vectors[j]
@@ -261,14 +292,68 @@ class SCMApproximation(ParametrizedProblem):
         assert alpha_UB is not None
         self._alpha_UB = alpha_UB
                     
+    # Get an upper bound for alpha for each parameter in mus
+    def get_stability_factor_upper_bound_batch(self, mus, N=None):
+        mu_bak = self.mu
+        alpha_UB = list()
+        for mu in mus:
+            self.set_mu(mu)
+            alpha_UB.append(self.get_stability_factor_upper_bound(N))
+        self.set_mu(mu_bak)
+        return alpha_UB
+    
+    # Compute theta_a for all parameters in the training set, so that constraints can be assembled
+    # without changing the current parameter
+    def _get_training_set_theta_a(self):
+        if (
+            self._training_set_theta_a is None
+                or
+            self._training_set_theta_a_training_set is not self.training_set
+                or
+            len(self._training_set_theta_a) != len(self.training_set)
+        ):
+            Q = self.truth_problem.Q["a"]
+            training_set_theta_a = zeros((len(self.training_set), Q))
+            mu_bak = self.mu
+            for (mu_index, mu) in enumerate(self.training_set):
+                self.set_mu(mu)
+                training_set_theta_a[mu_index] = self.truth_problem.compute_theta("a")
+            self.set_mu(mu_bak)
+            self._training_set_theta_a = training_set_theta_a
+            self._training_set_theta_a_training_set = self.training_set
+            self._training_set_parameters_to_index = dict((mu, mu_index) for (mu_index, mu) in enumerate(self.training_set))
+        return self._training_set_theta_a
+    
+    # Get theta_a for the current parameter, from the precomputed storage if the parameter belongs to the training set
+    def _compute_theta_a(self):
+        training_set_theta_a = self._get_training_set_theta_a()
+        mu_index = self._training_set_parameters_to_index.get(self.mu)
+        if mu_index is not None:
+            return training_set_theta_a[mu_index]
+        else:
+            return array(self.truth_problem.compute_theta("a"))
+    
+    def _get_stability_factor_at_greedy_selected_parameter(self, omega):
+        if omega not in self._stability_factors_at_greedy_selected_parameters:
+            mu_bak = self.mu
+            self.set_mu(omega)
+            (self._stability_factors_at_greedy_selected_parameters[omega], _) = self.evaluate_stability_factor() # note that computations for this call may be already cached
+            self.set_mu(mu_bak)
+        return self._stability_factors_at_greedy_selected_parameters[omega]
+    
     def _cache_key(self, N):
         return (self.mu, N)
         
     def _cache_file(self, N):
         return hashlib.sha1(str(self._cache_key(N)).encode("utf-8")).hexdigest()
         
+    # Since subsets are stored for each N, their spatial indices are not rebuilt at each call
     def _closest_selected_parameters(self, M, N, mu):
-        return self.greedy_selected_parameters[:N].closest(M, mu)
+        if N not in self._greedy_selected_parameters_first_N:
+            greedy_selected_parameters_first_N = self.greedy_selected_parameters[:N]
+            greedy_selected_parameters_first_N.parameter_space_subset.set_distance_scaling(self.training_set.distance_scaling)
+            self._greedy_selected_parameters_first_N[N] = greedy_selected_parameters_first_N
+        return self._greedy_selected_parameters_first_N[N].closest(M, mu)
         
     def _closest_unselected_parameters(self, M, N, mu):
         if N not in self.greedy_selected_parameters_complement:
@@ -22,7 +22,8 @@ from rbnics.backends import transpose
 from rbnics.backends.online import OnlineVector
 from rbnics.reduction_methods.base import ReductionMethod
 from rbnics.scm.problems import ParametrizedCoercivityConstantEigenProblem
-from rbnics.utils.io import ErrorAnalysisTable, Folders, GreedyErrorEstimatorsList, SpeedupAnalysisTable, TextBox, TextLine, Timer
+from rbnics.utils.io import ErrorAnalysisTable, Folders, GreedyErrorEstimatorsList, SpeedupAnalysisTable, TextBox, TextIO as CheckpointIO, TextLine, Timer
+from rbnics.utils.mpi import io_mpi_comm, is_io_process
 
 # Empirical interpolation method for the interpolation of parametrized functions
 class SCMApproximationReductionMethod(ReductionMethod):
@@ -39,12 +40,21 @@ class SCMApproximationReductionMethod(ReductionMethod):
         self.folder["post_processing"] = os.path.join(self.folder_prefix, "post_processing")
         self.greedy_selected_parameters = SCM_approximation.greedy_selected_parameters
         self.greedy_error_estimators = GreedyErrorEstimatorsList()
+        # Greedy search: if not None, lower and upper bounds are evaluated for batches of (at most) greedy_batch_size parameters at once
+        self.greedy_batch_size = None
+        # Communicator among processes with the same rank in each group, if groups of processes have been set
+        self._training_set_mpi_comm = None
         
         # Get data that were temporarily store in the SCM_approximation
         self.bounding_box_minimum_eigensolver_parameters = self.SCM_approximation._input_storage_for_SCM_reduction["bounding_box_minimum_eigensolver_parameters"]
         self.bounding_box_maximum_eigensolver_parameters = self.SCM_approximation._input_storage_for_SCM_reduction["bounding_box_maximum_eigensolver_parameters"]
         del self.SCM_approximation._input_storage_for_SCM_reduction
 
+    # Set the batch size for the greedy search, or None to evaluate bounds one parameter at a time
+    def set_greedy_batch_size(self, batch_size):
+        assert batch_size is None or batch_size > 0
+        self.greedy_batch_size = batch_size
+    
     # OFFLINE: set the elements in the training set.
     def initialize_training_set(self, ntrain, enable_import=True, sampling=None, **kwargs):
         assert enable_import
@@ -55,11 +65,15 @@ class SCMApproximationReductionMethod(ReductionMethod):
     def initialize_testing_set(self, ntest, enable_import=False, sampling=None, **kwargs):
         return ReductionMethod.initialize_testing_set(self, self.SCM_approximation.mu_range, ntest, enable_import, sampling, **kwargs)
         
-    # Perform the offline phase of SCM
-    def offline(self):
+    # Perform the offline phase of SCM. If resume is True, an interrupted offline phase is resumed from its last checkpoint
+    def offline(self, resume=False):
         need_to_do_offline_stage = self._init_offline()
         if need_to_do_offline_stage:
             self._offline()
+        elif resume:
+            checkpoint = self._load_offline_checkpoint()
+            if checkpoint is not None and not checkpoint["completed"]:
+                self._resume_offline(checkpoint)
         self._finalize_offline()
         return self.SCM_approximation
     
@@ -94,19 +108,54 @@ class SCMApproximationReductionMethod(ReductionMethod):
         self.SCM_approximation.set_mu(self.training_set[0])
         relative_error_estimator_max = 2.*self.tol
         
+        self._save_offline_checkpoint(completed=False)
+        self._offline_iterations(relative_error_estimator_max)
+        
+        print(TextBox("SCM offline phase ends", fill="="))
+        print("")
+    
+    def _resume_offline(self, checkpoint):
+        print(TextBox("SCM offline phase resumes", fill="="))
+        print("")
+        
+        # Restore offline data up to the checkpoint, discarding data stored afterwards
+        N = checkpoint["N"]
+        self.SCM_approximation.resume_offline(N)
+        self.greedy_selected_parameters = self.SCM_approximation.greedy_selected_parameters
+        if N > 0:
+            self.greedy_error_estimators.load(self.folder["post_processing"], "error_estimator_max")
+            greedy_error_estimators = GreedyErrorEstimatorsList()
+            greedy_error_estimators.extend(self.greedy_error_estimators[:N])
+            self.greedy_error_estimators = greedy_error_estimators
+            self.greedy_error_estimators.save(self.folder["post_processing"], "error_estimator_max")
+            relative_error_estimator_max = self.greedy_error_estimators[N - 1]/self.greedy_error_estimators[0]
+        else:
+            relative_error_estimator_max = 2.*self.tol
+        
+        # Restore the parameter selected by the last greedy iteration
+        self.SCM_approximation.set_mu(checkpoint["mu"])
+        print("resuming from SCM N =", N)
+        
+        print("")
+        
+        self._offline_iterations(relative_error_estimator_max)
+        
+        print(TextBox("SCM offline phase ends", fill="="))
+        print("")
+    
+    def _offline_iterations(self, relative_error_estimator_max):
         while self.SCM_approximation.N < self.Nmax and relative_error_estimator_max >= self.tol:
             print(TextLine("SCM N = " + str(self.SCM_approximation.N), fill="~"))
             
             # Store the greedy parameter
             self.store_greedy_selected_parameters()
             
-            # Evaluate the coercivity constant
+            # Evaluate the coercivity constant (only by the first group, if groups of processes have been set)
             print("evaluate the stability factor for mu =", self.SCM_approximation.mu)
-            (alpha, eigenvector) = self.SCM_approximation.evaluate_stability_factor()
+            (alpha, UB_vector) = self.evaluate_stability_factor_and_UB_vector()
             print("stability factor =", alpha)
             
             # Update data structures related to upper bound vectors
-            UB_vector = self.compute_UB_vector(eigenvector)
             self.update_UB_vectors(UB_vector)
             
             # Prepare for next iteration
@@ -117,8 +166,25 @@ class SCMApproximationReductionMethod(ReductionMethod):
             
             print("")
             
-        print(TextBox("SCM offline phase ends", fill="="))
-        print("")
+            self._save_offline_checkpoint(completed=False)
+        
+        self._save_offline_checkpoint(completed=True)
+    
+    def _save_offline_checkpoint(self, completed):
+        # All offline data of the current iteration have already been stored. The parameter selected by the
+        # last greedy search is stored as well, since it has not been added to the greedy selected parameters yet
+        checkpoint = {
+            "N": self.SCM_approximation.N,
+            "mu": self.SCM_approximation.mu,
+            "completed": completed
+        }
+        CheckpointIO.save_file(checkpoint, self.folder["post_processing"], "offline_checkpoint")
+    
+    def _load_offline_checkpoint(self):
+        if CheckpointIO.exists_file(self.folder["post_processing"], "offline_checkpoint"):
+            return CheckpointIO.load_file(self.folder["post_processing"], "offline_checkpoint")
+        else:
+            return None
         
     # Finalize data structures required after the offline phase
     def _finalize_offline(self):
@@ -129,17 +195,24 @@ class SCMApproximationReductionMethod(ReductionMethod):
         # Resize the bounding box storage
         Q = self.SCM_approximation.truth_problem.Q["a"]
         
+        # Initialize the minimum and maximum eigenvalue calculators
+        eigenvalue_calculators = dict()
         for q in range(Q):
-            # Compute the minimum eigenvalue
-            minimum_eigenvalue_calculator = ParametrizedCoercivityConstantEigenProblem(self.SCM_approximation.truth_problem, ("a", q), False, "smallest", self.bounding_box_minimum_eigensolver_parameters, self.folder_prefix)
-            minimum_eigenvalue_calculator.init()
-            (self.SCM_approximation.B_min[q], _) = minimum_eigenvalue_calculator.solve()
-            print("B_min[" + str(q) + "] = " + str(self.SCM_approximation.B_min[q]))
+            eigenvalue_calculators[q, "smallest"] = ParametrizedCoercivityConstantEigenProblem(self.SCM_approximation.truth_problem, ("a", q), False, "smallest", self.bounding_box_minimum_eigensolver_parameters, self.folder_prefix)
+            eigenvalue_calculators[q, "largest"] = ParametrizedCoercivityConstantEigenProblem(self.SCM_approximation.truth_problem, ("a", q), False, "largest", self.bounding_box_maximum_eigensolver_parameters, self.folder_prefix)
+        for eigenvalue_calculator in eigenvalue_calculators.values():
+            eigenvalue_calculator.init()
             
-            # Compute the maximum eigenvalue
-            maximum_eigenvalue_calculator = ParametrizedCoercivityConstantEigenProblem(self.SCM_approximation.truth_problem, ("a", q), False, "largest", self.bounding_box_maximum_eigensolver_parameters, self.folder_prefix)
-            maximum_eigenvalue_calculator.init()
-            (self.SCM_approximation.B_max[q], _) = maximum_eigenvalue_calculator.solve()
+        # Compute the minimum and maximum eigenvalues. Since eigenproblems are independent, they are
+        # split among groups of processes, if any
+        def compute_eigenvalue(key):
+            (eigenvalue, _) = eigenvalue_calculators[key].solve()
+            return eigenvalue
+        eigenvalues = self._map_by_parameter_groups(compute_eigenvalue, list(eigenvalue_calculators.keys()))
+        for q in range(Q):
+            self.SCM_approximation.B_min[q] = eigenvalues[q, "smallest"]
+            print("B_min[" + str(q) + "] = " + str(self.SCM_approximation.B_min[q]))
+            self.SCM_approximation.B_max[q] = eigenvalues[q, "largest"]
             print("B_max[" + str(q) + "] = " + str(self.SCM_approximation.B_max[q]))
         
         # Save to file
@@ -156,6 +229,23 @@ class SCMApproximationReductionMethod(ReductionMethod):
         # Save to file
         self.SCM_approximation.greedy_selected_parameters.save(self.SCM_approximation.folder["reduced_operators"], "greedy_selected_parameters")
         
+    # Evaluate the coercivity constant for the current parameter, and the corresponding upper bound vector.
+    # If groups of processes have been set, computations are carried out by the first group, and then shared
+    def evaluate_stability_factor_and_UB_vector(self):
+        mu = self.SCM_approximation.mu
+        Q = self.SCM_approximation.truth_problem.Q["a"]
+        def compute_stability_factor_and_UB_vector(mu):
+            (alpha, eigenvector) = self.SCM_approximation.evaluate_stability_factor()
+            UB_vector = self.compute_UB_vector(eigenvector)
+            return (alpha, [UB_vector[q] for q in range(Q)])
+        (alpha, UB_vector_as_list) = self._map_by_parameter_groups(compute_stability_factor_and_UB_vector, [mu])[mu]
+        UB_vector = OnlineVector(Q)
+        for q in range(Q):
+            UB_vector[q] = UB_vector_as_list[q]
+        # Store the coercivity constant, so that lower bounds do not need to evaluate it again
+        self.SCM_approximation._stability_factors_at_greedy_selected_parameters[mu] = alpha
+        return (alpha, UB_vector)
+    
     # Compute the ratio between a_q(u,u) and s(u,u), for all q in vec
     def compute_UB_vector(self, u):
         Q = self.SCM_approximation.truth_problem.Q["a"]
@@ -173,11 +263,7 @@ class SCMApproximationReductionMethod(ReductionMethod):
         
     # Choose the next parameter in the offline stage in a greedy fashion
     def greedy(self):
-        def solve_and_estimate_error(mu):
-            self.SCM_approximation.set_mu(mu)
-            
-            LB = self.SCM_approximation.get_stability_factor_lower_bound()
-            UB = self.SCM_approximation.get_stability_factor_upper_bound()
+        def estimate_error(mu, LB, UB):
             error_estimator = (UB - LB)/UB
             
             if LB/UB < 0 and not isclose(LB/UB, 0.): # if LB/UB << 0
@@ -187,12 +273,43 @@ class SCMApproximationReductionMethod(ReductionMethod):
                 
             return error_estimator
             
-        (error_estimator_max, error_estimator_argmax) = self.training_set.max(solve_and_estimate_error)
+        def solve_and_estimate_error(mu):
+            self.SCM_approximation.set_mu(mu)
+            
+            LB = self.SCM_approximation.get_stability_factor_lower_bound()
+            UB = self.SCM_approximation.get_stability_factor_upper_bound()
+            return estimate_error(mu, LB, UB)
+        
+        def solve_and_estimate_error_batch(mus):
+            LBs = self.SCM_approximation.get_stability_factor_lower_bound_batch(mus)
+            UBs = self.SCM_approximation.get_stability_factor_upper_bound_batch(mus)
+            return [estimate_error(mu, LB, UB) for (mu, LB, UB) in zip(mus, LBs, UBs)]
+        
+        if self.greedy_batch_size is None:
+            (error_estimator_max, error_estimator_argmax) = self._training_set_max(solve_and_estimate_error)
+        else:
+            (error_estimator_max, error_estimator_argmax) = self._training_set_max(solve_and_estimate_error_batch, self.greedy_batch_size)
         self.SCM_approximation.set_mu(self.training_set[error_estimator_argmax])
         self.greedy_error_estimators.append(error_estimator_max)
         self.greedy_error_estimators.save(self.folder["post_processing"], "error_estimator_max")
         return (error_estimator_max, error_estimator_max/self.greedy_error_estimators[0])
         
+    # Maximize generator over the training set. If groups of processes have been set, the training set is
+    # distributed among groups, rather than among processes, so that the exact eigensolves which may be
+    # required if a linear program fails only involve processes of the same group
+    def _training_set_max(self, generator, batch_size=None):
+        if self._parameter_groups is None:
+            return self.training_set.max(generator, batch_size=batch_size)
+        else:
+            (group_mpi_comm, _, _) = self._parameter_groups
+            if self._training_set_mpi_comm is None:
+                self._training_set_mpi_comm = is_io_process.mpi_comm.Split(group_mpi_comm.rank, is_io_process.mpi_comm.rank)
+            training_set = self.training_set[:]
+            training_set.mpi_comm = self._training_set_mpi_comm
+            training_set.distributed_max = True
+            with io_mpi_comm(group_mpi_comm):
+                return training_set.max(generator, batch_size=batch_size)
+    
     # Initialize data structures required for the error analysis phase
     def _init_error_analysis(self, **kwargs):
         # Initialize the exact coercivity constant object
@@ -51,6 +51,12 @@ def SCMDecoratedReductionMethod(DifferentialProblemReductionMethod_DerivedClass)
             assert isinstance(tol_SCM, Number)
             self.SCM_reduction.set_tolerance(tol_SCM) # kwargs are not needed
             
+        # OFFLINE: split the computation of snapshots among groups of processes
+        def set_parameter_groups(self, group_mpi_comm):
+            DifferentialProblemReductionMethod_DerivedClass.set_parameter_groups(self, group_mpi_comm)
+            # Share the same groups with SCM reduction
+            self.SCM_reduction._parameter_groups = self._parameter_groups
+        
         # OFFLINE: set the elements in the training set.
         def initialize_training_set(self, ntrain, enable_import=True, sampling=None, **kwargs):
             import_successful = DifferentialProblemReductionMethod_DerivedClass.initialize_training_set(self, ntrain, enable_import, sampling, **kwargs)
@@ -76,13 +82,13 @@ def SCMDecoratedReductionMethod(DifferentialProblemReductionMethod_DerivedClass)
             return import_successful and import_successful_SCM
             
         # Perform the offline phase of the reduced order model
-        def offline(self):
+        def offline(self, **kwargs):
             # Perform first the SCM offline phase, ...
             bak_first_mu = self.truth_problem.mu
-            self.SCM_reduction.offline()
+            self.SCM_reduction.offline(**kwargs)
             # ..., and then call the parent method.
             self.truth_problem.set_mu(bak_first_mu)
-            return DifferentialProblemReductionMethod_DerivedClass.offline(self)
+            return DifferentialProblemReductionMethod_DerivedClass.offline(self, **kwargs)
             
         # Compute the error of the reduced order approximation with respect to the full order one
         # over the testing set
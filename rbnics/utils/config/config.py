@@ -34,7 +34,14 @@ class Config(object):
         "EIM": {
             "cache": {"disk", "RAM"},
             "disk cache limit": "unlimited",
-            "RAM cache limit": "1"
+            "interpolation locations": "greedy",
+            "RAM cache limit": "1",
+            "snapshots storage": "RAM"
+        },
+        "POD": {
+            "eigensolver": "dense",
+            "method": "automatic",
+            "snapshots storage": "RAM"
         },
         "problems": {
             "cache": {"disk", "RAM"},
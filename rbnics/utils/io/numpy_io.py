@@ -17,6 +17,7 @@
 #
 
 import os
+from uuid import uuid4
 import numpy
 from rbnics.utils.mpi import is_io_process
 
@@ -27,15 +28,21 @@ class NumpyIO(object):
         if not filename.endswith(".npy"):
             filename = filename + ".npy"
         if is_io_process():
-            numpy.save(os.path.join(str(directory), filename), content)
+            # Write to a temporary file first, so that an interrupted save never leaves a truncated file behind.
+            # The name of the temporary file is unique, because several processes (e.g. the roots of different
+            # groups of processes) may save the same file at the same time
+            temporary_filename = os.path.join(str(directory), filename + "." + uuid4().hex + ".tmp")
+            with open(temporary_filename, "wb") as outfile:
+                numpy.save(outfile, content)
+            os.replace(temporary_filename, os.path.join(str(directory), filename))
         is_io_process.mpi_comm.barrier()
     
-    # Load a variable from file
+    # Load a variable from file. If mmap_mode is provided, the file is memory mapped rather than read
     @staticmethod
-    def load_file(directory, filename):
+    def load_file(directory, filename, mmap_mode=None):
         if not filename.endswith(".npy"):
             filename = filename + ".npy"
-        return numpy.load(os.path.join(str(directory), filename))
+        return numpy.load(os.path.join(str(directory), filename), mmap_mode=mmap_mode)
             
     # Check if the file exists
     @staticmethod
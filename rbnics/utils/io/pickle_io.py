@@ -18,6 +18,7 @@
 
 import pickle
 import os
+from uuid import uuid4
 from rbnics.utils.mpi import is_io_process
 
 class PickleIO(object):
@@ -27,8 +28,13 @@ class PickleIO(object):
         if not filename.endswith(".pkl"):
             filename = filename + ".pkl"
         if is_io_process():
-            with open(os.path.join(str(directory), filename), "wb") as outfile:
+            # Write to a temporary file first, so that an interrupted save never leaves a truncated file behind.
+            # The name of the temporary file is unique, because several processes (e.g. the roots of different
+            # groups of processes) may save the same file at the same time
+            temporary_filename = os.path.join(str(directory), filename + "." + uuid4().hex + ".tmp")
+            with open(temporary_filename, "wb") as outfile:
                 pickle.dump(content, outfile, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_filename, os.path.join(str(directory), filename))
         is_io_process.mpi_comm.barrier()
         
     # Load a variable from file
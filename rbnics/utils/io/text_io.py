@@ -17,6 +17,7 @@
 #
 
 import os
+from uuid import uuid4
 from rbnics.utils.mpi import is_io_process
 
 class TextIO(object):
@@ -26,8 +27,13 @@ class TextIO(object):
         if os.path.splitext(filename)[1] == "":
             filename = filename + ".txt"
         if is_io_process():
-            with open(os.path.join(str(directory), filename), "w") as outfile:
+            # Write to a temporary file first, so that an interrupted save never leaves a truncated file behind.
+            # The name of the temporary file is unique, because several processes (e.g. the roots of different
+            # groups of processes) may save the same file at the same time
+            temporary_filename = os.path.join(str(directory), filename + "." + uuid4().hex + ".tmp")
+            with open(temporary_filename, "w") as outfile:
                 outfile.write(repr(content))
+            os.replace(temporary_filename, os.path.join(str(directory), filename))
         is_io_process.mpi_comm.barrier()
                 
     # Load a variable from file
@@ -18,13 +18,13 @@
 
 
 from logging import log, CRITICAL, ERROR, WARNING, INFO, DEBUG
-from rbnics.utils.mpi.mpi import is_io_process, parallel_max
+from rbnics.utils.mpi.mpi import io_mpi_comm, is_io_process, parallel_max, split_mpi_comm
 from rbnics.utils.mpi.print import print
 PROGRESS = 16 # compatability with DOLFIN
 TRACE = 13 # compatability with DOLFIN
 
 __all__ = [
     'log', 'CRITICAL', 'ERROR', 'WARNING', 'INFO', 'PROGRESS', 'TRACE', 'DEBUG',
-    'is_io_process', 'parallel_max',
+    'io_mpi_comm', 'is_io_process', 'parallel_max', 'split_mpi_comm',
     'print'
 ]
@@ -16,6 +16,7 @@
 # along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
 #
 
+from contextlib import contextmanager
 from mpi4py import MPI
 from mpi4py.MPI import MAX
 
@@ -33,6 +34,28 @@ def is_io_process(mpi_comm=None):
 is_io_process.root = 0
 is_io_process.mpi_comm = _default_io_mpi_comm
 
+# Temporarily restrict I/O operations to a sub-communicator, e.g. while groups of processes
+# are working independently of each other
+@contextmanager
+def io_mpi_comm(mpi_comm):
+    global _default_io_mpi_comm
+    backup_io_mpi_comm = _default_io_mpi_comm
+    _default_io_mpi_comm = mpi_comm
+    is_io_process.mpi_comm = mpi_comm
+    try:
+        yield
+    finally:
+        _default_io_mpi_comm = backup_io_mpi_comm
+        is_io_process.mpi_comm = backup_io_mpi_comm
+        
+# Split the default communicator into n_groups groups of consecutive processes of the same size,
+# and return the communicator of the group the current process belongs to
+def split_mpi_comm(n_groups):
+    assert n_groups > 0
+    assert _default_io_mpi_comm.size % n_groups == 0
+    group_size = _default_io_mpi_comm.size // n_groups
+    return _default_io_mpi_comm.Split(_default_io_mpi_comm.rank // group_size, _default_io_mpi_comm.rank)
+
 # Get max in parallel
 def parallel_max(mpi_comm, local_value_max, local_args=None, postprocessor=None):
     if postprocessor is None:
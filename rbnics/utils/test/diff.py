@@ -18,7 +18,7 @@
 
 import os
 from numbers import Number
-from numpy import isclose
+from numpy import isclose, load as load_npy
 from rbnics.utils.decorators import dict_of, list_of, overload, tuple_of
 from rbnics.utils.io import CSVIO, TextIO
 
@@ -30,6 +30,8 @@ def diff(reference_file, current_file):
         return _diff_txt(reference_file, current_file)
     elif reference_ext == ".csv":
         return _diff_csv(reference_file, current_file)
+    elif reference_ext == ".npy":
+        return _diff_npy(reference_file, current_file)
     else:
         raise ValueError("Invalid argument to diff")
     
@@ -43,6 +45,11 @@ def _diff_csv(reference_file, current_file):
     current_lines = CSVIO.load_file("", current_file)
     return _diff_content(reference_lines, current_lines, "")
     
+def _diff_npy(reference_file, current_file):
+    reference_content = load_npy(reference_file).tolist()
+    current_content = load_npy(current_file).tolist()
+    return _diff_content(reference_content, current_content, "")
+    
 @overload
 def _diff_content(reference_items: (list_of(object), tuple_of(object)), current_items: (list_of(object), tuple_of(object)), tab: str):
     if len(reference_items) != len(current_items):
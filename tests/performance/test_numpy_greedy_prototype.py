@@ -18,7 +18,7 @@
 
 import builtins
 import pytest
-from numpy import einsum, isclose, zeros as legacy_tensor
+from numpy import array, einsum, isclose, shares_memory, zeros as legacy_tensor
 from rbnics.backends import product as factory_product, sum as factory_sum, transpose as factory_transpose
 from rbnics.backends.online import OnlineAffineExpansionStorage, online_product, online_sum, online_transpose
 from rbnics.backends.online.numpy import product as numpy_product, sum as numpy_sum, transpose as numpy_transpose
@@ -98,6 +98,28 @@ class Data(object):
             )
         return result_backend
         
+    def evaluate_stacked(self, theta_a, theta_f, aa_product, af_product, ff_product, aa_product_legacy, af_product_legacy, ff_product_legacy, u, v):
+        # Contract the stacked content of the affine expansion storages for all training parameters at once
+        aa_product_stacked = aa_product[:self.N, :self.N]._stack_content()
+        af_product_stacked = af_product[:self.N]._stack_content()
+        ff_product_stacked = ff_product._stack_content()
+        theta_a = array(theta_a)
+        theta_f = array(theta_f)
+        u = array([u_t.content for u_t in u])
+        v = array([v_t.content for v_t in v])
+        result_stacked = (
+            einsum("tn,ti,ijnm,tj,tm->t", u, theta_a, aa_product_stacked, theta_a, v, optimize=True) +
+            einsum("ti,ijn,tj,tn->t", theta_a, af_product_stacked, theta_f, u, optimize=True) +
+            einsum("ti,ij,tj->t", theta_f, ff_product_stacked, theta_f, optimize=True)
+        )
+        return list(result_stacked)
+    
+    def assert_stacked(self, theta_a, theta_f, aa_product, af_product, ff_product, aa_product_legacy, af_product_legacy, ff_product_legacy, u, v, result_stacked):
+        # Slicing the leading rows and columns must not copy the stacked content
+        assert shares_memory(aa_product[:self.N, :self.N]._stack_content(), aa_product._stack_content())
+        assert shares_memory(af_product[:self.N]._stack_content(), af_product._stack_content())
+        self.assert_backend(theta_a, theta_f, aa_product, af_product, ff_product, aa_product_legacy, af_product_legacy, ff_product_legacy, u, v, result_stacked)
+    
     def assert_backend(self, theta_a, theta_f, aa_product, af_product, ff_product, aa_product_legacy, af_product_legacy, ff_product_legacy, u, v, result_backend):
         assert len(result_backend) is self.Ntrain
         result_builtin = self.evaluate_builtin(theta_a, theta_f, aa_product, af_product, ff_product, aa_product_legacy, af_product_legacy, ff_product_legacy, u, v)
@@ -108,13 +130,16 @@ class Data(object):
 @pytest.mark.parametrize("N", [2**(i + 3) for i in range(1, 3)])
 @pytest.mark.parametrize("Qa", [2 + 4*j for j in range(1, 3)])
 @pytest.mark.parametrize("Qf", [2 + 4*k for k in range(1, 3)])
-@pytest.mark.parametrize("test_type", ["builtin"] + list(all_transpose.keys()))
+@pytest.mark.parametrize("test_type", ["builtin", "stacked"] + list(all_transpose.keys()))
 def test_numpy_greedy_prototype(N, Qa, Qf, test_type, benchmark):
     data = Data(N, Qa, Qf)
     print("N = " + str(N) + ", Qa = " + str(Qa) + ", Qf = " + str(Qf))
     if test_type == "builtin":
         print("Testing", test_type)
         benchmark(data.evaluate_builtin, setup=data.generate_random)
+    elif test_type == "stacked":
+        print("Testing", test_type, "storage")
+        benchmark(data.evaluate_stacked, setup=data.generate_random, teardown=data.assert_stacked)
     else:
         print("Testing", test_type, "backend")
         global product, sum, transpose
@@ -0,0 +1,86 @@
+# Copyright (C) 2015-2018 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+import os
+import pytest
+from numpy import allclose
+from dolfin import pi, UnitSquareMesh
+from rbnics import EquispacedDistribution, ParametrizedExpression
+from rbnics.backends import ParametrizedExpressionFactory
+from rbnics.backends.dolfin import FunctionsList
+from rbnics.backends.dolfin.wrapping import FunctionSpace
+from rbnics.eim.problems.eim_approximation import EIMApproximation
+from rbnics.eim.reduction_methods.eim_approximation_reduction_method import EIMApproximationReductionMethod
+from rbnics.problems.base import ParametrizedProblem
+from rbnics.utils.config import config
+
+# Mesh
+@pytest.fixture(scope="module")
+def mesh():
+    return UnitSquareMesh(10, 10)
+    
+# Set the EIM snapshots storage in the configuration, restoring the original one at the end of the test
+@pytest.fixture
+def set_EIM_snapshots_storage():
+    original_snapshots_storage = config.get("EIM", "snapshots storage")
+    def _set_EIM_snapshots_storage(snapshots_storage):
+        config.set("EIM", "snapshots storage", snapshots_storage)
+    yield _set_EIM_snapshots_storage
+    config.set("EIM", "snapshots storage", original_snapshots_storage)
+    
+class MockProblem(ParametrizedProblem):
+    def __init__(self, V, **kwargs):
+        ParametrizedProblem.__init__(self, "")
+        self.V = V
+    
+    def name(self):
+        return "MockProblem"
+        
+class ParametrizedFunctionApproximation(EIMApproximation):
+    def __init__(self, V, folder_prefix):
+        self.V = V
+        # Parametrized function to be interpolated
+        mock_problem = MockProblem(V)
+        f = ParametrizedExpression(mock_problem, "(1-x[0])*cos(3*pi*mu[0]*(1+x[0]))*exp(-mu[0]*(1+x[1]))", mu=(1., ), element=V.ufl_element())
+        # Call Parent constructor
+        EIMApproximation.__init__(self, mock_problem, ParametrizedExpressionFactory(f), folder_prefix, "Greedy")
+        
+# Run the offline phase of EIM
+def offline(V, folder_prefix):
+    parametrized_function_approximation = ParametrizedFunctionApproximation(V, folder_prefix)
+    parametrized_function_approximation.set_mu_range([(1., pi), ])
+    parametrized_function_reduction_method = EIMApproximationReductionMethod(parametrized_function_approximation)
+    parametrized_function_reduction_method.set_Nmax(15)
+    parametrized_function_reduction_method.set_tolerance(0.)
+    parametrized_function_reduction_method.initialize_training_set(51, sampling=EquispacedDistribution())
+    parametrized_function_reduction_method.offline()
+    return parametrized_function_reduction_method
+    
+# Test the batched EIM greedy search over all training snapshots against the loop over the training set
+@pytest.mark.parametrize("snapshots_storage", ["RAM", "disk"])
+def test_eim_greedy_batch(mesh, tmpdir, monkeypatch, set_EIM_snapshots_storage, snapshots_storage):
+    V = FunctionSpace(mesh, "Lagrange", 1)
+    set_EIM_snapshots_storage(snapshots_storage)
+    batch_reduction_method = offline(V, os.path.join(str(tmpdir), "batch"))
+    assert hasattr(batch_reduction_method.snapshots_container, "max_abs_of_residual")
+    # Disable the batched search, so that the greedy falls back to the loop over the training set
+    monkeypatch.delattr(FunctionsList, "max_abs_of_residual")
+    loop_reduction_method = offline(V, os.path.join(str(tmpdir), "loop"))
+    assert not hasattr(loop_reduction_method.snapshots_container, "max_abs_of_residual")
+    
+    assert list(batch_reduction_method.greedy_selected_parameters) == list(loop_reduction_method.greedy_selected_parameters)
+    assert allclose(list(batch_reduction_method.greedy_errors), list(loop_reduction_method.greedy_errors))
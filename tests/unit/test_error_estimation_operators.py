@@ -0,0 +1,206 @@
+# Copyright (C) 2015-2018 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import pytest
+from numpy import isclose, random
+from dolfin import dx, Function, TestFunction, TrialFunction, UnitSquareMesh
+from rbnics.backends import AffineExpansionStorage, BasisFunctionsMatrix, FunctionsList
+from rbnics.backends.dolfin.wrapping import FunctionSpace
+from rbnics.backends.online import OnlineNonAffineExpansionStorage
+from rbnics.problems.base import ParametrizedReducedDifferentialProblem, RBReducedProblem
+from rbnics.utils.io import Folders
+
+# Mesh
+@pytest.fixture(scope="module")
+def mesh():
+    return UnitSquareMesh(10, 10)
+    
+# Minimal truth and reduced problems, providing only what is required by error estimation operators
+class TruthProblem(object):
+    def __init__(self, V):
+        self.V = V
+        
+class ReducedProblemBase(object):
+    def __init__(self, truth_problem, **kwargs):
+        self.truth_problem = truth_problem
+        self.components = ["u"]
+        self.terms = ["a", "f"]
+        self.terms_order = {"a": 2, "f": 1}
+        self.Q = {"a": 2, "f": 2}
+        self.folder_prefix = kwargs["folder_prefix"]
+        self.folder = Folders()
+        self.incremental_offline_assembly = kwargs["incremental_offline_assembly"]
+        
+    _incremental_offline_assembly_key = ParametrizedReducedDifferentialProblem._incremental_offline_assembly_key
+        
+RBReducedProblemBase = RBReducedProblem(ReducedProblemBase)
+
+class ReducedProblem(RBReducedProblemBase):
+    def __init__(self, truth_problem, inner_product, **kwargs):
+        RBReducedProblemBase.__init__(self, truth_problem, **kwargs)
+        self.error_estimation_terms = [("a", "a"), ("a", "f")]
+        self._riesz_solve_inner_product = inner_product
+        self._riesz_solve_homogeneous_dirichlet_bc = None
+        self._error_estimation_inner_product = inner_product
+        for term in self.error_estimation_terms:
+            self.error_estimation_operator[term] = self.ErrorEstimationOperatorExpansionStorage(self.Q[term[0]], self.Q[term[1]])
+    
+    def estimate_error(self):
+        raise NotImplementedError("This method is not required by this test")
+    
+    def estimate_relative_error(self):
+        raise NotImplementedError("This method is not required by this test")
+        
+# Minimal reduced problem which assembles error estimation operators in a different storage for each stage,
+# as EIM/DEIM decorated ones do
+class StagedReducedProblem(ReducedProblem):
+    def __init__(self, truth_problem, inner_product, **kwargs):
+        ReducedProblem.__init__(self, truth_problem, inner_product, **kwargs)
+        self._error_estimation_operator_per_stage = dict()
+        for stage in ("offline", "online"):
+            self._error_estimation_operator_per_stage[stage] = dict()
+            for term in self.error_estimation_terms:
+                self._error_estimation_operator_per_stage[stage][term] = self.ErrorEstimationOperatorExpansionStorage(self.Q[term[0]], self.Q[term[1]])
+        self.set_current_stage("offline")
+    
+    def set_current_stage(self, current_stage):
+        self.current_stage = current_stage
+        self.error_estimation_operator = self._error_estimation_operator_per_stage[current_stage]
+    
+    def _incremental_offline_assembly_key(self, term):
+        return (self.current_stage, term)
+        
+def RandomFunction(V):
+    function = Function(V)
+    function.vector().set_local(random.rand(function.vector().local_size()))
+    function.vector().apply("insert")
+    return function
+    
+# Test that error estimation operators assembled and saved incrementally coincide with the ones assembled and saved
+# at once, both during the offline stage and after being loaded from file
+def test_error_estimation_operators_incremental(mesh, tempdir):
+    V = FunctionSpace(mesh, "Lagrange", 1)
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    inner_product = AffineExpansionStorage((u*v*dx, ))[0]
+    truth_problem = TruthProblem(V)
+    incremental_reduced_problem = ReducedProblem(truth_problem, inner_product, folder_prefix=os.path.join(tempdir, "incremental"), incremental_offline_assembly=True)
+    full_reduced_problem = ReducedProblem(truth_problem, inner_product, folder_prefix=os.path.join(tempdir, "full"), incremental_offline_assembly=False)
+    riesz_a = [BasisFunctionsMatrix(V) for _ in range(2)]
+    for riesz_a_q in riesz_a:
+        riesz_a_q.init(["u"])
+    riesz_f = [FunctionsList(V) for _ in range(2)]
+    for riesz_f_q in riesz_f:
+        riesz_f_q.enrich(RandomFunction(V))
+    for reduced_problem in (incremental_reduced_problem, full_reduced_problem):
+        reduced_problem.riesz["a"] = reduced_problem.RieszExpansionStorage(2)
+        reduced_problem.riesz["f"] = reduced_problem.RieszExpansionStorage(2)
+        for q in range(2):
+            reduced_problem.riesz["a"][q] = riesz_a[q]
+            reduced_problem.riesz["f"][q] = riesz_f[q]
+    for N in range(0, 5):
+        if N > 0:
+            for riesz_a_q in riesz_a:
+                riesz_a_q.enrich(RandomFunction(V))
+        for term in (("a", "a"), ("a", "f")):
+            incremental_reduced_problem.assemble_error_estimation_operators(term, "offline")
+            full_reduced_problem.assemble_error_estimation_operators(term, "offline")
+            loaded_reduced_problem = ReducedProblem(truth_problem, inner_product, folder_prefix=os.path.join(tempdir, "incremental"), incremental_offline_assembly=True)
+            loaded_reduced_problem.assemble_error_estimation_operators(term, "online")
+            for q0 in range(2):
+                for q1 in range(2):
+                    full_q0_q1 = full_reduced_problem.error_estimation_operator[term][q0, q1]
+                    for reduced_problem in (incremental_reduced_problem, loaded_reduced_problem):
+                        reduced_q0_q1 = reduced_problem.error_estimation_operator[term][q0, q1]
+                        for i in range(N):
+                            if term[1] == "a":
+                                for j in range(N):
+                                    assert isclose(reduced_q0_q1[i, j], full_q0_q1[i, j])
+                            else:
+                                assert isclose(reduced_q0_q1[i], full_q0_q1[i])
+    # Only the blocks related to the last added Riesz representors are saved at each iteration
+    directory = os.path.join(tempdir, "incremental", "error_estimation", "error_estimation_operator_a_a")
+    assert not os.path.exists(os.path.join(directory, "content_item_0.npy"))
+    assert all(os.path.exists(os.path.join(directory, "content_item_0_block_" + str(block) + "_rows.npy")) for block in range(5))
+    
+# Test that error estimation operators assembled incrementally in a different storage for each stage coincide
+# with the ones assembled at once, both during the offline stage and after being loaded from file
+def test_error_estimation_operators_incremental_stages(mesh, tempdir):
+    V = FunctionSpace(mesh, "Lagrange", 1)
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    inner_product = AffineExpansionStorage((u*v*dx, ))[0]
+    truth_problem = TruthProblem(V)
+    incremental_reduced_problem = StagedReducedProblem(truth_problem, inner_product, folder_prefix=os.path.join(tempdir, "incremental_stages"), incremental_offline_assembly=True)
+    full_reduced_problem = ReducedProblem(truth_problem, inner_product, folder_prefix=os.path.join(tempdir, "full_stages"), incremental_offline_assembly=False)
+    riesz_a = [BasisFunctionsMatrix(V) for _ in range(2)]
+    for riesz_a_q in riesz_a:
+        riesz_a_q.init(["u"])
+    riesz_f = [FunctionsList(V) for _ in range(2)]
+    for riesz_f_q in riesz_f:
+        riesz_f_q.enrich(RandomFunction(V))
+    for reduced_problem in (incremental_reduced_problem, full_reduced_problem):
+        reduced_problem.riesz["a"] = reduced_problem.RieszExpansionStorage(2)
+        reduced_problem.riesz["f"] = reduced_problem.RieszExpansionStorage(2)
+        for q in range(2):
+            reduced_problem.riesz["a"][q] = riesz_a[q]
+            reduced_problem.riesz["f"][q] = riesz_f[q]
+    for N in range(0, 4):
+        if N > 0:
+            for riesz_a_q in riesz_a:
+                riesz_a_q.enrich(RandomFunction(V))
+        for term in (("a", "a"), ("a", "f")):
+            full_reduced_problem.assemble_error_estimation_operators(term, "offline")
+            for stage in ("offline", "online"):
+                incremental_reduced_problem.set_current_stage(stage)
+                incremental_reduced_problem.assemble_error_estimation_operators(term, "offline")
+            for stage in ("offline", "online"):
+                incremental_reduced_problem.set_current_stage(stage)
+                loaded_reduced_problem = StagedReducedProblem(truth_problem, inner_product, folder_prefix=os.path.join(tempdir, "incremental_stages"), incremental_offline_assembly=True)
+                loaded_reduced_problem.set_current_stage(stage)
+                loaded_reduced_problem.assemble_error_estimation_operators(term, "online")
+                for q0 in range(2):
+                    for q1 in range(2):
+                        full_q0_q1 = full_reduced_problem.error_estimation_operator[term][q0, q1]
+                        for reduced_problem in (incremental_reduced_problem, loaded_reduced_problem):
+                            reduced_q0_q1 = reduced_problem.error_estimation_operator[term][q0, q1]
+                            for i in range(N):
+                                if term[1] == "a":
+                                    for j in range(N):
+                                        assert isclose(reduced_q0_q1[i, j], full_q0_q1[i, j])
+                                else:
+                                    assert isclose(reduced_q0_q1[i], full_q0_q1[i])
+    # Blocks of each stage are saved in a different folder
+    for stage in ("offline", "online"):
+        directory = os.path.join(tempdir, "incremental_stages", "error_estimation", stage, "error_estimation_operator_a_a")
+        assert all(os.path.exists(os.path.join(directory, "content_item_0_block_" + str(block) + "_rows.npy")) for block in range(4))
+        
+# Test that error estimation operators which are not affinely decomposed are never assembled incrementally
+def test_error_estimation_operators_incremental_non_affine(mesh, tempdir):
+    V = FunctionSpace(mesh, "Lagrange", 1)
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    inner_product = AffineExpansionStorage((u*v*dx, ))[0]
+    truth_problem = TruthProblem(V)
+    reduced_problem = ReducedProblem(truth_problem, inner_product, folder_prefix=os.path.join(tempdir, "non_affine"), incremental_offline_assembly=True)
+    assert reduced_problem._assemble_error_estimation_operators_incrementally_enabled(("a", "a"))
+    assert reduced_problem._assemble_error_estimation_operators_incrementally_enabled(("a", "f"))
+    for term in (("a", "a"), ("a", "f")):
+        reduced_problem.error_estimation_operator[term] = OnlineNonAffineExpansionStorage(2, 2)
+        assert not reduced_problem._assemble_error_estimation_operators_incrementally_enabled(term)
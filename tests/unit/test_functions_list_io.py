@@ -0,0 +1,84 @@
+# Copyright (C) 2015-2018 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import pytest
+from numpy import random
+from dolfin import assemble, dx, Function, inner, TestFunction, TrialFunction, UnitSquareMesh
+import rbnics.backends.dolfin.functions_list
+from rbnics.backends.dolfin import FunctionsList, GramSchmidt
+from rbnics.backends.dolfin.wrapping import FunctionSpace
+
+# Mesh
+@pytest.fixture(scope="module")
+def mesh():
+    return UnitSquareMesh(10, 10)
+    
+# Count calls to function_save
+@pytest.fixture
+def saved_filenames(monkeypatch):
+    saved_filenames = list()
+    function_save = rbnics.backends.dolfin.functions_list.wrapping.function_save
+    def counting_function_save(fun, directory, filename, *args, **kwargs):
+        saved_filenames.append(filename)
+        return function_save(fun, directory, filename, *args, **kwargs)
+    monkeypatch.setattr(rbnics.backends.dolfin.functions_list.wrapping, "function_save", counting_function_save)
+    return saved_filenames
+    
+def RandomFunction(V):
+    function = Function(V)
+    function.vector().set_local(random.rand(function.vector().local_size()))
+    function.vector().apply("insert")
+    return function
+    
+# Test that only new basis functions are saved across greedy iterations, even though Gram-Schmidt replaces
+# the last basis function after each enrichment
+def test_functions_list_save_greedy(mesh, tempdir, saved_filenames):
+    V = FunctionSpace(mesh, "Lagrange", 1)
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    gram_schmidt = GramSchmidt(assemble(inner(u, v)*dx))
+    basis_functions = FunctionsList(V)
+    for N in range(1, 11):
+        basis_functions.enrich(RandomFunction(V))
+        gram_schmidt.apply(basis_functions, 0)
+        basis_functions.save(tempdir, "basis")
+        assert len(saved_filenames) == N
+        assert saved_filenames[-1] == "basis_" + str(N - 1)
+    # Loading returns the functions saved so far
+    loaded_basis_functions = FunctionsList(V)
+    loaded_basis_functions.load(tempdir, "basis")
+    assert len(loaded_basis_functions) == 10
+    for (function, loaded_function) in zip(basis_functions, loaded_basis_functions):
+        assert (function.vector().get_local() == loaded_function.vector().get_local()).all()
+    
+# Test that replacing a function marks as unsaved that function and the following ones only
+def test_functions_list_save_setitem(mesh, tempdir, saved_filenames):
+    V = FunctionSpace(mesh, "Lagrange", 1)
+    functions_list = FunctionsList(V)
+    for _ in range(10):
+        functions_list.enrich(RandomFunction(V))
+    functions_list.save(tempdir, "functions_list")
+    assert len(saved_filenames) == 10
+    functions_list[7] = RandomFunction(V)
+    functions_list.save(tempdir, "functions_list")
+    assert saved_filenames[10:] == ["functions_list_7", "functions_list_8", "functions_list_9"]
+    functions_list[-1] = RandomFunction(V)
+    functions_list.save(tempdir, "functions_list")
+    assert saved_filenames[13:] == ["functions_list_9"]
+    functions_list.save(tempdir, "functions_list")
+    assert len(saved_filenames) == 14
@@ -0,0 +1,60 @@
+# Copyright (C) 2015-2018 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import pytest
+from numpy import isclose, random
+from dolfin import dx, Function, TestFunction, TrialFunction, UnitSquareMesh
+from rbnics.backends import AffineExpansionStorage, FunctionsList, transpose
+from rbnics.backends.dolfin.wrapping import FunctionSpace
+import rbnics.backends.dolfin.wrapping.functions_list_mul
+
+# Mesh
+@pytest.fixture(scope="module")
+def mesh():
+    return UnitSquareMesh(10, 10)
+    
+def RandomFunctionsList(V, N):
+    functions_list = FunctionsList(V)
+    for _ in range(N):
+        function = Function(V)
+        function.vector().set_local(random.rand(function.vector().local_size()))
+        function.vector().apply("insert")
+        functions_list.enrich(function)
+    return functions_list
+    
+# Test S1^T A S2 against v^T A w for each pair of functions v in S1 and w in S2, both when all functions fit
+# in one dense block and when they are split in several dense blocks
+@pytest.mark.parametrize("block_size", [None, 3])
+@pytest.mark.parametrize("same_functions_list", [True, False])
+def test_functions_list_transpose_mul_matrix_mul_functions_list(mesh, monkeypatch, block_size, same_functions_list):
+    V = FunctionSpace(mesh, "Lagrange", 1)
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    A = AffineExpansionStorage((u.dx(0)*v*dx + u*v*dx, ))[0]
+    if block_size is not None:
+        local_size = Function(V).vector().local_size()
+        monkeypatch.setattr(rbnics.backends.dolfin.wrapping.functions_list_mul, "_dense_block_memory", 8*local_size*block_size)
+    S1 = RandomFunctionsList(V, 10)
+    if same_functions_list:
+        S2 = S1
+    else:
+        S2 = RandomFunctionsList(V, 7)
+    S1_A_S2 = transpose(S1)*A*S2
+    for (i, function_i) in enumerate(S1):
+        for (j, function_j) in enumerate(S2):
+            assert isclose(S1_A_S2[i, j], transpose(function_i)*A*function_j)
@@ -0,0 +1,43 @@
+# Copyright (C) 2015-2018 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import pytest
+from numpy.linalg import matrix_rank
+from dolfin import Expression, interpolate, UnitSquareMesh
+from rbnics.backends.dolfin import FunctionsList
+from rbnics.backends.dolfin.wrapping import FunctionSpace, functions_list_evaluate_at_dofs, functions_list_qdeim_dofs
+
+# Mesh
+@pytest.fixture(scope="module")
+def mesh():
+    return UnitSquareMesh(10, 10)
+    
+# Test that the selected dofs are distinct, and that the interpolation matrix restricted to the first n
+# functions and the first n dofs is nonsingular for every n
+@pytest.mark.parametrize("N", [1, 5, 10])
+def test_functions_list_qdeim_dofs(mesh, N):
+    V = FunctionSpace(mesh, "Lagrange", 1)
+    functions_list = FunctionsList(V)
+    for n in range(N):
+        functions_list.enrich(interpolate(Expression("sin((n + 1)*x[0])*cos((n + 2)*x[1]) + pow(x[0], n)", n=n, degree=3), V))
+    dofs = functions_list_qdeim_dofs(functions_list)
+    assert len(dofs) == N
+    assert len(set(dofs)) == N
+    interpolation_matrix = functions_list_evaluate_at_dofs(functions_list, dofs)
+    for n in range(1, N + 1):
+        assert matrix_rank(interpolation_matrix[:n, :n]) == n
@@ -57,3 +57,45 @@ def test_linear_program_solver(LinearProgramSolver):
     solver = LinearProgramSolver(c, A, b, bounds)
     optimal_cost = solver.solve()
     assert isclose(optimal_cost, 0.625)
+
+def _assemble_linear_program(b_0=1.):
+    c = Vector(2)
+    A = Matrix(2, 2)
+    b = Vector(2)
+    bounds = [None]*2
+    
+    c[0], c[1] = 0.5, 1.
+    A[0, 0], A[0, 1] = 1., 1.
+    A[1, 0], A[1, 1] = -1., 1.
+    b[0], b[1] = b_0, -0.5
+    bounds[0] = (0., 1.)
+    bounds[1] = (0., 1.)
+    return (c, A, b, bounds)
+
+# Test that a warm started solve returns the same cost as a cold solve, both when the previous
+# active set is still optimal (and the actual solver is not called) and when it is not
+@pytest.mark.parametrize("LinearProgramSolver", AllLinearProgramSolver)
+def test_linear_program_solver_warm_start(LinearProgramSolver, monkeypatch):
+    cold_solver = LinearProgramSolver(*_assemble_linear_program())
+    cold_optimal_cost = cold_solver.solve()
+    active_set = cold_solver.active_set
+    assert active_set == (0, 1)
+    # Same problem, and a perturbed problem which shares the same optimal active set: the actual solver is never called
+    for b_0 in (1., 1.1):
+        cold_optimal_cost = LinearProgramSolver(*_assemble_linear_program(b_0)).solve()
+        warm_solver = LinearProgramSolver(*_assemble_linear_program(b_0))
+        warm_solver.set_warm_start(active_set)
+        with monkeypatch.context() as m:
+            def _solve_not_expected(self):
+                raise AssertionError("Warm start should have been successful")
+            m.setattr(LinearProgramSolver, "_solve", _solve_not_expected)
+            warm_optimal_cost = warm_solver.solve()
+        assert isclose(warm_optimal_cost, cold_optimal_cost)
+        assert warm_solver.active_set == active_set
+    # A non optimal (x = 0, y = 1) and a singular active set: fall back to a cold solve
+    for wrong_active_set in ((2, 5), (0, 0)):
+        warm_solver = LinearProgramSolver(*_assemble_linear_program())
+        warm_solver.set_warm_start(wrong_active_set)
+        warm_optimal_cost = warm_solver.solve()
+        assert isclose(warm_optimal_cost, 0.625)
+        assert warm_solver.active_set == active_set
@@ -0,0 +1,114 @@
+# Copyright (C) 2015-2018 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import pytest
+from numpy import log, random
+import rbnics.sampling.parameter_space_subset
+from rbnics.sampling import ParameterSpaceSubset
+
+# Common data
+box = [(2., 5.), (10., 1000.)]
+
+# Test save and load, both in text and in binary format
+@pytest.mark.parametrize("binary_storage_threshold", [1000, 10])
+def test_parameter_space_subset_io(tempdir, monkeypatch, binary_storage_threshold):
+    monkeypatch.setattr(rbnics.sampling.parameter_space_subset, "_binary_storage_threshold", binary_storage_threshold)
+    random.seed(0)
+    parameter_space_subset = ParameterSpaceSubset()
+    parameter_space_subset.generate(box, 100)
+    parameter_space_subset.save(tempdir, "parameter_space_subset")
+    if binary_storage_threshold < 100:
+        assert os.path.isfile(os.path.join(tempdir, "parameter_space_subset.npy"))
+        assert not os.path.isfile(os.path.join(tempdir, "parameter_space_subset.txt"))
+    else:
+        assert os.path.isfile(os.path.join(tempdir, "parameter_space_subset.txt"))
+        assert not os.path.isfile(os.path.join(tempdir, "parameter_space_subset.npy"))
+    loaded_parameter_space_subset = ParameterSpaceSubset()
+    assert loaded_parameter_space_subset.load(tempdir, "parameter_space_subset")
+    assert len(loaded_parameter_space_subset) == 100
+    assert list(loaded_parameter_space_subset) == list(parameter_space_subset)
+    assert all([isinstance(mu, tuple) for mu in loaded_parameter_space_subset])
+    # Change the loaded set, which is memory mapped from file in the binary case
+    loaded_parameter_space_subset[0] = (3., 20.)
+    loaded_parameter_space_subset.append((4., 30.))
+    assert loaded_parameter_space_subset[0] == (3., 20.)
+    assert loaded_parameter_space_subset[100] == (4., 30.)
+    assert len(loaded_parameter_space_subset) == 101
+    # Saving a small set in the same folder removes the previous binary file
+    parameter_space_subset[:5].save(tempdir, "parameter_space_subset")
+    reloaded_parameter_space_subset = ParameterSpaceSubset()
+    reloaded_parameter_space_subset.load(tempdir, "parameter_space_subset")
+    assert list(reloaded_parameter_space_subset) == list(parameter_space_subset)[:5]
+
+# Test diff and membership against a brute force implementation
+def test_parameter_space_subset_diff():
+    random.seed(0)
+    parameter_space_subset = ParameterSpaceSubset()
+    parameter_space_subset.generate(box, 100)
+    other_parameter_space_subset = ParameterSpaceSubset()
+    for i in range(0, 100, 3):
+        other_parameter_space_subset.append(parameter_space_subset[i])
+    other_parameter_space_subset.append((3., 20.))
+    diff = parameter_space_subset.diff(other_parameter_space_subset)
+    assert list(diff) == [mu for mu in parameter_space_subset if mu not in list(other_parameter_space_subset)]
+    assert len(diff) == 66
+    assert list(parameter_space_subset.diff(list(other_parameter_space_subset))) == list(diff)
+    assert all([mu in parameter_space_subset for mu in diff])
+    assert all([mu not in diff for mu in other_parameter_space_subset])
+    assert (3., 20.) not in parameter_space_subset
+    parameter_space_subset[0] = (3., 20.)
+    assert (3., 20.) in parameter_space_subset
+
+# Test chunked iteration
+@pytest.mark.parametrize("chunk_size", [1, 7, 100, 1000])
+def test_parameter_space_subset_chunks(chunk_size):
+    random.seed(0)
+    parameter_space_subset = ParameterSpaceSubset()
+    parameter_space_subset.generate(box, 100)
+    chunks = list(parameter_space_subset.chunks(chunk_size))
+    assert all([len(chunk) <= chunk_size for chunk in chunks])
+    assert [mu for chunk in chunks for mu in chunk] == list(parameter_space_subset)
+
+# Test closest parameters against a brute force implementation, with and without distance scaling
+@pytest.mark.parametrize("distance_scaling", [None, (1., "log"), (10., 0.01)])
+@pytest.mark.parametrize("M", [0, 1, 7, 100])
+def test_parameter_space_subset_closest(distance_scaling, M):
+    random.seed(0)
+    parameter_space_subset = ParameterSpaceSubset()
+    parameter_space_subset.generate(box, 100)
+    parameter_space_subset.set_distance_scaling(distance_scaling)
+    def scale(mu):
+        if distance_scaling is None:
+            return mu
+        else:
+            return tuple(log(mu_p) if s == "log" else s*mu_p for (mu_p, s) in zip(mu, distance_scaling))
+    for mu in [(3., 20.), (2., 1000.), parameter_space_subset[42]]:
+        def distance(mu_index):
+            return sum([(p - q)**2 for (p, q) in zip(scale(parameter_space_subset[mu_index]), scale(mu))])
+        brute_force_indices = sorted(range(100), key=distance)[:M]
+        closest_indices = parameter_space_subset.closest_indices(M, mu)
+        assert closest_indices == brute_force_indices
+        closest = parameter_space_subset.closest(M, mu)
+        assert sorted(closest) == sorted([parameter_space_subset[mu_index] for mu_index in brute_force_indices])
+        assert closest.distance_scaling == distance_scaling
+    # The KD-tree is rebuilt after the set changes
+    parameter_space_subset.append((3., 20.))
+    assert parameter_space_subset.closest_indices(1, (3., 20.)) == [100]
+    parameter_space_subset[0] = (2.5, 500.)
+    assert parameter_space_subset.closest_indices(1, (2.5, 500.)) == [0]
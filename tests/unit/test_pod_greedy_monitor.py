@@ -0,0 +1,88 @@
+# Copyright (C) 2015-2018 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+import pytest
+from rbnics.reduction_methods import ParabolicCoerciveRBReduction
+
+# Minimal truth problem, providing only what is required by the time stepping monitor of nested POD-Greedy
+class TruthProblem(object):
+    def __init__(self, time_stepping_parameters):
+        self.components = ["u"]
+        self.t0 = 0.
+        self.dt = 0.1
+        self.T = 0.5
+        self._time_stepping_parameters = time_stepping_parameters
+        
+# Minimal incremental POD, which only records the snapshots it is fed with
+class ProperOrthogonalDecomposition(object):
+    def __init__(self):
+        self.snapshots = list()
+        self.incremental_tolerance = None
+    
+    def clear(self):
+        self.snapshots = list()
+    
+    def store_snapshot(self, snapshot, component=None):
+        self.snapshots.append(snapshot)
+        
+# Minimal reduction method, providing only what is required to stream time trajectories to nested POD-Greedy
+class ReductionMethod(object):
+    def __init__(self, truth_problem):
+        self.truth_problem = truth_problem
+        self.reduced_problem = None
+        self.POD_greedy_basis_extension = "POD"
+        self.POD_greedy_nested = True
+        self.POD_time_trajectory = ProperOrthogonalDecomposition()
+        self._POD_greedy_streamed_time_steps = None
+        self._POD_greedy_user_monitor = None
+        self.greedy_selected_parameters = [(1., )]
+        self.tol1 = 0.
+        self.reduction_first_index = 0
+        self.reduction_last_index = None
+        self.reduction_delta_index = 1
+    
+    def _postprocess_snapshot_at_time_step(self, snapshot, k, i):
+        return snapshot
+    
+    _POD_greedy_start_streaming = ParabolicCoerciveRBReduction._POD_greedy_start_streaming
+    _POD_greedy_stop_streaming = ParabolicCoerciveRBReduction._POD_greedy_stop_streaming
+    _POD_greedy_monitor = ParabolicCoerciveRBReduction._POD_greedy_monitor
+    
+# Test that the time stepping monitor which streams time trajectories to the incremental POD calls the monitor
+# provided by the user (if any) at every time step, and that the latter is restored when streaming stops
+@pytest.mark.parametrize("user_monitor", [True, False])
+def test_pod_greedy_monitor(user_monitor):
+    monitored_time_steps = list()
+    def monitor(t, solution, solution_dot):
+        monitored_time_steps.append((t, solution, solution_dot))
+    time_stepping_parameters = {"monitor": monitor} if user_monitor else dict()
+    reduction_method = ReductionMethod(TruthProblem(time_stepping_parameters))
+    
+    for _ in range(2): # streaming is started again before each truth solve
+        reduction_method._POD_greedy_start_streaming()
+        assert time_stepping_parameters["monitor"] == reduction_method._POD_greedy_monitor
+        for k in range(6):
+            time_stepping_parameters["monitor"](0.1*k, float(k), - float(k))
+        assert reduction_method._POD_greedy_streamed_time_steps == 6
+        assert reduction_method.POD_time_trajectory.snapshots == [float(k) for k in range(6)]
+    reduction_method._POD_greedy_stop_streaming()
+    
+    if user_monitor:
+        assert time_stepping_parameters["monitor"] is monitor
+        assert monitored_time_steps == 2*[(0.1*k, float(k), - float(k)) for k in range(6)]
+    else:
+        assert "monitor" not in time_stepping_parameters
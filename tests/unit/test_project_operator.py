@@ -0,0 +1,146 @@
+# Copyright (C) 2015-2018 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import pytest
+from numpy import isclose, random
+from dolfin import dx, Expression, Function, grad, inner, TestFunction, TrialFunction, UnitSquareMesh
+from rbnics.backends import AffineExpansionStorage, BasisFunctionsMatrix, transpose
+from rbnics.backends.dolfin.wrapping import FunctionSpace
+from rbnics.backends.online import OnlineAffineExpansionStorage, OnlineFunction, OnlineMatrix, OnlineVector
+from rbnics.problems.base import ParametrizedReducedDifferentialProblem
+
+# Mesh
+@pytest.fixture(scope="module")
+def mesh():
+    return UnitSquareMesh(10, 10)
+    
+# Minimal reduced problem, providing only what is required by _project_operator
+class ReducedProblem(object):
+    def __init__(self, V, incremental_offline_assembly):
+        self.components = ["u"]
+        self.N = 0
+        self.N_bc = 0
+        self.basis_functions = BasisFunctionsMatrix(V)
+        self.basis_functions.init(self.components)
+        self.incremental_offline_assembly = incremental_offline_assembly
+        self._incremental_offline_assembly_data = dict()
+    
+    _project_operator = ParametrizedReducedDifferentialProblem._project_operator
+    _incremental_offline_assembly_key = ParametrizedReducedDifferentialProblem._incremental_offline_assembly_key
+    
+# Minimal reduced problem which assembles each term in a different storage for each stage, as EIM/DEIM decorated ones do
+class StagedReducedProblem(ReducedProblem):
+    def __init__(self, V, incremental_offline_assembly):
+        ReducedProblem.__init__(self, V, incremental_offline_assembly)
+        self.current_stage = "offline"
+    
+    def _incremental_offline_assembly_key(self, term):
+        return (self.current_stage, term)
+    
+def RandomFunction(V):
+    function = Function(V)
+    function.vector().set_local(random.rand(function.vector().local_size()))
+    function.vector().apply("insert")
+    return function
+    
+# Test that the incremental projection of a nonsymmetric operator and of a vector, carried out while the basis
+# is enriched, coincides with the full projection
+def test_project_operator_incremental(mesh):
+    V = FunctionSpace(mesh, "Lagrange", 1)
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    a = AffineExpansionStorage((inner(grad(u), grad(v))*dx, u.dx(0)*v*dx))
+    f = AffineExpansionStorage((v*dx, Expression("x[0]", degree=1)*v*dx))
+    incremental_reduced_problem = ReducedProblem(V, True)
+    incremental_reduced_a = OnlineAffineExpansionStorage(2)
+    incremental_reduced_f = OnlineAffineExpansionStorage(2)
+    full_reduced_problem = ReducedProblem(V, False)
+    for N in range(1, 7):
+        function = RandomFunction(V)
+        for reduced_problem in (incremental_reduced_problem, full_reduced_problem):
+            reduced_problem.basis_functions.enrich(function)
+            reduced_problem.N = N
+        incremental_reduced_problem._project_operator("a", a, incremental_reduced_a, 2)
+        incremental_reduced_problem._project_operator("f", f, incremental_reduced_f, 1)
+        full_reduced_a = OnlineAffineExpansionStorage(2)
+        full_reduced_f = OnlineAffineExpansionStorage(2)
+        full_reduced_problem._project_operator("a", a, full_reduced_a, 2)
+        full_reduced_problem._project_operator("f", f, full_reduced_f, 1)
+        for q in range(2):
+            for i in range(N):
+                assert isclose(incremental_reduced_f[q][i], full_reduced_f[q][i])
+                for j in range(N):
+                    assert isclose(incremental_reduced_a[q][i, j], full_reduced_a[q][i, j])
+                    
+# Test that the incremental projection into a different storage for each stage coincides with the full projection
+def test_project_operator_incremental_stages(mesh):
+    V = FunctionSpace(mesh, "Lagrange", 1)
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    a = AffineExpansionStorage((inner(grad(u), grad(v))*dx, u.dx(0)*v*dx))
+    f = AffineExpansionStorage((v*dx, Expression("x[0]", degree=1)*v*dx))
+    incremental_reduced_problem = StagedReducedProblem(V, True)
+    incremental_reduced_a = {stage: OnlineAffineExpansionStorage(2) for stage in ("offline", "online")}
+    incremental_reduced_f = {stage: OnlineAffineExpansionStorage(2) for stage in ("offline", "online")}
+    full_reduced_problem = ReducedProblem(V, False)
+    for N in range(1, 5):
+        function = RandomFunction(V)
+        for reduced_problem in (incremental_reduced_problem, full_reduced_problem):
+            reduced_problem.basis_functions.enrich(function)
+            reduced_problem.N = N
+        for stage in ("offline", "online"):
+            incremental_reduced_problem.current_stage = stage
+            incremental_reduced_problem._project_operator("a", a, incremental_reduced_a[stage], 2)
+            incremental_reduced_problem._project_operator("f", f, incremental_reduced_f[stage], 1)
+        full_reduced_a = OnlineAffineExpansionStorage(2)
+        full_reduced_f = OnlineAffineExpansionStorage(2)
+        full_reduced_problem._project_operator("a", a, full_reduced_a, 2)
+        full_reduced_problem._project_operator("f", f, full_reduced_f, 1)
+        for stage in ("offline", "online"):
+            for q in range(2):
+                for i in range(N):
+                    assert isclose(incremental_reduced_f[stage][q][i], full_reduced_f[q][i])
+                    for j in range(N):
+                        assert isclose(incremental_reduced_a[stage][q][i, j], full_reduced_a[q][i, j])
+                        
+# Test v^T A S against v^T A w for each function w in S
+def test_transpose_vector_matrix_functions_list(mesh):
+    V = FunctionSpace(mesh, "Lagrange", 1)
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    A = AffineExpansionStorage((u.dx(0)*v*dx, ))[0]
+    z = RandomFunction(V)
+    functions = [RandomFunction(V) for _ in range(5)]
+    row = transpose(z)*A*functions
+    for (i, function) in enumerate(functions):
+        assert isclose(row[i], transpose(z)*A*function)
+        
+# Test v^T A S against v^T A w for each function w in S, for online matrices
+def test_transpose_vector_matrix_functions_list_online():
+    A = OnlineMatrix(6, 6)
+    A[:, :] = random.rand(6, 6)
+    z = OnlineVector(6)
+    z[:] = random.rand(6)
+    functions = list()
+    for _ in range(5):
+        function = OnlineFunction(6)
+        function.vector()[:] = random.rand(6)
+        functions.append(function)
+    row = transpose(z)*A*functions
+    for (i, function) in enumerate(functions):
+        assert isclose(row[i], transpose(z)*A*function)
@@ -0,0 +1,248 @@
+# Copyright (C) 2015-2018 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+
+import pytest
+from numpy import arange, dot, isclose, random
+from dolfin import dx, Function, grad, inner, TestFunction, TrialFunction, UnitSquareMesh
+from rbnics.backends import AffineExpansionStorage, FunctionsList, ProperOrthogonalDecomposition, transpose
+from rbnics.backends.dolfin.wrapping import FunctionSpace
+from rbnics.backends.online.numpy import HighOrderProperOrthogonalDecomposition as DenseHighOrderProperOrthogonalDecomposition, Vector as DenseVector
+from rbnics.utils.config import config
+
+# Mesh
+@pytest.fixture(scope="module")
+def mesh():
+    return UnitSquareMesh(10, 10)
+    
+# Set the POD method in the configuration, restoring the original one at the end of the test
+@pytest.fixture
+def set_POD_method():
+    original_method = config.get("POD", "method")
+    def _set_POD_method(method):
+        config.set("POD", "method", method)
+    yield _set_POD_method
+    config.set("POD", "method", original_method)
+    
+# Set the POD eigensolver in the configuration, restoring the original one at the end of the test
+@pytest.fixture
+def set_POD_eigensolver():
+    original_eigensolver = config.get("POD", "eigensolver")
+    def _set_POD_eigensolver(eigensolver):
+        config.set("POD", "eigensolver", eigensolver)
+    yield _set_POD_eigensolver
+    config.set("POD", "eigensolver", original_eigensolver)
+    
+# Snapshots which (up to a small perturbation) lie in a space of dimension rank
+def RandomSnapshots(V, N, rank):
+    modes = list()
+    for _ in range(rank):
+        mode = Function(V)
+        mode.vector().set_local(random.rand(mode.vector().local_size()))
+        mode.vector().apply("insert")
+        modes.append(mode)
+    snapshots = list()
+    for _ in range(N):
+        snapshot = Function(V)
+        snapshot.vector().set_local(1.e-3*random.rand(snapshot.vector().local_size()))
+        snapshot.vector().apply("insert")
+        for mode in modes:
+            snapshot.vector().axpy(random.rand(), mode.vector())
+        snapshots.append(snapshot)
+    return snapshots
+    
+def InnerProduct(V):
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    return AffineExpansionStorage((inner(grad(u), grad(v))*dx + u*v*dx, ))[0]
+    
+# Test the incremental POD against the method of snapshots, storing either one snapshot at a time or all of them at once
+@pytest.mark.parametrize("store_one_at_a_time", [True, False])
+def test_proper_orthogonal_decomposition_incremental(mesh, set_POD_method, store_one_at_a_time):
+    V = FunctionSpace(mesh, "Lagrange", 1)
+    X = InnerProduct(V)
+    random.seed(0)
+    snapshots = RandomSnapshots(V, 20, 5)
+    Nmax = 8
+    
+    set_POD_method("snapshots")
+    dense_POD = ProperOrthogonalDecomposition(V, X)
+    for snapshot in snapshots:
+        dense_POD.store_snapshot(snapshot)
+    (dense_eigenvalues, _, dense_basis_functions, dense_N) = dense_POD.apply(Nmax, 0.)
+    
+    set_POD_method("incremental")
+    incremental_POD = ProperOrthogonalDecomposition(V, X)
+    assert incremental_POD.incremental
+    if store_one_at_a_time:
+        for snapshot in snapshots:
+            incremental_POD.store_snapshot(snapshot)
+    else:
+        incremental_POD.store_snapshot(snapshots)
+    assert len(incremental_POD.snapshots_matrix) == 0
+    (incremental_eigenvalues, _, incremental_basis_functions, incremental_N) = incremental_POD.apply(Nmax, 0.)
+    
+    assert incremental_N == dense_N == Nmax
+    for n in range(Nmax):
+        assert isclose(incremental_eigenvalues[n], dense_eigenvalues[n], rtol=1.e-8, atol=1.e-12*dense_eigenvalues[0])
+        assert isclose(incremental_POD.retained_energy[n], dense_POD.retained_energy[n])
+    # Basis functions are X-orthonormal, and leading ones coincide with the ones from the method of snapshots (up to sign)
+    for n in range(5):
+        assert isclose(abs(transpose(incremental_basis_functions[n])*X*dense_basis_functions[n]), 1.)
+    for m in range(Nmax):
+        for n in range(Nmax):
+            assert isclose(transpose(incremental_basis_functions[m])*X*incremental_basis_functions[n], 1. if m == n else 0., atol=1.e-10)
+            
+# Test the incremental POD enabled on a single object (as in nested POD-Greedy) with a positive tolerance: singular
+# values may only change by at most the square root of the discarded energy, which is bounded by the tolerance.
+# The object is cleared and used again, as done for the time trajectory of each greedy selected parameter
+def test_proper_orthogonal_decomposition_set_incremental(mesh, set_POD_method):
+    V = FunctionSpace(mesh, "Lagrange", 1)
+    X = InnerProduct(V)
+    random.seed(0)
+    tol = 1.e-4
+    Nmax = 8
+    
+    set_POD_method("snapshots")
+    incremental_POD = ProperOrthogonalDecomposition(V, X)
+    incremental_POD.set_incremental(True)
+    for _ in range(2):
+        snapshots = RandomSnapshots(V, 20, 5)
+        dense_POD = ProperOrthogonalDecomposition(V, X)
+        assert not dense_POD.incremental
+        for snapshot in snapshots:
+            dense_POD.store_snapshot(snapshot)
+        (dense_eigenvalues, _, _, _) = dense_POD.apply(Nmax, 0.)
+        total_energy = sum([transpose(snapshot)*X*snapshot for snapshot in snapshots])
+        
+        incremental_POD.clear()
+        incremental_POD.incremental_tolerance = tol
+        for snapshot in snapshots:
+            incremental_POD.store_snapshot(snapshot)
+        (incremental_eigenvalues, _, _, incremental_N) = incremental_POD.apply(Nmax, 0.)
+        
+        assert 5 <= incremental_N <= Nmax
+        assert incremental_POD._incremental_discarded_energy <= tol*total_energy
+        assert isclose(incremental_POD._incremental_total_energy, total_energy)
+        for n in range(incremental_N):
+            assert abs(incremental_eigenvalues[n]**0.5 - dense_eigenvalues[n]**0.5) <= (tol*total_energy)**0.5
+            
+# Test the incremental POD in the trivial case of zero snapshots, which returns a single zero basis function as
+# the method of snapshots does, and for snapshots which exactly lie in a space of small dimension, for which
+# round-off residuals must not add spurious (and non orthogonal) basis functions
+def test_proper_orthogonal_decomposition_incremental_degenerate(mesh, set_POD_method):
+    V = FunctionSpace(mesh, "Lagrange", 1)
+    X = InnerProduct(V)
+    random.seed(0)
+    Nmax = 8
+    
+    set_POD_method("incremental")
+    incremental_POD = ProperOrthogonalDecomposition(V, X)
+    for _ in range(3):
+        incremental_POD.store_snapshot(Function(V))
+    (incremental_eigenvalues, _, incremental_basis_functions, incremental_N) = incremental_POD.apply(Nmax, 0.)
+    assert incremental_N == 1
+    assert incremental_eigenvalues == [0.]
+    assert incremental_POD.retained_energy == [1.]
+    assert transpose(incremental_basis_functions[0])*X*incremental_basis_functions[0] == 0.
+    
+    incremental_POD.clear()
+    rank = 3
+    modes = RandomSnapshots(V, rank, rank)
+    for _ in range(50):
+        snapshot = Function(V)
+        for mode in modes:
+            snapshot.vector().axpy(random.rand(), mode.vector())
+        incremental_POD.store_snapshot(snapshot)
+    (_, _, incremental_basis_functions, incremental_N) = incremental_POD.apply(Nmax, 0.)
+    assert incremental_N == rank
+    for m in range(rank):
+        for n in range(rank):
+            assert isclose(transpose(incremental_basis_functions[m])*X*incremental_basis_functions[n], 1. if m == n else 0., atol=1.e-10)
+            
+# Test the direct SVD against the method of snapshots for the POD of dense tensors, both when there are more snapshots
+# than entries of each snapshot (where the automatic choice is the direct SVD) and when there are less snapshots
+@pytest.mark.parametrize("method", ["SVD", "automatic"])
+@pytest.mark.parametrize("Ns", [10, 4])
+def test_proper_orthogonal_decomposition_SVD(mesh, set_POD_method, method, Ns):
+    V = FunctionSpace(mesh, "Lagrange", 1)
+    basis_functions = FunctionsList(V)
+    Nh = 6
+    random.seed(0)
+    snapshots = list()
+    for _ in range(Ns):
+        snapshot = DenseVector(Nh)
+        snapshot[:] = random.rand(Nh)
+        snapshots.append(snapshot)
+    Nmax = min(Ns, Nh)
+    
+    def apply_POD():
+        POD = DenseHighOrderProperOrthogonalDecomposition(basis_functions, DenseVector(Nh))
+        for snapshot in snapshots:
+            POD.store_snapshot(snapshot)
+        (eigenvalues, _, basis, N) = POD.apply(Nmax, 0.)
+        return (POD, eigenvalues, basis, N)
+    
+    set_POD_method("snapshots")
+    (POD, eigenvalues, basis, N) = apply_POD()
+    assert not POD._use_SVD()
+    set_POD_method(method)
+    (SVD_POD, SVD_eigenvalues, SVD_basis, SVD_N) = apply_POD()
+    assert SVD_POD._use_SVD() == (method == "SVD" or Ns > Nh)
+    
+    assert SVD_N == N == Nmax
+    for n in range(Nmax):
+        assert isclose(SVD_eigenvalues[n], eigenvalues[n])
+        assert isclose(SVD_POD.retained_energy[n], POD.retained_energy[n])
+        # Basis functions coincide up to sign
+        assert isclose(abs(dot(SVD_basis[n], basis[n])), 1.)
+        
+# Test the truncated eigensolver against the dense one for the POD of dense tensors, without any bound on the number
+# of basis functions: only the eigenpairs required to satisfy the tolerance should be computed
+def test_proper_orthogonal_decomposition_truncated_eigensolver(mesh, set_POD_method, set_POD_eigensolver):
+    V = FunctionSpace(mesh, "Lagrange", 1)
+    basis_functions = FunctionsList(V)
+    Nh = 40
+    Ns = 30
+    random.seed(0)
+    snapshots = list()
+    for _ in range(Ns):
+        snapshot = DenseVector(Nh)
+        snapshot[:] = random.rand(Nh)*0.5**arange(Nh)
+        snapshots.append(snapshot)
+    tol = 1.e-8
+    
+    def apply_POD():
+        POD = DenseHighOrderProperOrthogonalDecomposition(basis_functions, DenseVector(Nh))
+        for snapshot in snapshots:
+            POD.store_snapshot(snapshot)
+        (eigenvalues, _, basis, N) = POD.apply(Ns, tol)
+        return (POD, eigenvalues, basis, N)
+    
+    set_POD_method("snapshots")
+    set_POD_eigensolver("dense")
+    (POD, eigenvalues, basis, N) = apply_POD()
+    set_POD_eigensolver("truncated")
+    (truncated_POD, truncated_eigenvalues, truncated_basis, truncated_N) = apply_POD()
+    
+    assert len(POD.eigenvalues) == Ns
+    assert truncated_N == N < len(truncated_POD.eigenvalues) < Ns
+    for n in range(N):
+        assert isclose(truncated_eigenvalues[n], eigenvalues[n])
+        assert isclose(truncated_POD.retained_energy[n], POD.retained_energy[n])
+        # Basis functions coincide up to sign
+        assert isclose(abs(dot(truncated_basis[n], basis[n])), 1.)
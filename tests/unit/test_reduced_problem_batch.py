@@ -0,0 +1,145 @@
+# Copyright (C) 2015-2018 by the RBniCS authors
+#
+# This file is part of RBniCS.
+#
+# RBniCS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# RBniCS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
+#
+import os
+import pytest
+from numpy import allclose, array, isclose, random
+from dolfin import CompiledSubDomain, Constant, DirichletBC, grad, inner, Measure, MeshFunction, TestFunction, TrialFunction, UnitSquareMesh
+from rbnics import EllipticCoerciveCompliantProblem, EllipticCoerciveProblem, ReducedBasis
+from rbnics.backends.dolfin.wrapping import FunctionSpace
+
+# Mesh
+@pytest.fixture(scope="module")
+def mesh():
+    return UnitSquareMesh(10, 10)
+    
+# Thermal block problem on the unit square, split in two subdomains along x[0] = 0.5, with a flux on the bottom side
+def ThermalBlock(mesh, problem_type, dirichlet_bc):
+    V = FunctionSpace(mesh, "Lagrange", 1)
+    subdomains = MeshFunction("size_t", mesh, mesh.topology().dim(), 2)
+    CompiledSubDomain("x[0] <= 0.5 + DOLFIN_EPS").mark(subdomains, 1)
+    boundaries = MeshFunction("size_t", mesh, mesh.topology().dim() - 1, 0)
+    CompiledSubDomain("on_boundary && near(x[1], 0.)").mark(boundaries, 1)
+    CompiledSubDomain("on_boundary && near(x[1], 1.)").mark(boundaries, 3)
+    
+    assert problem_type in ("compliant", "non compliant")
+    if problem_type == "compliant":
+        ThermalBlock_Base = EllipticCoerciveCompliantProblem
+    else:
+        ThermalBlock_Base = EllipticCoerciveProblem
+    assert dirichlet_bc in ("homogeneous", "non homogeneous")
+    
+    class ThermalBlock_Class(ThermalBlock_Base):
+        def __init__(self, V, **kwargs):
+            ThermalBlock_Base.__init__(self, V, **kwargs)
+            self.u = TrialFunction(V)
+            self.v = TestFunction(V)
+            self.dx = Measure("dx")(subdomain_data=subdomains)
+            self.ds = Measure("ds")(subdomain_data=boundaries)
+        
+        def name(self):
+            return "ThermalBlock"
+        
+        def get_stability_factor(self):
+            return min(self.compute_theta("a"))
+        
+        def compute_theta(self, term):
+            mu = self.mu
+            if term == "a":
+                return (mu[0], 1.)
+            elif term == "f":
+                return (mu[1], 1.)
+            elif term == "dirichlet_bc" and dirichlet_bc == "non homogeneous":
+                return (mu[1], )
+            else:
+                raise ValueError("Invalid term for compute_theta().")
+        
+        def assemble_operator(self, term):
+            u = self.u
+            v = self.v
+            dx = self.dx
+            ds = self.ds
+            if term == "a":
+                return (inner(grad(u), grad(v))*dx(1), inner(grad(u), grad(v))*dx(2))
+            elif term == "f":
+                return (v*ds(1), v*dx)
+            elif term == "dirichlet_bc":
+                return ([DirichletBC(self.V, Constant(1.), boundaries, 3)], )
+            elif term == "inner_product":
+                return (inner(grad(u), grad(v))*dx, )
+            else:
+                raise ValueError("Invalid term for assemble_operator().")
+    
+    problem = ThermalBlock_Class(V)
+    problem.set_mu_range([(0.1, 10.), (-1., 1.)])
+    return problem
+    
+# Run the offline phase of a reduced basis method in the current directory
+def offline(mesh, problem_type, dirichlet_bc, greedy_batch_size):
+    problem = ThermalBlock(mesh, problem_type, dirichlet_bc)
+    reduction_method = ReducedBasis(problem)
+    reduction_method.set_Nmax(4)
+    reduction_method.set_tolerance(0.)
+    reduction_method.set_greedy_batch_size(greedy_batch_size)
+    random.seed(0)
+    reduction_method.initialize_training_set(30)
+    reduced_problem = reduction_method.offline()
+    return (reduction_method, reduced_problem)
+    
+# Test the batched greedy search against the search over one parameter at a time
+@pytest.mark.parametrize("problem_type", ["compliant", "non compliant"])
+@pytest.mark.parametrize("dirichlet_bc", ["homogeneous", "non homogeneous"])
+def test_reduced_basis_greedy_batch(mesh, tmpdir, monkeypatch, problem_type, dirichlet_bc):
+    greedy_selected_parameters = dict()
+    greedy_error_estimators = dict()
+    for greedy_batch_size in (None, 7):
+        subdirectory = os.path.join(str(tmpdir), "greedy_batch_size_" + str(greedy_batch_size))
+        os.makedirs(subdirectory)
+        monkeypatch.chdir(subdirectory)
+        (reduction_method, _) = offline(mesh, problem_type, dirichlet_bc, greedy_batch_size)
+        greedy_selected_parameters[greedy_batch_size] = list(reduction_method.greedy_selected_parameters)
+        greedy_error_estimators[greedy_batch_size] = list(reduction_method.greedy_error_estimators)
+    assert greedy_selected_parameters[7] == greedy_selected_parameters[None]
+    assert allclose(greedy_error_estimators[7], greedy_error_estimators[None])
+    
+# Test batched online solves, outputs and error estimators against the ones computed one parameter at a time
+@pytest.mark.parametrize("problem_type", ["compliant", "non compliant"])
+@pytest.mark.parametrize("dirichlet_bc", ["homogeneous", "non homogeneous"])
+def test_reduced_problem_batch(mesh, tmpdir, monkeypatch, problem_type, dirichlet_bc):
+    monkeypatch.chdir(str(tmpdir))
+    (reduction_method, reduced_problem) = offline(mesh, problem_type, dirichlet_bc, None)
+    random.seed(1)
+    reduction_method.initialize_testing_set(10)
+    mus = list(reduction_method.testing_set)
+    for N in (None, 2):
+        # Batched evaluation is carried out without falling back to a loop over parameters
+        assert reduced_problem._solve_batch(mus, N) is not NotImplemented
+        assert reduced_problem._estimate_error_batch(mus, N) is not NotImplemented
+        solution_batch = reduced_problem.solve_batch(mus, N)
+        output_batch = reduced_problem.compute_output_batch(mus, N)
+        error_estimator_batch = reduced_problem.estimate_error_batch(mus, N)
+        if problem_type == "compliant":
+            assert reduced_problem._compute_output_batch(mus, N) is not NotImplemented
+        else:
+            assert output_batch is NotImplemented
+        for (p, mu) in enumerate(mus):
+            reduced_problem.set_mu(mu)
+            solution = reduced_problem.solve(N)
+            assert allclose(solution_batch[p], array(solution.vector()))
+            if problem_type == "compliant":
+                assert isclose(output_batch[p], reduced_problem.compute_output())
+            assert isclose(error_estimator_batch[p], reduced_problem.estimate_error())
@@ -16,14 +16,16 @@
 # along with RBniCS. If not, see <http://www.gnu.org/licenses/>.
 #
 
-from math import log
+import warnings
+from math import floor, log
+import pytest
 from numpy import linspace, random
 import scipy.stats as stats
 import matplotlib
 import matplotlib.pyplot as plt
 from distutils.version import LooseVersion
 from rbnics.sampling import ParameterSpaceSubset
-from rbnics.sampling.distributions import DrawFrom, EquispacedDistribution, LogUniformDistribution, UniformDistribution
+from rbnics.sampling.distributions import DrawFrom, EquispacedDistribution, HaltonDistribution, LatinHypercubeDistribution, LogHaltonDistribution, LogLatinHypercubeDistribution, LogSobolDistribution, LogUniformDistribution, SobolDistribution, UniformDistribution
 
 # Common data
 box = [(2., 5.), (10., 1000.)]
@@ -181,3 +183,63 @@ def test_sampling_composite_log_uniform_and_beta():
     plot(0, box, parameter_space_subset, bins, stats_loguniform, loc=box[0][min], scale=box[0][max]-box[0][min])
     plot(1, box, parameter_space_subset, bins, stats.beta, a=2, b=5, loc=box[1][min], scale=box[1][max]-box[1][min])
     plt.show()
+
+# Sobol generator
+def test_sampling_sobol():
+    parameter_space_subset = ParameterSpaceSubset()
+    parameter_space_subset.generate(box, n, sampling=SobolDistribution())
+    plot(0, box, parameter_space_subset, bins, stats.uniform, loc=box[0][min], scale=box[0][max]-box[0][min])
+    plot(1, box, parameter_space_subset, bins, stats.uniform, loc=box[1][min], scale=box[1][max]-box[1][min])
+    plt.show()
+
+# Halton generator
+def test_sampling_halton():
+    parameter_space_subset = ParameterSpaceSubset()
+    parameter_space_subset.generate(box, n, sampling=HaltonDistribution())
+    plot(0, box, parameter_space_subset, bins, stats.uniform, loc=box[0][min], scale=box[0][max]-box[0][min])
+    plot(1, box, parameter_space_subset, bins, stats.uniform, loc=box[1][min], scale=box[1][max]-box[1][min])
+    plt.show()
+
+# Latin hypercube generator
+def test_sampling_latin_hypercube():
+    parameter_space_subset = ParameterSpaceSubset()
+    parameter_space_subset.generate(box, n, sampling=LatinHypercubeDistribution())
+    plot(0, box, parameter_space_subset, bins, stats.uniform, loc=box[0][min], scale=box[0][max]-box[0][min])
+    plot(1, box, parameter_space_subset, bins, stats.uniform, loc=box[1][min], scale=box[1][max]-box[1][min])
+    plt.show()
+
+# Log Sobol generator
+def test_sampling_log_sobol():
+    parameter_space_subset = ParameterSpaceSubset()
+    parameter_space_subset.generate(box, n, sampling=LogSobolDistribution())
+    plot(0, box, parameter_space_subset, bins, stats_loguniform, loc=box[0][min], scale=box[0][max]-box[0][min])
+    plot(1, box, parameter_space_subset, bins, stats_loguniform, loc=box[1][min], scale=box[1][max]-box[1][min])
+    plt.show()
+
+# Quasi Monte Carlo generators are reproducible if a seed is provided, and generate points inside the box
+@pytest.mark.parametrize("Distribution", [HaltonDistribution, LatinHypercubeDistribution, LogHaltonDistribution, LogLatinHypercubeDistribution, LogSobolDistribution, SobolDistribution])
+def test_sampling_quasi_monte_carlo_reproducible(Distribution):
+    assert not Distribution().is_reproducible()
+    assert Distribution(seed=1).is_reproducible()
+    set_1 = Distribution(seed=1).sample(box, 100)
+    set_2 = Distribution(seed=1).sample(box, 100)
+    set_3 = Distribution(seed=2).sample(box, 100)
+    assert set_1 == set_2
+    assert set_1 != set_3
+    assert len(set_1) == 100
+    assert all([isinstance(mu, tuple) and len(mu) == len(box) for mu in set_1])
+    assert all([box_p[0]*(1. - 1.e-12) <= mu_p <= box_p[1]*(1. + 1.e-12) for mu in set_1 for (mu_p, box_p) in zip(mu, box)])
+
+# Latin hypercube generator places exactly one point in each of the n intervals of each component
+def test_sampling_latin_hypercube_stratification():
+    set_ = LatinHypercubeDistribution(seed=1).sample(box, 100)
+    for (p, box_p) in enumerate(box):
+        intervals = sorted([floor(100*(mu[p] - box_p[0])/(box_p[1] - box_p[0])) for mu in set_])
+        assert intervals == list(range(100))
+
+# Sobol generator does not warn if the number of points is not a power of 2
+def test_sampling_sobol_no_warning():
+    with warnings.catch_warnings(record=True) as recorded_warnings:
+        warnings.simplefilter("always")
+        SobolDistribution(seed=1).sample(box, 100)
+    assert len(recorded_warnings) == 0